@@ -1,9 +1,57 @@
-from fastapi import FastAPI
+import time
+_IMPORT_STARTED = time.perf_counter()
+
+import asyncio
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from backend.routes.analyze import router as analyze_router
+from backend.routes.corpus import router as corpus_router
 from backend.routes.health import router as health_router
+from backend.routes.jobs import router as jobs_router
+from backend.routes.metrics import router as metrics_router
+from backend.routes.rank import router as rank_router
+from backend.services.retriever import flush_index_cache
+from backend.services.llm import close_async_clients
+from backend.services.jobs import start_job_workers, stop_job_workers
+from backend.services.jd_corpus import start_compactor, stop_compactor
+from backend.services.parser import DocumentTooLarge, UnsupportedFormat, shutdown_parser
+from backend.services.uploads import UploadLimitMiddleware
+from backend.services import startup
+from backend.config import WARMUP_ON_STARTUP
 from fastapi import APIRouter
 
-app = FastAPI(title="Resume LLM Assistant")
+@asynccontextmanager
+async def lifespan(app):
+    startup.mark_imported(_IMPORT_STARTED)
+    # Serve /health right away; /ready turns 200 once models are loaded
+    warmup = asyncio.create_task(startup.warm_up()) if WARMUP_ON_STARTUP else None
+    if warmup is None:
+        startup.mark_ready()
+    await start_job_workers()
+    await start_compactor()
+    yield
+    await stop_compactor()
+    await stop_job_workers()
+    if warmup is not None:
+        warmup.cancel()
+    await close_async_clients()
+    shutdown_parser()
+    # Persist cached resume indexes so a restart starts warm
+    await asyncio.to_thread(flush_index_cache)
+
+app = FastAPI(title="Resume LLM Assistant", lifespan=lifespan)
+# Cap request bodies while they stream in, before Starlette spools them
+app.add_middleware(UploadLimitMiddleware)
+
+@app.exception_handler(DocumentTooLarge)
+async def document_too_large(request: Request, exc: DocumentTooLarge):
+    # Raised by the parser from any route that reads an upload
+    return JSONResponse({"detail": str(exc)}, status_code=413)
+
+@app.exception_handler(UnsupportedFormat)
+async def unsupported_format(request: Request, exc: UnsupportedFormat):
+    return JSONResponse({"detail": str(exc)}, status_code=415)
 router = APIRouter()
 
 @router.get("/")
@@ -15,4 +63,8 @@ def root():
     return {"message": "Welcome to the Resume LLM Assistant API"}
 
 app.include_router(analyze_router)
-app.include_router(health_router)
\ No newline at end of file
+app.include_router(corpus_router)
+app.include_router(health_router)
+app.include_router(jobs_router)
+app.include_router(metrics_router)
+app.include_router(rank_router)
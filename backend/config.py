@@ -6,12 +6,131 @@ load_dotenv()
 
 EMBED_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
 
+# Embedding backend: "torch" (SentenceTransformer), "onnx" or "onnx-int8" (ONNX Runtime, CPU)
+EMBED_BACKEND = os.getenv("EMBED_BACKEND", "torch").lower()
+ONNX_DIR = os.getenv("ONNX_DIR", "embeddings_store/onnx")  # exported on first use
+
 USE_SAGEMAKER = os.getenv("USE_SAGEMAKER", "False").lower() == "true"
 SAGEMAKER_ENDPOINT = os.getenv("SAGEMAKER_ENDPOINT", "")
 
 # Groq API settings
 GROQ_API_KEY = os.getenv("GROQ_API_KEY", "")
 USE_GROQ = bool(GROQ_API_KEY) and not USE_SAGEMAKER
+GROQ_MODEL = os.getenv("GROQ_MODEL", "llama-3.3-70b-versatile")
+
+# Job description corpus for /recommend: base ANN index files (one per generation) and the
+# directory with the manifest, columnar metadata and write-ahead log
+FAISS_PATH = os.getenv("FAISS_PATH", "embeddings_store/faiss_index")
+META_PATH = os.getenv("META_PATH", "embeddings_store/jd_meta")
+JD_INDEX_TYPE = os.getenv("JD_INDEX_TYPE", "hnsw").lower()  # "hnsw", "ivfpq" or "flat"
+JD_HNSW_M = int(os.getenv("JD_HNSW_M", "32"))
+JD_HNSW_EF_CONSTRUCTION = int(os.getenv("JD_HNSW_EF_CONSTRUCTION", "200"))
+JD_HNSW_EF_SEARCH = int(os.getenv("JD_HNSW_EF_SEARCH", "64"))
+JD_IVF_NLIST = int(os.getenv("JD_IVF_NLIST", "0"))  # 0 = 4 * sqrt(corpus size), at most size / 39
+JD_IVF_NPROBE = int(os.getenv("JD_IVF_NPROBE", "16"))
+JD_PQ_M = int(os.getenv("JD_PQ_M", "48"))  # sub-quantizers; must divide the embedding dimension
+JD_PQ_REFINE = int(os.getenv("JD_PQ_REFINE", "0"))  # re-rank k * this many PQ hits exactly (keeps float vectors), 0 = off
+JD_VECTOR_STORAGE = os.getenv("JD_VECTOR_STORAGE", "fp32").lower()  # hnsw/flat vectors and PQ refine store: fp32, fp16, int8
+JD_INGEST_BATCH = int(os.getenv("JD_INGEST_BATCH", "1024"))  # JDs embedded per model call
+JD_MMAP = os.getenv("JD_MMAP", "true").lower() == "true"  # map the base index and metadata read-only, shared by workers
+JD_WAL_FSYNC = os.getenv("JD_WAL_FSYNC", "true").lower() == "true"  # fsync each WAL append before acknowledging it
+JD_COMPACT_MIN_ROWS = int(os.getenv("JD_COMPACT_MIN_ROWS", "10000"))  # delta rows that trigger a background compaction
+JD_COMPACT_INTERVAL = float(os.getenv("JD_COMPACT_INTERVAL", "60"))  # seconds between compaction checks, 0 = off
+CORPUS_API_MAX_JOBS = int(os.getenv("CORPUS_API_MAX_JOBS", "1000"))  # per POST /corpus/jobs; bulk loads use the CLI
+RECOMMEND_TOP_K = int(os.getenv("RECOMMEND_TOP_K", "20"))
+RECOMMEND_MAX_K = int(os.getenv("RECOMMEND_MAX_K", "100"))
+
+# Batch analysis (one resume vs many job descriptions)
+BATCH_MAX_JOBS = int(os.getenv("BATCH_MAX_JOBS", "200"))
+BATCH_LLM_CONCURRENCY = int(os.getenv("BATCH_LLM_CONCURRENCY", "8"))
+
+# Bulk ranking (many resumes vs one job description)
+RANK_MAX_RESUMES = int(os.getenv("RANK_MAX_RESUMES", "5000"))
+RANK_TOP_N = int(os.getenv("RANK_TOP_N", "10"))
+RANK_PARSE_CONCURRENCY = int(os.getenv("RANK_PARSE_CONCURRENCY", "16"))
+
+# Resumes with at most this many chunks are searched with NumPy instead of FAISS
+SMALL_INDEX_MAX_CHUNKS = int(os.getenv("SMALL_INDEX_MAX_CHUNKS", "256"))
+
+# Per-resume index cache: in-memory LRU that spills to disk
+INDEX_CACHE_DIR = os.getenv("INDEX_CACHE_DIR", "embeddings_store/resume_index")
+INDEX_CACHE_MAX_BYTES = int(os.getenv("INDEX_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+INDEX_CACHE_TTL = float(os.getenv("INDEX_CACHE_TTL", "3600"))  # seconds, 0 disables
+INDEX_CACHE_DISK_MAX_BYTES = int(os.getenv("INDEX_CACHE_DISK_MAX_BYTES", str(2 * 1024 ** 3)))
+
+# How cached resume indexes and cached embeddings store vectors: "fp32", "fp16" or "int8"
+# (queries stay float32)
+VECTOR_STORAGE = os.getenv("VECTOR_STORAGE", "fp32").lower()
+
+# Resume chunks, in embedding-model tokens (capped at the model's limit); overlap is skipped at section breaks
+CHUNK_MAX_TOKENS = int(os.getenv("CHUNK_MAX_TOKENS", "128"))
+CHUNK_OVERLAP_TOKENS = int(os.getenv("CHUNK_OVERLAP_TOKENS", "16"))
+
+# Chunk retrieval: "dense" or "hybrid" (BM25 fused with dense by reciprocal rank); requests may override
+RETRIEVAL_MODE = os.getenv("RETRIEVAL_MODE", "hybrid").lower()
+RRF_K = int(os.getenv("RRF_K", "60"))  # fusion damping: 1 / (RRF_K + rank)
+RRF_DEPTH = int(os.getenv("RRF_DEPTH", "20"))  # candidates taken from each ranking
+BM25_K1 = float(os.getenv("BM25_K1", "1.2"))
+BM25_B = float(os.getenv("BM25_B", "0.75"))
+
+# Embedding micro-batching: flush at this many texts or after this many ms
+EMBED_BATCH_MAX = int(os.getenv("EMBED_BATCH_MAX", "64"))
+EMBED_BATCH_WAIT_MS = float(os.getenv("EMBED_BATCH_WAIT_MS", "5"))
+
+# Embedding cache keyed by (model, normalized text hash); empty path disables the SQLite tier
+EMBED_CACHE_MAX_ITEMS = int(os.getenv("EMBED_CACHE_MAX_ITEMS", "50000"))
+EMBED_CACHE_PATH = os.getenv("EMBED_CACHE_PATH", "embeddings_store/embedding_cache.sqlite3")
+EMBED_CACHE_DISK_MAX_ITEMS = int(os.getenv("EMBED_CACHE_DISK_MAX_ITEMS", "500000"))  # 0 = unbounded
+
+# Extracted resume text keyed by the upload's SHA-256; empty path disables the SQLite tier
+TEXT_CACHE_MAX_BYTES = int(os.getenv("TEXT_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+TEXT_CACHE_PATH = os.getenv("TEXT_CACHE_PATH", "embeddings_store/text_cache.sqlite3")
+TEXT_CACHE_DISK_MAX_ITEMS = int(os.getenv("TEXT_CACHE_DISK_MAX_ITEMS", "100000"))  # 0 = unbounded
+
+# Local skill-gap engine: "hint" (default) puts its gaps in the prompt, "replace" also uses them as
+# missing_skills instead of asking the LLM, "llm" turns it off
+SKILL_GAP_MODE = os.getenv("SKILL_GAP_MODE", "hint").lower()
+SKILL_INDEX_DIR = os.getenv("SKILL_INDEX_DIR", "embeddings_store/skills")
+SKILL_MATCH_THRESHOLD = float(os.getenv("SKILL_MATCH_THRESHOLD", "0.85"))  # cosine for related skills
+SKILL_VOCAB_PATH = os.getenv("SKILL_VOCAB_PATH", "")  # optional JSON {skill: [aliases]} added to the vocabulary
+SKILL_GAP_MAX = int(os.getenv("SKILL_GAP_MAX", "5"))
+
+# /analyze mode=fast: optional JSON calibration from benchmarks.calibrate_fast_score (empty = built-in weights)
+FAST_SCORE_CALIBRATION_PATH = os.getenv("FAST_SCORE_CALIBRATION", "")
+
+# Memoized analysis results for identical (resume, JD, prompt version, model)
+RESULT_CACHE_MAX_ITEMS = int(os.getenv("RESULT_CACHE_MAX_ITEMS", "10000"))
+RESULT_CACHE_TTL = float(os.getenv("RESULT_CACHE_TTL", str(24 * 3600)))  # seconds, 0 disables expiry
+
+# LLM client: shared, pooled connections; GROQ_BASE_URL can point at a local stub server
+GROQ_BASE_URL = os.getenv("GROQ_BASE_URL", "") or None
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "60"))  # seconds per call, including retries
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "2"))
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "32"))
+
+# Load the embedding model and FAISS in the background at startup; /ready reports when done
+WARMUP_ON_STARTUP = os.getenv("WARMUP_ON_STARTUP", "True").lower() == "true"
+
+# Background analysis jobs (POST /jobs): "memory" or "sqlite" store, worker pool, back-pressure
+JOB_BACKEND = os.getenv("JOB_BACKEND", "memory").lower()
+JOB_DB_PATH = os.getenv("JOB_DB_PATH", "embeddings_store/jobs.sqlite3")
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+JOB_QUEUE_MAX = int(os.getenv("JOB_QUEUE_MAX", "100"))  # 429 once this many jobs are waiting
+JOB_TIMEOUT = float(os.getenv("JOB_TIMEOUT", "120"))  # seconds per job
+JOB_RESULT_TTL = float(os.getenv("JOB_RESULT_TTL", "3600"))  # seconds finished jobs stay pollable, 0 keeps them
+
+# Resume parsing: "thread" (default) or "process" pool; 0 workers = 2 threads / one process per core
+PARSE_ENGINE = os.getenv("PARSE_ENGINE", "thread").lower()
+PARSE_WORKERS = int(os.getenv("PARSE_WORKERS", "0"))
+PARSE_PAGES_PER_TASK = int(os.getenv("PARSE_PAGES_PER_TASK", "16"))  # process engine: longer documents are split
+# Hard limits per document, 0 disables; over-limit uploads get a 413
+PARSE_MAX_BYTES = int(os.getenv("PARSE_MAX_BYTES", "0"))
+PARSE_MAX_PAGES = int(os.getenv("PARSE_MAX_PAGES", "0"))
+PARSE_TIMEOUT = float(os.getenv("PARSE_TIMEOUT", "0"))  # seconds
 
-FAISS_PATH = "embeddings_store/faiss_index"
-META_PATH = "embeddings_store/meta.npy"
\ No newline at end of file
+# Uploads: request bodies over the limit are cut off with a 413 while streaming (0 disables);
+# files above the spool threshold are copied to a temp file that the parser opens by path
+UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", str(25 * 1024 * 1024)))
+RANK_UPLOAD_MAX_BYTES = int(os.getenv("RANK_UPLOAD_MAX_BYTES", str(2 * 1024 ** 3)))  # /rank takes many files
+UPLOAD_SPOOL_BYTES = int(os.getenv("UPLOAD_SPOOL_BYTES", str(1024 * 1024)))
+UPLOAD_DIR = os.getenv("UPLOAD_DIR", "")  # empty = system temp dir
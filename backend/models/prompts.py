@@ -1,4 +1,8 @@
 # backend/models/prompts.py
+
+# Bump whenever PROMPT_TEMPLATE changes so memoized results are not reused
+PROMPT_VERSION = "2"
+
 PROMPT_TEMPLATE = """Analyze this resume against the job description and provide a detailed evaluation.
 
 RESUME:
@@ -6,19 +10,33 @@ RESUME:
 
 JOB DESCRIPTION:
 {jd}
-
+{skill_gaps}
 Provide your analysis in the following JSON format:
 {{
-    "score": <number 0-100>,
-    "missing_skills": [<list of 3-5 key skills the candidate is missing>],
+    "score": <number 0-100>,{missing_skills_field}
     "suggestions": [<list of 3-5 specific improvements for the resume>],
     "rewritten_bullets": [<3 rewritten resume bullet points that better match the job description>]
 }}
 
 Requirements:
-- Score should reflect how well the resume matches the job (0-100)
-- Missing skills should be specific technical or soft skills mentioned in the JD
+- Score should reflect how well the resume matches the job (0-100){missing_skills_rule}
 - Suggestions should be actionable improvements
 - Rewritten bullets should use strong action verbs and quantify achievements when possible
 
-Return ONLY the JSON object, no other text."""
\ No newline at end of file
+Return ONLY the JSON object, no other text."""
+
+MISSING_SKILLS_FIELD = """
+    "missing_skills": [<list of 3-5 key skills the candidate is missing>],"""
+
+MISSING_SKILLS_RULE = """
+- Missing skills should be specific technical or soft skills mentioned in the JD"""
+
+# Filled in by the local skill-gap engine, which sees the whole resume
+# rather than the retrieved excerpt
+SKILL_GAPS_BLOCK = """
+SKILL CHECK (keyword match of the full resume against the JD):
+- In the JD but not found in the resume: {missing}
+- Found in both: {matched}
+"""
+
+SKILL_GAPS_RULE = "; start from the SKILL CHECK, since the resume above is only an excerpt"
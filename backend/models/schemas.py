@@ -1,9 +1,60 @@
 from pydantic import BaseModel
-from typing import List
+from typing import List, Optional
 
 class AnalyzeResponse(BaseModel):
     score: int
     missing_skills : List[str]
     suggestions : List[str]
     rewritten_bullets : List[str]
-    
\ No newline at end of file
+    skill_coverage: Optional[float] = None  # weighted share of the JD's known skills the resume has
+    cached: bool = False
+    error: Optional[str] = None  # set when the LLM call or its reply failed
+
+class RankedResume(BaseModel):
+    rank: int
+    filename: str
+    prefilter_score: float
+    llm_score: Optional[int] = None
+    analysis: Optional[AnalyzeResponse] = None
+    error: Optional[str] = None  # why this shortlisted resume has no llm_score
+
+class RankResponse(BaseModel):
+    job_description: str
+    aggregate: str
+    total: int
+    results: List[RankedResume]
+
+class JobResponse(BaseModel):
+    id: str
+    status: str  # queued | running | done | failed
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Optional[AnalyzeResponse] = None
+    error: Optional[str] = None
+
+class JobPosting(BaseModel):
+    id: str
+    text: str
+    title: str = ""
+    company: str = ""
+    location: str = ""
+
+class CorpusUpdate(BaseModel):
+    added: int = 0
+    replaced: int = 0
+    removed: int = 0
+    total: int
+
+class RecommendedJob(BaseModel):
+    rank: int
+    id: str
+    title: str
+    company: str
+    location: str
+    snippet: str
+    score: float  # best cosine similarity between a resume chunk and the JD
+
+class RecommendResponse(BaseModel):
+    total_jobs: int
+    results: List[RecommendedJob]
@@ -0,0 +1,16 @@
+# backend/models/scoring.py
+
+# Fast (no LLM) score: intercept + sum(weight * feature), clipped to 0-100.
+# Every feature is in [0, 1]:
+#   dense         best chunk cosine against the whole JD
+#   requirements  mean over JD requirement lines of the best chunk cosine
+#   keywords      share of the JD's content words found in the resume
+#   skills        skill-gap coverage (keywords when the JD names no known skill)
+FAST_SCORE_FEATURES = ("dense", "requirements", "keywords", "skills")
+
+# Hand-set defaults; refit against LLM scores with
+# python -m benchmarks.calibrate_fast_score and load the result via FAST_SCORE_CALIBRATION
+FAST_SCORE_CALIBRATION = {
+    "intercept": 5.0,
+    "weights": {"dense": 40.0, "requirements": 35.0, "keywords": 25.0, "skills": 30.0},
+}
@@ -0,0 +1,108 @@
+# backend/models/skills.py
+
+# Bump whenever SKILLS or CASE_SENSITIVE change; it is part of the skill
+# index manifest and of memoized results
+SKILLS_VERSION = "1"
+
+# Canonical skill name -> other spellings. Matching is on whole tokens,
+# case-insensitive, and "-", "/" and spaces are interchangeable
+# ("CI/CD" == "ci cd"). Extend per deployment with SKILL_VOCAB_PATH.
+SKILLS = {
+    # Languages
+    "Python": (), "Java": (), "JavaScript": ("js", "ecmascript"), "TypeScript": ("ts",),
+    "Go": ("golang",), "Rust": (), "C": (), "C++": ("cpp",), "C#": ("csharp",), "Ruby": (),
+    "PHP": (), "Kotlin": (), "Swift": (), "Objective-C": (), "Scala": (), "R": (), "Julia": (),
+    "Perl": (), "Elixir": (), "Erlang": (), "Haskell": (), "Clojure": (), "Dart": (), "Lua": (),
+    "MATLAB": (), "Bash": ("shell scripting", "shell script"), "PowerShell": (), "SQL": (),
+    "HTML": ("html5",), "CSS": ("css3",), "Sass": ("scss",), "Solidity": (), "Groovy": (), "COBOL": (),
+    "Fortran": (), "Assembly": (), "VHDL": (), "Verilog": (),
+    # Frontend and mobile
+    "React": ("reactjs", "react.js"), "Angular": ("angularjs",), "Vue.js": ("vue", "vuejs"),
+    "Svelte": (), "Next.js": ("nextjs",), "Nuxt.js": ("nuxt",), "Redux": (), "jQuery": (),
+    "Tailwind CSS": ("tailwind",), "Bootstrap": (), "Webpack": (), "Vite": (),
+    "React Native": (), "Flutter": (), "SwiftUI": (), "Jetpack Compose": (), "Android": (), "iOS": (),
+    "Xamarin": (), "Ionic": (),
+    # Backend frameworks
+    "Node.js": ("nodejs",), "Express": ("express.js", "expressjs"), "NestJS": (),
+    "Django": (), "Flask": (), "FastAPI": (), "Spring": ("spring framework",), "Spring Boot": (),
+    "Ruby on Rails": ("Rails", "ror"), "Laravel": (), "Symfony": (), "ASP.NET": ("asp.net core",),
+    ".NET": ("dotnet", ".net core", ".net framework"), "Gin": (), "Phoenix": (), "Hibernate": (),
+    "GraphQL": (), "REST": ("rest api", "rest apis", "restful", "restful api", "restful apis"),
+    "gRPC": (), "WebSockets": ("websocket",), "OAuth": ("oauth2", "oauth 2.0"), "OpenAPI": ("swagger",),
+    "Microservices": ("microservice", "micro-services"), "Celery": (),
+    # Databases and storage
+    "PostgreSQL": ("postgres", "psql"), "MySQL": (), "MariaDB": (), "SQLite": (),
+    "Oracle Database": ("oracle db", "oracle"), "SQL Server": ("mssql", "microsoft sql server"),
+    "MongoDB": ("mongo",), "Redis": (), "Cassandra": ("apache cassandra",), "DynamoDB": (),
+    "Elasticsearch": ("elastic search", "opensearch"), "Neo4j": (), "CouchDB": (), "Couchbase": (),
+    "Firebase": ("firestore",), "Memcached": (), "InfluxDB": (), "TimescaleDB": (), "ClickHouse": (),
+    "Snowflake": (), "BigQuery": ("google bigquery",), "Redshift": ("amazon redshift",),
+    "Databricks": (), "Delta Lake": (), "Apache Iceberg": ("Iceberg",), "S3": ("amazon s3", "aws s3"),
+    "HDFS": (), "Pinecone": (), "FAISS": (), "Milvus": (), "Weaviate": (), "pgvector": (),
+    # Data engineering
+    "Apache Spark": ("Spark", "pyspark"), "Hadoop": ("apache hadoop",), "Apache Kafka": ("kafka",),
+    "Apache Flink": ("flink",), "Apache Beam": ("beam",), "Airflow": ("apache airflow",),
+    "dbt": (), "Luigi": (), "Dagster": (), "Prefect": (), "Hive": ("apache hive",), "Presto": ("trino",),
+    "RabbitMQ": (), "ActiveMQ": (), "Amazon SQS": ("sqs",), "Amazon Kinesis": ("kinesis",),
+    "Google Pub/Sub": ("pub/sub", "pubsub"), "ETL": ("elt",), "Data Modeling": ("data modelling",),
+    "Data Warehousing": ("data warehouse",), "Pandas": (), "NumPy": (), "Polars": (), "Dask": (),
+    "Ray": (), "Tableau": (), "Power BI": ("powerbi",), "Looker": (), "Excel": ("microsoft excel",),
+    # Machine learning
+    "Machine Learning": ("ml",), "Deep Learning": (), "Natural Language Processing": ("nlp",),
+    "Computer Vision": (), "Reinforcement Learning": (), "Large Language Models": ("llm", "llms"),
+    "Retrieval-Augmented Generation": ("rag",), "Prompt Engineering": (), "Generative AI": ("genai",),
+    "TensorFlow": (), "PyTorch": ("torch",), "Keras": (), "scikit-learn": ("sklearn", "scikit learn"),
+    "XGBoost": (), "LightGBM": (), "Hugging Face": ("huggingface",), "LangChain": (),
+    "LlamaIndex": (), "OpenCV": (), "spaCy": (), "NLTK": (), "MLflow": (), "Kubeflow": (),
+    "SageMaker": ("amazon sagemaker", "aws sagemaker"), "Vertex AI": (), "ONNX": ("onnx runtime",),
+    "CUDA": (), "Statistics": ("statistical analysis",), "A/B Testing": ("ab testing", "a/b tests"),
+    "Time Series": ("time-series forecasting", "forecasting"), "Recommender Systems": ("recommendation systems",),
+    "Feature Engineering": (), "MLOps": (), "Data Science": (), "Data Analysis": ("data analytics",),
+    # Cloud and infrastructure
+    "AWS": ("amazon web services",), "Azure": ("microsoft azure",), "GCP": ("google cloud", "google cloud platform"),
+    "Lambda": ("aws lambda",), "EC2": ("amazon ec2",), "ECS": ("amazon ecs",), "EKS": ("amazon eks",),
+    "CloudFormation": ("aws cloudformation",), "Heroku": (), "DigitalOcean": (), "Cloudflare": (),
+    "Docker": ("containers", "containerization"), "Kubernetes": ("k8s",), "Helm": (), "OpenShift": (),
+    "Terraform": (), "Pulumi": (), "Ansible": (), "Chef": (), "Puppet": (), "Vagrant": (),
+    "Serverless": (), "Linux": ("unix",), "Nginx": (), "Apache HTTP Server": ("httpd",),
+    "Istio": ("service mesh",), "Envoy": (), "Consul": (), "Vault": ("hashicorp vault",),
+    # DevOps, quality and observability
+    "CI/CD": ("continuous integration", "continuous delivery", "continuous deployment"),
+    "Jenkins": (), "GitHub Actions": (), "GitLab CI": ("gitlab ci/cd",), "CircleCI": (),
+    "Travis CI": (), "Argo CD": ("argocd",), "Git": (), "GitHub": (), "GitLab": (), "Bitbucket": (),
+    "Prometheus": (), "Grafana": (), "Datadog": (), "New Relic": (), "Splunk": (),
+    "ELK Stack": ("elk", "logstash", "kibana"), "OpenTelemetry": (), "Jaeger": (), "Sentry": (),
+    "Site Reliability Engineering": ("sre",), "DevOps": (), "Infrastructure as Code": ("iac",),
+    "Unit Testing": ("unit tests",), "Test-Driven Development": ("tdd",), "pytest": (), "JUnit": (),
+    "Jest": (), "Cypress": (), "Selenium": (), "Playwright": (), "Postman": (),
+    "Performance Testing": ("load testing",), "JMeter": (),
+    # Security and networking
+    "Cybersecurity": ("information security", "infosec"), "Penetration Testing": ("pentesting",),
+    "OWASP": (), "IAM": ("identity and access management",), "SSO": ("single sign-on",), "SAML": (),
+    "JWT": (), "TLS": ("ssl",), "Encryption": (), "SIEM": (), "SOC 2": ("soc2",), "GDPR": (),
+    "HIPAA": (), "PCI DSS": ("pci",), "Networking": ("tcp/ip",), "DNS": (), "VPN": (),
+    "Firewalls": ("firewall",), "Zero Trust": (),
+    # Architecture and practices
+    "System Design": (), "Distributed Systems": (), "Event-Driven Architecture": ("event driven",),
+    "Domain-Driven Design": ("ddd",), "Design Patterns": (), "Object-Oriented Programming": ("oop",),
+    "Functional Programming": (), "Concurrency": ("multithreading",), "Data Structures": (),
+    "Algorithms": (), "Caching": (), "Message Queues": ("message queue", "message broker"),
+    "API Design": (), "Scalability": (), "High Availability": (), "Performance Optimization": (),
+    "Agile": (), "Scrum": (), "Kanban": (), "Jira": (), "Confluence": (),
+    "Project Management": (), "Product Management": (), "Technical Leadership": ("tech lead",),
+    "Mentoring": ("mentorship",), "Code Review": ("code reviews",), "Stakeholder Management": (),
+    # Other platforms
+    "Salesforce": (), "SAP": (), "ServiceNow": (), "Shopify": (), "WordPress": (), "Unity": (),
+    "Unreal Engine": (), "Blockchain": (), "Ethereum": (), "Embedded Systems": (), "RTOS": (),
+    "Figma": (), "UX Design": ("user experience",), "UI Design": ("user interface design",),
+    "Accessibility": ("wcag", "a11y"), "SEO": (),
+}
+
+# Names that are also common words: matched only as written here, so "go to
+# market" or "a react to" do not count (lower-case aliases still match)
+CASE_SENSITIVE = {
+    "Go", "Rust", "C", "R", "Ruby", "Swift", "Dart", "Julia", "Spring", "Express", "React",
+    "Excel", "Chef", "Puppet", "Vault", "Lambda", "Helm", "Ray", "Gin", "Phoenix", "Beam",
+    "Unity", "Consul", "Envoy", "Hive", "Looker", "Git", "Assembly", "Ionic", "Flask", "Keras",
+    "Jest", "Spark", "Iceberg", "Rails", "Presto", "Prefect", "Luigi", "Snowflake",
+}
@@ -1,15 +1,91 @@
-from fastapi import APIRouter, UploadFile, File, Form
-from backend.services.pipeline import analyze_resume
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException
+from backend.services.pipeline import (
+    analyze_resume, analyze_resume_batch, analyze_resume_stream, ANALYZE_MODES
+)
+from backend.services.retriever import RETRIEVAL_MODES
+from backend.services.uploads import read_upload
+from backend.config import BATCH_MAX_JOBS
 from fastapi.responses import StreamingResponse
+from typing import List, Optional
 import json
 
 router = APIRouter()
 
+def check_retrieval(retrieval):
+    """422 for an unknown retrieval override (None keeps RETRIEVAL_MODE)"""
+    if retrieval is not None and retrieval not in RETRIEVAL_MODES:
+        raise HTTPException(status_code=422, detail=f"retrieval must be one of {RETRIEVAL_MODES}")
+
 @router.post("/analyze")
 async def analyze(
     resume : UploadFile = File(...),
-    job_description: str = Form(...)
+    job_description: str = Form(...),
+    refresh: bool = Form(False),
+    mode: str = Form("llm"),
+    retrieval: Optional[str] = Form(None)
 ):
     from fastapi import BackgroundTasks
-    result = await analyze_resume(resume, job_description)
-    return result
\ No newline at end of file
+    # mode=fast scores locally without the LLM (no suggestions or bullets)
+    if mode not in ANALYZE_MODES:
+        raise HTTPException(status_code=422, detail=f"mode must be one of {ANALYZE_MODES}")
+    check_retrieval(retrieval)
+    # refresh=true bypasses the result cache and stores the new verdict
+    result = await analyze_resume(resume, job_description, refresh=refresh, mode=mode, retrieval=retrieval)
+    return result
+
+@router.post("/analyze/stream")
+async def analyze_stream(
+    resume : UploadFile = File(...),
+    job_description: str = Form(...),
+    refresh: bool = Form(False),
+    retrieval: Optional[str] = Form(None)
+):
+    """Analyze a resume, streaming each pipeline stage as Server-Sent Events"""
+    check_retrieval(retrieval)
+    # Read the upload before streaming starts, while it is still open (and a
+    # 413 can still be sent); large files are spooled to disk
+    document = await read_upload(resume)
+    events = analyze_resume_stream(document, job_description, refresh=refresh, retrieval=retrieval)
+
+    async def sse():
+        try:
+            async for event, data in events:
+                yield f"event: {event}\ndata: {json.dumps(data)}\n\n"
+        except Exception as e:
+            # Headers are already sent, so report failures in-band
+            print(f"[ERROR] Streaming analysis failed: {e}")
+            yield f"event: error\ndata: {json.dumps({'detail': str(e)})}\n\n"
+        finally:
+            # The parser removes spooled files, unless the client left first
+            if hasattr(document, "discard"):
+                document.discard()
+
+    return StreamingResponse(
+        sse(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.post("/analyze/batch")
+async def analyze_batch(
+    resume : UploadFile = File(...),
+    job_descriptions: List[str] = Form(...),
+    refresh: bool = Form(False),
+    retrieval: Optional[str] = Form(None)
+):
+    """Score one resume against many job descriptions, streamed as NDJSON"""
+    check_retrieval(retrieval)
+    if len(job_descriptions) > BATCH_MAX_JOBS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {BATCH_MAX_JOBS} job descriptions per batch"
+        )
+
+    # Parse and index the resume before streaming starts, while the upload is open
+    results = await analyze_resume_batch(resume, job_descriptions, refresh=refresh, retrieval=retrieval)
+
+    async def ndjson():
+        async for item in results:
+            yield json.dumps(item) + "\n"
+
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
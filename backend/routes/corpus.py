@@ -0,0 +1,51 @@
+import asyncio
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException
+from typing import List
+from backend.services.pipeline import recommend_jobs
+from backend.services.jd_corpus import get_jd_corpus, embed_jobs, StaleCorpus
+from backend.models.schemas import JobPosting, CorpusUpdate, RecommendResponse
+from backend.config import CORPUS_API_MAX_JOBS, RECOMMEND_TOP_K, RECOMMEND_MAX_K
+
+router = APIRouter()
+
+@router.post("/recommend", response_model=RecommendResponse)
+async def recommend(
+    resume : UploadFile = File(...),
+    k: int = Form(RECOMMEND_TOP_K)
+):
+    """The best matching jobs of the JD corpus for a resume"""
+    if not 1 <= k <= RECOMMEND_MAX_K:
+        raise HTTPException(status_code=422, detail=f"k must be between 1 and {RECOMMEND_MAX_K}")
+    results, total = await recommend_jobs(resume, k)
+    return {"total_jobs": total, "results": results}
+
+@router.post("/corpus/jobs", response_model=CorpusUpdate)
+async def add_jobs(jobs: List[JobPosting]):
+    """Add job descriptions to the corpus; a known id replaces the old version"""
+    if len(jobs) > CORPUS_API_MAX_JOBS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {CORPUS_API_MAX_JOBS} jobs per request; bulk-load with the ingestion CLI"
+        )
+    records = [job.model_dump() for job in jobs]
+    corpus = get_jd_corpus()
+    # Embedding and the WAL append take a while; keep them off the event loop, and
+    # embed before commit() takes the corpus locks
+    vectors = await asyncio.to_thread(embed_jobs, records)
+    try:
+        added, replaced = await asyncio.to_thread(corpus.commit, lambda c: c.add_vectors(vectors, records))
+    except StaleCorpus as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return {"added": added, "replaced": replaced, "total": len(corpus)}
+
+@router.delete("/corpus/jobs/{job_id}", response_model=CorpusUpdate)
+async def remove_job(job_id: str):
+    """Remove a job description from the corpus"""
+    corpus = get_jd_corpus()
+    try:
+        removed = await asyncio.to_thread(corpus.commit, lambda c: c.remove([job_id]))
+    except StaleCorpus as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if not removed:
+        raise HTTPException(status_code=404, detail="Job not in the corpus")
+    return {"removed": removed, "total": len(corpus)}
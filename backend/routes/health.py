@@ -1,6 +1,14 @@
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from backend.services.startup import is_ready, startup_state
 
 router = APIRouter()
 @router.get("/health")
 def health():
-    return {"status": "ok"}
\ No newline at end of file
+    """Liveness: the process is up and serving requests"""
+    return {"status": "ok"}
+
+@router.get("/ready")
+def ready():
+    """Readiness: models are loaded and requests will not pay cold-start cost"""
+    return JSONResponse(startup_state(), status_code=200 if is_ready() else 503)
@@ -0,0 +1,49 @@
+import asyncio
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException
+from backend.services.jobs import submit_job, get_job, job_retry_after
+from backend.services.parser import document_format
+from backend.services.uploads import read_upload
+from backend.routes.analyze import check_retrieval
+from backend.models.schemas import JobResponse
+from typing import Optional
+
+router = APIRouter()
+
+def _discard(document):
+    """Remove the spooled file of an upload that was not queued"""
+    discard = getattr(document, "discard", None)
+    if discard is not None:
+        discard()
+
+@router.post("/jobs", status_code=202, response_model=JobResponse)
+async def create_job(
+    resume : UploadFile = File(...),
+    job_description: str = Form(...),
+    refresh: bool = Form(False),
+    retrieval: Optional[str] = Form(None)
+):
+    """Queue an analysis and return its id right away; poll GET /jobs/{id}"""
+    check_retrieval(retrieval)
+    # Bytes, or a spooled file for large uploads; 413 as it streams in
+    document = await read_upload(resume)
+    try:
+        document_format(document)  # 415 now rather than a failed job later
+        return await submit_job(document, job_description, refresh=refresh, retrieval=retrieval)
+    except asyncio.QueueFull:
+        _discard(document)
+        raise HTTPException(
+            status_code=429,
+            detail="Job queue is full, retry later",
+            headers={"Retry-After": str(job_retry_after())}
+        )
+    except Exception:
+        _discard(document)
+        raise
+
+@router.get("/jobs/{job_id}", response_model=JobResponse)
+async def job_status(job_id: str):
+    """Status of a queued analysis, with the result once it is done"""
+    job = await get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+    return job
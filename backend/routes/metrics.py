@@ -0,0 +1,29 @@
+from fastapi import APIRouter
+from backend.services.retriever import index_cache_stats
+from backend.services.embedding_cache import embedding_cache_stats
+from backend.services.embed_batcher import embed_batcher_stats
+from backend.services.result_cache import result_cache_stats
+from backend.services.jobs import job_queue_stats
+from backend.services.parser import parser_stats
+from backend.services.text_cache import text_cache_stats
+from backend.services.skills import skill_index_stats
+from backend.services.jd_corpus import jd_corpus_stats
+from backend.services.startup import startup_state
+
+router = APIRouter()
+
+@router.get("/metrics")
+def metrics():
+    """Cache and pipeline counters for dashboards"""
+    return {
+        "startup": startup_state(),
+        "index_cache": index_cache_stats(),
+        "embedding_cache": embedding_cache_stats(),
+        "embedding_batcher": embed_batcher_stats(),
+        "result_cache": result_cache_stats(),
+        "jobs": job_queue_stats(),
+        "parser": parser_stats(),
+        "text_cache": text_cache_stats(),
+        "skills": skill_index_stats(),
+        "jd_corpus": jd_corpus_stats(),
+    }
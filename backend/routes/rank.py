@@ -0,0 +1,38 @@
+from fastapi import APIRouter, HTTPException, Request
+from starlette.datastructures import UploadFile
+from backend.services.pipeline import rank_resumes
+from backend.services.ranker import AGGREGATES
+from backend.models.schemas import RankResponse
+from backend.config import RANK_MAX_RESUMES, RANK_TOP_N
+
+router = APIRouter()
+
+@router.post("/rank", response_model=RankResponse)
+async def rank(request: Request):
+    """Pre-rank many resumes by embedding similarity, then LLM-score the top N.
+
+    Form fields: ``resumes`` (PDF, DOCX, HTML or text files, repeated), ``job_description``,
+    optional ``top_n`` and ``aggregate`` ("max" or "mean").
+    """
+    # Starlette caps multipart forms at 1000 files unless told otherwise
+    form = await request.form(max_files=RANK_MAX_RESUMES, max_fields=100)
+    resumes = [f for f in form.getlist("resumes") if isinstance(f, UploadFile)]
+    job_description = form.get("job_description")
+    aggregate = form.get("aggregate", "max")
+
+    if not resumes or not isinstance(job_description, str) or not job_description:
+        raise HTTPException(status_code=422, detail="resumes and job_description are required")
+    if aggregate not in AGGREGATES:
+        raise HTTPException(status_code=422, detail=f"aggregate must be one of {AGGREGATES}")
+    try:
+        top_n = int(form.get("top_n", RANK_TOP_N))
+    except ValueError:
+        raise HTTPException(status_code=422, detail="top_n must be an integer")
+
+    results = await rank_resumes(resumes, job_description, n=max(0, top_n), aggregate=aggregate)
+    return {
+        "job_description": job_description[:200],
+        "aggregate": aggregate,
+        "total": len(results),
+        "results": results,
+    }
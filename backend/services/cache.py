@@ -0,0 +1,129 @@
+# backend/services/cache.py
+import threading
+import time
+from collections import OrderedDict
+
+class LRUCache:
+    """Thread-safe LRU cache with optional item cap, byte budget and TTL.
+
+    ``sizeof(value)`` gives the bytes an entry is charged against
+    ``max_bytes``. ``on_evict(key, value)`` is called for every entry pushed
+    out by the budget or by expiry (not for explicit ``pop``); it runs while
+    the cache lock is held, so a concurrent ``get`` for the same key only
+    misses once the callback has finished (e.g. spilled the entry to disk).
+    """
+
+    def __init__(self, max_items=None, max_bytes=None, ttl=None, sizeof=None, on_evict=None):
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._sizeof = sizeof or (lambda value: 0)
+        self._on_evict = on_evict
+        self._entries = OrderedDict()  # key -> (value, size, expires_at)
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            if entry[2] is not None and entry[2] <= time.monotonic():
+                self._evict(key)
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value):
+        size = self._sizeof(value)
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (value, size, expires_at)
+            self._bytes += size
+            self._enforce_limits(keep=key)
+
+    def pop(self, key, default=None):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return default
+            self._bytes -= entry[1]
+            return entry[0]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def items(self):
+        """Snapshot of (key, value) pairs, least recently used first"""
+        with self._lock:
+            return [(key, entry[0]) for key, entry in self._entries.items()]
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def nbytes(self):
+        return self._bytes
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "items": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+    def _enforce_limits(self, keep):
+        # Expired entries at the cold end go first (anything expired deeper in
+        # the list is caught on its next get), then least recently used
+        if self.ttl:
+            now = time.monotonic()
+            while self._entries:
+                key, entry = next(iter(self._entries.items()))
+                if key == keep or entry[2] > now:
+                    break
+                self._evict(key)
+                self.expirations += 1
+
+        while len(self._entries) > 1 and self._over_budget():
+            key = next(iter(self._entries))
+            if key == keep:
+                break
+            self._evict(key)
+            self.evictions += 1
+
+    def _over_budget(self):
+        if self.max_items is not None and len(self._entries) > self.max_items:
+            return True
+        return self.max_bytes is not None and self._bytes > self.max_bytes
+
+    def _evict(self, key):
+        value, size, _ = self._entries.pop(key)
+        self._bytes -= size
+        if self._on_evict is not None:
+            try:
+                self._on_evict(key, value)
+            except Exception as e:
+                print(f"[ERROR] Cache eviction callback failed for {key}: {e}")
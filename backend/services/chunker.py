@@ -1,3 +1,23 @@
+import re
+from bisect import bisect_left
+from backend.config import CHUNK_MAX_TOKENS, CHUNK_OVERLAP_TOKENS
+
+# Break priorities: a chunk ends before the strongest boundary in its last
+# three quarters, so sections stay whole when they fit and bullets are never cut
+_HEADING, _BULLET, _LINE, _SENTENCE = 4, 3, 2, 1
+
+_SECTIONS = {
+    "summary", "professional summary", "profile", "objective", "about me",
+    "experience", "work experience", "professional experience", "employment", "employment history",
+    "work history", "education", "skills", "technical skills", "core competencies", "projects",
+    "certifications", "certificates", "awards", "achievements", "publications", "languages",
+    "interests", "volunteering", "volunteer experience", "courses", "training", "references", "contact",
+}
+_LINES = re.compile(r"^[ \t]*(\S[^\n]*)", re.M)
+_BULLETS = re.compile(r"[•‣⁃▪●◦➢]|[-*]\s|\d+[.)]\s")
+_SENTENCE_END = re.compile(r"[.!?]\s+(?=[A-Z])")
+_WORDS = re.compile(r"\w+|[^\w\s]")
+
 def chunk_text(text, size=300, overlap=50):
 
     if overlap >= size:
@@ -14,3 +34,114 @@ def chunk_text(text, size=300, overlap=50):
         start += size - overlap
 
     return chunks
+
+class _Encoding:
+    __slots__ = ("offsets",)
+
+    def __init__(self, offsets):
+        self.offsets = offsets
+
+class WordTokenizer:
+    """Words and punctuation as tokens; stands in when the embedder has no fast tokenizer"""
+
+    def encode_batch(self, texts, add_special_tokens=False):
+        return [_Encoding([m.span() for m in _WORDS.finditer(text)]) for text in texts]
+
+def is_heading(line):
+    """A resume section title: a known name ("Experience", "SKILLS:") or a short all-caps line"""
+    title = line.strip().strip(":").strip()
+    if not title or len(title) > 40:
+        return False
+    return title.lower() in _SECTIONS or (title.isupper() and len(title.split()) <= 4)
+
+def _boundaries(text):
+    """Break priorities by character position: headings, bullets, lines, sentences"""
+    found = {}
+    for m in _SENTENCE_END.finditer(text):
+        found[m.end()] = _SENTENCE
+    for m in _LINES.finditer(text):
+        line = m.group(1)
+        if is_heading(line):
+            found[m.start(1)] = _HEADING
+        elif _BULLETS.match(line):
+            found[m.start(1)] = _BULLET
+        else:
+            found[m.start(1)] = _LINE
+    return found
+
+def _spans(text, offsets, max_tokens, overlap_tokens):
+    count = len(offsets)
+    if not count:
+        return []
+    starts = [start for start, _ in offsets]
+
+    # priority[i]: how good a place it is to end a chunk just before token i
+    priority = [0] * (count + 1)
+    for position, level in _boundaries(text).items():
+        i = bisect_left(starts, position)
+        if i < count and level > priority[i]:
+            priority[i] = level
+
+    spans = []
+    first = prev_last = 0
+    min_tokens = max(1, max_tokens // 4)
+    while first < count:
+        last = first + max_tokens
+        if last >= count:
+            last = count
+        else:
+            # Latest strongest boundary in the window; the hard cut is the fallback.
+            # Only cuts past the previous chunk's end count, or a large overlap
+            # would pick the same boundary again and nest this chunk inside it
+            best, best_level = last, priority[last]
+            for i in range(last - 1, max(first + min_tokens, prev_last + 1) - 1, -1):
+                if priority[i] > best_level:
+                    best, best_level = i, priority[i]
+                    if best_level == _HEADING:
+                        break
+            last = best
+        spans.append((offsets[first][0], offsets[last - 1][1]))
+        if last == count:
+            break
+        prev_last = last
+
+        # Overlap carries context across the cut, starting at a line if one is
+        # close; a new section needs none
+        next_first = last
+        if overlap_tokens and priority[last] < _HEADING:
+            next_first = max(first + 1, last - overlap_tokens)
+            for i in range(next_first, last):
+                if priority[i] >= _LINE:
+                    next_first = i
+                    break
+        first = next_first
+    return spans
+
+def chunk_spans_batch(texts, max_tokens=CHUNK_MAX_TOKENS, overlap_tokens=CHUNK_OVERLAP_TOKENS,
+                      tokenizer=None):
+    """Token-bounded, structure-aware chunks as ``(start, end)`` character offsets.
+
+    Every chunk is at most ``max_tokens`` tokens of the embedder's tokenizer
+    (capped at what the model embeds), so nothing is silently truncated.
+    Chunks end at section headings, bullets, lines or sentences where
+    possible. All texts are tokenized in one batched call.
+    """
+    if tokenizer is None:
+        from backend.services.embeddings import get_tokenizer, max_seq_length
+
+        tokenizer = get_tokenizer() or WordTokenizer()
+        max_tokens = min(max_tokens, max_seq_length() - 2)  # [CLS] and [SEP]
+    overlap_tokens = min(overlap_tokens, max_tokens // 2)
+
+    encodings = tokenizer.encode_batch(list(texts), add_special_tokens=False)
+    return [
+        _spans(text, [span for span in encoding.offsets if span[1] > span[0]], max_tokens, overlap_tokens)
+        for text, encoding in zip(texts, encodings)
+    ]
+
+def chunk_spans(text, max_tokens=CHUNK_MAX_TOKENS, overlap_tokens=CHUNK_OVERLAP_TOKENS, tokenizer=None):
+    return chunk_spans_batch([text], max_tokens, overlap_tokens, tokenizer)[0]
+
+def chunk_resume(text, **kwargs):
+    """The chunk strings of one resume (see chunk_spans_batch)"""
+    return [text[start:end] for start, end in chunk_spans(text, **kwargs)]
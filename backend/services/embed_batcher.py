@@ -0,0 +1,106 @@
+# backend/services/embed_batcher.py
+import asyncio
+import queue
+import threading
+import time
+from backend.services.embeddings import embed_texts
+from backend.config import EMBED_BATCH_MAX, EMBED_BATCH_WAIT_MS
+
+class EmbeddingBatcher:
+    """Coalesce embedding requests from concurrent analyses into micro-batches.
+
+    Requests are queued from any event loop; a dedicated worker thread takes
+    the first waiting request, keeps collecting until ``max_batch`` texts are
+    queued or ``max_wait_ms`` has passed, encodes them with one model call and
+    resolves every caller's future with its own slice of the result.
+    """
+
+    def __init__(self, embed_fn=embed_texts, max_batch=EMBED_BATCH_MAX, max_wait_ms=EMBED_BATCH_WAIT_MS):
+        self._embed = embed_fn
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self._queue = queue.Queue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+        self.batches = 0
+        self.texts = 0
+        self.requests = 0
+
+    async def embed(self, texts):
+        """Embed texts without blocking the event loop"""
+        texts = list(texts)
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._ensure_started()
+        self._queue.put((texts, loop, future))
+        return await future
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="embedding-batcher", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            size = len(batch[0][0])
+            deadline = time.monotonic() + self.max_wait
+            while size < self.max_batch:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                batch.append(item)
+                size += len(item[0])
+            self._process(batch)
+
+    def _process(self, batch):
+        texts = [text for item in batch for text in item[0]]
+        try:
+            vectors = self._embed(texts)
+        except Exception as e:
+            for _, loop, future in batch:
+                loop.call_soon_threadsafe(_resolve, future, None, e)
+            return
+
+        self.batches += 1
+        self.texts += len(texts)
+        self.requests += len(batch)
+        start = 0
+        for item_texts, loop, future in batch:
+            end = start + len(item_texts)
+            loop.call_soon_threadsafe(_resolve, future, vectors[start:end], None)
+            start = end
+
+    def stats(self):
+        return {
+            "batches": self.batches,
+            "requests": self.requests,
+            "texts": self.texts,
+            "avg_batch_size": round(self.texts / self.batches, 2) if self.batches else 0.0,
+            "queued": self._queue.qsize(),
+        }
+
+def _resolve(future, result, error):
+    if future.done():  # caller was cancelled
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+
+_batcher = EmbeddingBatcher()
+
+async def embed_texts_async(texts):
+    """embed_texts through the shared micro-batching worker"""
+    return await _batcher.embed(texts)
+
+def embed_batcher_stats():
+    return _batcher.stats()
@@ -0,0 +1,192 @@
+# backend/services/embedding_cache.py
+import asyncio
+import hashlib
+import os
+import sqlite3
+import threading
+import numpy as np
+from backend.services.cache import LRUCache
+from backend.services.embeddings import embed_texts, embedding_model_id
+from backend.services.embed_batcher import embed_texts_async
+from backend.services.quantize import quantize, dequantize, check_storage, record_dtype, pack, unpack
+from backend.config import EMBED_CACHE_MAX_ITEMS, EMBED_CACHE_PATH, EMBED_CACHE_DISK_MAX_ITEMS, VECTOR_STORAGE
+
+_SQLITE_MAX_PARAMS = 500  # stay well under SQLite's bound-parameter limit
+_PRUNE_EVERY = 1000  # vectors written between prunes of the SQLite tier
+
+def normalize_text(text):
+    """Collapse whitespace; the tokenizer ignores it, so embeddings are unchanged"""
+    return " ".join(text.split())
+
+def text_key(text, model):
+    return hashlib.sha256(f"{model}\0{normalize_text(text)}".encode()).hexdigest()
+
+class EmbeddingCache:
+    """Two-tier cache in front of embed_texts.
+
+    Vectors are keyed by (model name, normalized text hash). Lookups go to an
+    in-process LRU first, then to a SQLite file shared by all workers on the
+    node; only the remaining misses are embedded, in one batch (through the
+    micro-batching worker for ``embed_async``).
+
+    Both tiers hold each vector as ``storage`` (VECTOR_STORAGE) bytes; they
+    are widened back to float32 on the way out. The storage is part of the
+    key, so switching it never decodes another format's blobs. The SQLite
+    tier keeps the newest ``disk_max_items`` vectors; ``embed_async`` does
+    its SQLite reads and writes off the event loop.
+    """
+
+    def __init__(self, path=EMBED_CACHE_PATH, max_items=EMBED_CACHE_MAX_ITEMS, model=None,
+                 storage=VECTOR_STORAGE, disk_max_items=EMBED_CACHE_DISK_MAX_ITEMS):
+        self.storage = check_storage(storage)
+        self.model = model or embedding_model_id()
+        if storage != "fp32":
+            self.model += f":{storage}"  # fp32 keeps the keys existing caches were written with
+        self.memory = LRUCache(max_items=max_items)
+        self.disk_max_items = disk_max_items
+        self._db = None
+        self._db_lock = threading.Lock()
+        self._writes = 0
+        if path:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")  # concurrent readers across workers
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+            )
+            self._db.commit()
+
+        self.requested = 0
+        self.disk_hits = 0
+        self.computed = 0
+
+    def embed(self, texts):
+        """Embed texts, reusing cached vectors; same output as embed_texts"""
+        texts = list(texts)
+        if not texts:
+            return embed_texts(texts)
+
+        keys, vectors, missing = self._lookup_memory(texts)
+        if missing and self._db is not None:
+            self._add_disk_hits(vectors, self._load(missing))
+        to_embed = self._misses(keys, texts, vectors)
+        if to_embed:
+            self._store(self._fill(vectors, to_embed, embed_texts(list(to_embed.values()))))
+        return self._assemble(keys, vectors)
+
+    async def embed_async(self, texts):
+        """Like embed, but misses go through the micro-batching worker"""
+        texts = list(texts)
+        if not texts:
+            return await embed_texts_async(texts)
+
+        keys, vectors, missing = self._lookup_memory(texts)
+        if missing and self._db is not None:
+            # SQLite waits up to its busy timeout on other workers' writes
+            self._add_disk_hits(vectors, await asyncio.to_thread(self._load, missing))
+        to_embed = self._misses(keys, texts, vectors)
+        if to_embed:
+            rows = self._fill(vectors, to_embed, await embed_texts_async(list(to_embed.values())))
+            if self._db is not None:
+                await asyncio.to_thread(self._store, rows)
+        return self._assemble(keys, vectors)
+
+    def _lookup_memory(self, texts):
+        """Resolve what we can from memory; returns the distinct keys still missing"""
+        keys = [text_key(text, self.model) for text in texts]
+        vectors = {}
+        for key in set(keys):
+            vector = self.memory.get(key)
+            if vector is not None:
+                vectors[key] = vector
+        self.requested += len(texts)
+        return keys, vectors, [key for key in dict.fromkeys(keys) if key not in vectors]
+
+    def _add_disk_hits(self, vectors, found):
+        for key, vector in found.items():
+            vectors[key] = vector
+            self.memory.put(key, vector)
+            self.disk_hits += 1
+
+    def _misses(self, keys, texts, vectors):
+        """Each distinct text neither tier had, to be embedded once"""
+        to_embed = {}
+        for key, text in zip(keys, texts):
+            if key not in vectors:
+                to_embed.setdefault(key, normalize_text(text))
+        return to_embed
+
+    def _fill(self, vectors, to_embed, fresh):
+        """Add fresh vectors to memory; returns the (key, blob) rows for SQLite"""
+        blobs = [row.tobytes() for row in pack(*quantize(fresh, self.storage))]
+        for key, blob in zip(to_embed, blobs):
+            vectors[key] = blob
+            self.memory.put(key, blob)
+        self.computed += len(to_embed)
+        return list(zip(to_embed, blobs))
+
+    def _assemble(self, keys, vectors):
+        blobs = [vectors[key] for key in keys]
+        dtype = record_dtype(self.storage, self._dim(len(blobs[0])))
+        return dequantize(*unpack(np.frombuffer(b"".join(blobs), dtype=dtype)))
+
+    def _dim(self, nbytes):
+        """Embedding dimension from the size of one stored row"""
+        if self.storage == "int8":
+            return nbytes - 4
+        return nbytes // (4 if self.storage == "fp32" else 2)
+
+    def _load(self, keys):
+        found = {}
+        with self._db_lock:
+            for start in range(0, len(keys), _SQLITE_MAX_PARAMS):
+                batch = keys[start:start + _SQLITE_MAX_PARAMS]
+                rows = self._db.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(batch))})",
+                    batch
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = blob
+        return found
+
+    def _store(self, rows):
+        if self._db is None:
+            return
+        try:
+            with self._db_lock:
+                self._db.executemany("INSERT OR IGNORE INTO embeddings VALUES (?, ?)", rows)
+                before = self._writes
+                self._writes += len(rows)
+                if self.disk_max_items and self._writes // _PRUNE_EVERY != before // _PRUNE_EVERY:
+                    # rowid grows with inserts, so this drops the oldest vectors
+                    self._db.execute(
+                        "DELETE FROM embeddings WHERE rowid <= "
+                        "(SELECT MAX(rowid) FROM embeddings) - ?", (self.disk_max_items,)
+                    )
+                self._db.commit()
+        except sqlite3.Error as e:
+            # A busy or read-only store only costs us persistence
+            print(f"[WARNING] Embedding cache write failed: {e}")
+
+    def stats(self):
+        return {
+            **self.memory.stats(),
+            "storage": self.storage,
+            "requested": self.requested,
+            "disk_hits": self.disk_hits,
+            "computed": self.computed,
+            "overall_hit_rate": round(1 - self.computed / self.requested, 4) if self.requested else 0.0,
+        }
+
+_cache = EmbeddingCache()
+
+def embed_texts_cached(texts):
+    """embed_texts with the shared two-tier embedding cache in front"""
+    return _cache.embed(texts)
+
+async def embed_texts_cached_async(texts):
+    """embed_texts_cached that never blocks the event loop on the model"""
+    return await _cache.embed_async(texts)
+
+def embedding_cache_stats():
+    return _cache.stats()
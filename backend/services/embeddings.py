@@ -1,16 +1,66 @@
-from sentence_transformers import SentenceTransformer
+import threading
 import numpy as np
-import torch
-from backend.config import EMBED_MODEL
+from backend.config import EMBED_MODEL, EMBED_BACKEND
 
-#use cuda if available
-device = "cuda" if torch.cuda.is_available() else "cpu"
-model = SentenceTransformer(EMBED_MODEL, device=device)
+# torch and sentence-transformers take seconds to import; load them on first
+# use (or in the app's warm-up) instead of at import time
+_model = None
+_model_lock = threading.Lock()
+_tokenizer = None
+
+def get_model():
+    """Load the embedding model once, on first use"""
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None and EMBED_BACKEND in ("onnx", "onnx-int8"):
+                # CPU-only; needs neither torch nor transformers at runtime
+                from backend.services.onnx_embedder import OnnxEmbedder
+                _model = OnnxEmbedder(quantized=EMBED_BACKEND == "onnx-int8")
+            elif _model is None:
+                import torch
+                from sentence_transformers import SentenceTransformer
+
+                #use cuda if available
+                device = "cuda" if torch.cuda.is_available() else "cpu"
+                _model = SentenceTransformer(EMBED_MODEL, device=device)
+    return _model
+
+def get_tokenizer():
+    """The embedder's fast tokenizer (a ``tokenizers.Tokenizer``) without
+    truncation or padding, for measuring text in model tokens; None if the
+    model does not expose one"""
+    global _tokenizer
+    if _tokenizer is None:
+        model = get_model()
+        tokenizer = getattr(model, "tokenizer", None)
+        # SentenceTransformer wraps a transformers fast tokenizer
+        tokenizer = getattr(tokenizer, "backend_tokenizer", tokenizer)
+        if tokenizer is None or not hasattr(tokenizer, "encode_batch"):
+            _tokenizer = False
+        else:
+            from tokenizers import Tokenizer
+
+            # A copy, so the embedder's own truncation and padding stay in place
+            _tokenizer = Tokenizer.from_str(tokenizer.to_str())
+            _tokenizer.no_truncation()
+            _tokenizer.no_padding()
+    return _tokenizer or None
+
+def max_seq_length():
+    """Tokens the model embeds per text (special tokens included); the rest is truncated"""
+    return get_model().get_max_seq_length() or 256
+
+def embedding_model_id():
+    """Model identity for cache keys; non-torch backends give slightly different vectors"""
+    if EMBED_BACKEND == "torch":
+        return EMBED_MODEL
+    return f"{EMBED_MODEL}:{EMBED_BACKEND}"
 
 def embed_texts(texts):
-    vectors = model.encode(texts, 
+    vectors = get_model().encode(texts, 
                            convert_to_numpy=True,
                            show_progress_bar=False,
                            batch_size=64,
                            normalize_embeddings=True)
-    return np.array(vectors).astype("float32")    # imp as vector db expects float32 , if not float64 is slower and eats memory
\ No newline at end of file
+    return np.array(vectors).astype("float32")    # imp as vector db expects float32 , if not float64 is slower and eats memory
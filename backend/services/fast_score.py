@@ -0,0 +1,70 @@
+# backend/services/fast_score.py
+import json
+import numpy as np
+from backend.services.sparse import tokenize
+from backend.models.scoring import FAST_SCORE_FEATURES, FAST_SCORE_CALIBRATION
+from backend.config import FAST_SCORE_CALIBRATION_PATH
+
+def keyword_terms(text):
+    """Distinct content words of a text (the BM25 index's terms)"""
+    return set(tokenize(text))
+
+def keyword_overlap(resume_text, job_text):
+    """Share of the JD's content words that appear in the resume"""
+    job_terms = keyword_terms(job_text)
+    if not job_terms:
+        return 0.0
+    return len(job_terms & keyword_terms(resume_text)) / len(job_terms)
+
+def fast_features(chunk_vectors, query_vectors, resume_text, job_text, gaps):
+    """The FAST_SCORE_FEATURES of one (resume, JD) pair.
+
+    ``query_vectors`` is the JD embedding followed by one embedding per
+    requirement line, ``gaps`` the skill-gap engine's verdict.
+    """
+    if len(chunk_vectors):
+        # (queries, chunks) cosines; negative similarity is no evidence at all
+        best = np.clip((query_vectors @ chunk_vectors.T).max(axis=1), 0.0, 1.0)
+    else:
+        best = np.zeros(len(query_vectors), dtype=np.float32)
+    keywords = keyword_overlap(resume_text, job_text)
+    return {
+        "dense": float(best[0]),
+        "requirements": float(best[1:].mean()) if len(best) > 1 else float(best[0]),
+        "keywords": keywords,
+        "skills": gaps["coverage"] if gaps["coverage"] is not None else keywords,
+    }
+
+def load_calibration(path=FAST_SCORE_CALIBRATION_PATH):
+    """The calibration in FAST_SCORE_CALIBRATION, or the built-in defaults"""
+    if not path:
+        return FAST_SCORE_CALIBRATION
+    with open(path, encoding="utf-8") as f:
+        calibration = json.load(f)
+    missing = set(FAST_SCORE_FEATURES) - set(calibration["weights"])
+    if missing:
+        raise ValueError(f"Calibration {path} lacks weights for {sorted(missing)}")
+    return calibration
+
+_calibration = None
+
+def fast_score(features, calibration=None):
+    """Map features to the LLM's 0-100 scale"""
+    global _calibration
+    if calibration is None:
+        if _calibration is None:
+            _calibration = load_calibration()
+        calibration = _calibration
+    weights = calibration["weights"]
+    score = calibration["intercept"] + sum(weights[name] * features[name] for name in FAST_SCORE_FEATURES)
+    return int(round(min(100.0, max(0.0, score))))
+
+def fast_result(features, gaps):
+    """An AnalyzeResponse-shaped result; the LLM-only fields stay empty"""
+    return {
+        "score": fast_score(features),
+        "missing_skills": gaps["missing_skills"],
+        "suggestions": [],
+        "rewritten_bullets": [],
+        "skill_coverage": gaps["coverage"],
+    }
@@ -0,0 +1,878 @@
+# backend/services/jd_corpus.py
+import argparse
+import asyncio
+import fcntl
+import hashlib
+import json
+import mmap
+import os
+import re
+import shutil
+import struct
+import threading
+import time
+import zlib
+import numpy as np
+from contextlib import contextmanager
+from backend.services.embeddings import embed_texts, embedding_model_id
+from backend.services.quantize import check_storage, faiss_sq_index
+from backend.config import (
+    FAISS_PATH, META_PATH, JD_INDEX_TYPE, JD_HNSW_M, JD_HNSW_EF_CONSTRUCTION, JD_HNSW_EF_SEARCH,
+    JD_IVF_NLIST, JD_IVF_NPROBE, JD_PQ_M, JD_PQ_REFINE, JD_VECTOR_STORAGE, JD_INGEST_BATCH,
+    JD_MMAP, JD_WAL_FSYNC, JD_COMPACT_MIN_ROWS, JD_COMPACT_INTERVAL
+)
+
+INDEX_TYPES = ("hnsw", "ivfpq", "flat")
+FIELDS = ("id", "title", "company", "location", "snippet")
+SNIPPET_CHARS = 300
+_IVFPQ_MIN_TRAIN = 10000  # fewer vectors train poor PQ codebooks; stay flat until a compaction has more
+_PURGE_DEAD_SHARE = 0.1  # a merge rebuilds the base without its dead rows once they are this share of it
+_WAL_RECORD = struct.Struct("<III")  # header bytes, vector bytes, crc32 of both
+_GENERATION_FILE = re.compile(r"(?:base-|wal-|.*\.)(\d{6})(?:\.log)?(?:\.tmp)?$")
+# Flat codes and HNSW graphs stay in the page cache, shared by every worker on the node
+_MMAP_FLAGS = ("IO_FLAG_MMAP_IFC", "IO_FLAG_READ_ONLY")
+
+class StaleCorpus(RuntimeError):
+    """The saved corpus was embedded with another model"""
+
+def _faiss():
+    import faiss
+    return faiss
+
+def _fsync(path):
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+@contextmanager
+def _file_lock(path, blocking=True):
+    """An flock on ``path``; yields False instead of waiting when not ``blocking``"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "a") as f:
+        try:
+            fcntl.flock(f, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+        except BlockingIOError:
+            yield False
+            return
+        yield True
+
+class StringColumn:
+    """Strings stored as one UTF-8 blob plus int64 offsets (``offsets[i]:offsets[i + 1]``).
+
+    Loaded ``mapped``, both are read-only memory maps of the saved files.
+    """
+
+    def __init__(self, offsets=None, blob=b""):
+        self.offsets = offsets if offsets is not None else np.zeros(1, dtype=np.int64)
+        self.blob = blob
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        return bytes(self.blob[self.offsets[i]:self.offsets[i + 1]]).decode("utf-8")
+
+    def extend(self, values):
+        # Builds new arrays rather than growing these, so copies of the column stay valid
+        encoded = [value.encode("utf-8") for value in values]
+        ends = self.offsets[-1] + np.cumsum([len(e) for e in encoded], dtype=np.int64)
+        self.offsets = np.concatenate([self.offsets, ends])
+        self.blob = bytes(self.blob) + b"".join(encoded)
+
+    def copy(self):
+        return StringColumn(self.offsets, self.blob)
+
+    def take(self, rows):
+        """A new column of the strings at ``rows``, in that order"""
+        blob = memoryview(self.blob) if len(self.blob) else b""
+        starts, ends = self.offsets[rows], self.offsets[np.asarray(rows) + 1]
+        offsets = np.zeros(len(starts) + 1, dtype=np.int64)
+        np.cumsum(ends - starts, out=offsets[1:])
+        return StringColumn(offsets, b"".join(blob[start:end] for start, end in zip(starts, ends)))
+
+    @classmethod
+    def concat(cls, first, second):
+        return cls(np.concatenate([first.offsets, first.offsets[-1] + second.offsets[1:]]),
+                   bytes(first.blob) + bytes(second.blob))
+
+    @property
+    def nbytes(self):
+        return self.offsets.nbytes + len(self.blob)
+
+    def save(self, directory, name):
+        np.save(os.path.join(directory, f"{name}.offsets.npy"), self.offsets)
+        with open(os.path.join(directory, f"{name}.blob"), "wb") as f:
+            f.write(self.blob)
+
+    @classmethod
+    def load(cls, directory, name, mapped=False):
+        offsets = np.load(os.path.join(directory, f"{name}.offsets.npy"), mmap_mode="r" if mapped else None)
+        with open(os.path.join(directory, f"{name}.blob"), "rb") as f:
+            if mapped and offsets[-1]:
+                return cls(offsets, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+            return cls(offsets, f.read())
+
+def _id_hash(job_id):
+    return np.uint64(int.from_bytes(hashlib.blake2b(job_id.encode("utf-8"), digest_size=8).digest(), "little"))
+
+def _id_lookup(ids):
+    """Rows of a StringColumn of ids sorted by id hash: ``(hashes, rows)``"""
+    hashes = np.fromiter((_id_hash(ids[row]) for row in range(len(ids))), dtype=np.uint64, count=len(ids))
+    rows = np.argsort(hashes, kind="stable")
+    return hashes[rows], rows.astype(np.int64)
+
+def embed_jobs(records, batch_size=JD_INGEST_BATCH):
+    """The vectors of JD records, embedded ``batch_size`` at a time"""
+    texts = [_job_text(r) for r in records]
+    return np.concatenate([
+        embed_texts(texts[start:start + batch_size]) for start in range(0, len(texts), batch_size)
+    ])
+
+def build_jd_index(vectors, index_type=JD_INDEX_TYPE, storage=JD_VECTOR_STORAGE):
+    """An empty ANN index of the given type, trained on ``vectors`` where it needs it.
+
+    ``storage`` is the precision of the vectors the index keeps (JD_VECTOR_STORAGE):
+    the HNSW and flat vectors, or the re-ranking copy behind IVF-PQ.
+    """
+    if index_type not in INDEX_TYPES:
+        raise ValueError(f"JD_INDEX_TYPE must be one of {INDEX_TYPES}")
+    check_storage(storage)
+    faiss = _faiss()
+    d = vectors.shape[1]
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    if index_type == "hnsw":
+        if storage == "fp32":
+            index = faiss.IndexHNSWFlat(d, JD_HNSW_M, faiss.METRIC_INNER_PRODUCT)
+        else:
+            qtype = faiss.ScalarQuantizer.QT_fp16 if storage == "fp16" else faiss.ScalarQuantizer.QT_8bit
+            index = faiss.IndexHNSWSQ(d, qtype, JD_HNSW_M, faiss.METRIC_INNER_PRODUCT)
+            index.train(vectors)
+        index.hnsw.efConstruction = JD_HNSW_EF_CONSTRUCTION
+        index.hnsw.efSearch = JD_HNSW_EF_SEARCH
+        return index
+    if index_type == "ivfpq":
+        if len(vectors) >= _IVFPQ_MIN_TRAIN:
+            # faiss wants >= 39 training points per list
+            nlist = JD_IVF_NLIST or min(int(4 * np.sqrt(len(vectors))), len(vectors) // 39)
+            index = faiss.IndexIVFPQ(faiss.IndexFlatIP(d), d, nlist, JD_PQ_M, 8, faiss.METRIC_INNER_PRODUCT)
+            index.nprobe = JD_IVF_NPROBE
+            if JD_PQ_REFINE:
+                # Re-rank from a second copy of the vectors, in ``storage`` precision
+                index = (faiss.IndexRefineFlat(index) if storage == "fp32"
+                         else faiss.IndexRefine(index, faiss_sq_index(d, storage)))
+                index.k_factor = JD_PQ_REFINE
+            index.train(vectors)
+            return index
+        print(f"[WARNING] {len(vectors)} JDs are too few to train IVF-PQ, using a flat index for now")
+        return faiss.IndexFlatIP(d)
+    index = faiss_sq_index(d, storage)
+    if not index.is_trained:
+        index.train(vectors)
+    return index
+
+def _drop_rows(index, alive):
+    """Remove the rows of ``index`` that are not ``alive``, renumbering the rest
+    densely. Returns ``(index, vectors)``: vectors still to be added back, or None.
+
+    IVF-PQ drops the codes in place and rewrites the ids of its inverted lists,
+    since re-encoding PQ reconstructions would drift. Other indexes are emptied
+    and get their live vectors back, which re-encode to the same codes.
+    """
+    faiss = _faiss()
+    ivf = faiss.try_extract_index_ivf(index)
+    if ivf is not None and not isinstance(index, faiss.IndexRefine):
+        ivf.remove_ids(faiss.IDSelectorBatch(np.flatnonzero(~alive).astype(np.int64)))
+        rows = np.cumsum(alive) - 1
+        invlists = ivf.invlists
+        for number in range(invlists.nlist):
+            size = invlists.list_size(number)
+            if size:
+                ids = faiss.rev_swig_ptr(invlists.get_ids(number), size)
+                ids[:] = rows[ids]
+        return index, None
+    vectors = index.reconstruct_n(0, index.ntotal)[alive]
+    index = faiss.clone_index(index)  # keeps the trained quantizers and parameters
+    index.reset()
+    return index, vectors
+
+def _base_params(index, k, kwargs):
+    faiss = _faiss()
+    if isinstance(index, faiss.IndexHNSW):
+        return faiss.SearchParametersHNSW(efSearch=max(index.hnsw.efSearch, k), **kwargs)
+    if isinstance(index, faiss.IndexIVF):
+        return faiss.SearchParametersIVF(nprobe=index.nprobe, **kwargs)
+    return faiss.SearchParameters(**kwargs) if kwargs else None
+
+def _job_text(record):
+    """What gets embedded for a JD"""
+    return f"{record.get('title', '')}\n{record['text']}".strip()
+
+def _job_fields(record):
+    """The stored FIELDS of a JD record (WAL records carry them already)"""
+    fields = {field: str(record.get(field) or "") for field in FIELDS}
+    if "snippet" not in record:
+        fields["snippet"] = " ".join(record["text"].split())[:SNIPPET_CHARS]
+    return fields
+
+def encode_wal_record(header, vectors=None):
+    head = json.dumps(header).encode("utf-8")
+    body = b"" if vectors is None else np.ascontiguousarray(vectors, dtype=np.float32).tobytes()
+    return _WAL_RECORD.pack(len(head), len(body), zlib.crc32(body, zlib.crc32(head))) + head + body
+
+def read_wal(path, offset=0):
+    """Complete records of a WAL file from ``offset``: ``([(header, vectors)], end offset)``.
+
+    Reading stops at the first torn or corrupt record, i.e. an append that
+    a crash cut short or that another process is still writing.
+    """
+    try:
+        with open(path, "rb") as f:
+            f.seek(offset)
+            data = f.read()
+    except FileNotFoundError:
+        return [], offset
+    records, pos = [], 0
+    while pos + _WAL_RECORD.size <= len(data):
+        head_len, body_len, crc = _WAL_RECORD.unpack_from(data, pos)
+        start = pos + _WAL_RECORD.size
+        end = start + head_len + body_len
+        if end > len(data):
+            break
+        head, body = data[start:start + head_len], data[start + head_len:end]
+        if zlib.crc32(body, zlib.crc32(head)) != crc:
+            break
+        header = json.loads(head)
+        vectors = np.frombuffer(body, dtype=np.float32).reshape(len(header["jobs"]), -1) if body else None
+        records.append((header, vectors))
+        pos = end
+    return records, offset + pos
+
+# Per-generation state, swapped in whole by load() and compact()
+_STATE = ("index", "base_rows", "delta", "columns", "delta_columns", "id_hashes", "id_rows", "delta_ids",
+          "alive", "live", "_selectors", "generation", "stale", "_manifest_mtime", "_wal_offset", "_pending")
+
+def _record(row, base_rows, columns, delta_columns):
+    if row < base_rows:
+        return {field: columns[field][row] for field in FIELDS}
+    return {field: delta_columns[field][row - base_rows] for field in FIELDS}
+
+class JDCorpus:
+    """Job descriptions for resume -> job recommendation.
+
+    One vector per JD, inner product over normalized embeddings. Rows are
+    numbered in insertion order and index columnar metadata: each string
+    field is an offsets array plus a UTF-8 blob, and ``alive`` marks rows
+    that were not removed or replaced. Dead rows are filtered at search
+    time with a bitmap selector and dropped when merge() renumbers the rows. Ids are found through arrays of id hashes
+    sorted with their rows, plus a dict for the delta segment.
+
+    On disk the corpus is a sequence of generations. ``manifest.json`` in
+    META_PATH names the current one: a base ANN index at
+    ``FAISS_PATH.<generation>`` (HNSW, IVF-PQ or flat), its metadata in
+    ``base-<generation>/`` and an append-only write-ahead log
+    ``wal-<generation>.log`` of the adds and removals since. Added vectors
+    form an exact delta segment searched alongside the base; compact()
+    merges the delta into the next generation's base, and swapping the
+    manifest by rename makes it current. A restart loads the base and
+    replays the log. With JD_MMAP the base index, metadata and id lookup
+    are read-only memory maps, so every worker on a node shares one copy
+    through the page cache; only ``alive`` and the delta are per worker.
+    """
+
+    def __init__(self, index_path=FAISS_PATH, meta_dir=META_PATH, index_type=JD_INDEX_TYPE):
+        self.index_path = index_path
+        self.meta_dir = meta_dir
+        self.index_type = index_type
+        self._lock = threading.Lock()  # guards the in-memory state
+        self._searches = 0  # searches running outside the lock on the current delta
+        self._sync_lock = threading.RLock()  # serializes WAL reads and writes in this process
+        self.compactions = 0
+        self.last_compaction_seconds = None
+        self._reset()
+
+    def _reset(self):
+        self.index = None  # base segment: ANN index over rows [0, base_rows)
+        self.base_rows = 0
+        self.delta = None  # delta segment: exact index over the rows after those
+        self.columns = {field: StringColumn() for field in FIELDS}  # base rows, immutable
+        self.delta_columns = {field: StringColumn() for field in FIELDS}
+        self.id_hashes = np.zeros(0, dtype=np.uint64)  # base ids: sorted hashes ...
+        self.id_rows = np.zeros(0, dtype=np.int64)  # ... and their rows
+        self.delta_ids = {}  # job id -> row, live delta rows only
+        self.alive = np.zeros(0, dtype=bool)
+        self.live = 0
+        self._selectors = {}
+        self.generation = 0
+        self.stale = False
+        self._manifest_mtime = None
+        self._wal_offset = 0
+        self._pending = []  # encoded WAL records not yet written
+
+    def __len__(self):
+        return self.live
+
+    def _manifest_path(self):
+        return os.path.join(self.meta_dir, "manifest.json")
+
+    def _base_dir(self, generation):
+        return os.path.join(self.meta_dir, f"base-{generation:06d}")
+
+    def _index_file(self, generation):
+        return f"{self.index_path}.{generation:06d}"
+
+    def _wal_path(self, generation):
+        return os.path.join(self.meta_dir, f"wal-{generation:06d}.log")
+
+    def load(self):
+        """Read the current generation from disk and replay its WAL; an empty
+        corpus when there is none yet"""
+        for attempt in range(3):
+            fresh = JDCorpus(self.index_path, self.meta_dir, self.index_type)
+            try:
+                fresh._read()
+                break
+            except FileNotFoundError:
+                # A compaction replaced the generation while we were reading it
+                if attempt == 2:
+                    raise
+        with self._lock:
+            self._adopt(fresh)
+        return self
+
+    def _adopt(self, other):
+        self.__dict__.update({name: getattr(other, name) for name in _STATE})
+
+    def _read(self):
+        try:
+            self._manifest_mtime = os.stat(self._manifest_path()).st_mtime_ns
+            with open(self._manifest_path(), encoding="utf-8") as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            return
+        self.generation = manifest["generation"]
+        if manifest["model"] != embedding_model_id():
+            print(f"[WARNING] JD corpus was embedded with {manifest['model']}, not "
+                  f"{embedding_model_id()}; re-ingest it with --rebuild to use /recommend")
+            self.stale = True
+            return
+        if manifest["rows"]:
+            faiss = _faiss()
+            flags = 0
+            for flag in _MMAP_FLAGS if JD_MMAP else ():
+                flags |= getattr(faiss, flag)
+            index_file = self._index_file(self.generation)
+            try:
+                self.index = faiss.read_index(index_file, flags)
+            except RuntimeError:
+                # faiss reports a file another process's compaction just deleted
+                # as a RuntimeError; surface it as the FileNotFoundError load retries
+                if not os.path.exists(index_file):
+                    raise FileNotFoundError(index_file)
+                raise
+            base_dir = self._base_dir(self.generation)
+            self.columns = {field: StringColumn.load(base_dir, field, mapped=JD_MMAP) for field in FIELDS}
+            mmap_mode = "r" if JD_MMAP else None
+            self.id_hashes = np.load(os.path.join(base_dir, "id_hashes.npy"), mmap_mode=mmap_mode)
+            self.id_rows = np.load(os.path.join(base_dir, "id_rows.npy"), mmap_mode=mmap_mode)
+            self.alive = np.load(os.path.join(base_dir, "alive.npy"))  # removals flip it, so a private copy
+            self.base_rows = len(self.alive)
+            self.live = int(self.alive.sum())
+        self._replay()
+
+    def _replay(self):
+        """Apply the WAL records past ``_wal_offset``. Consecutive adds go in as
+        one batch: every add_vectors call copies the delta columns"""
+        records, self._wal_offset = read_wal(self._wal_path(self.generation), self._wal_offset)
+        vectors, jobs = [], []
+        for header, record_vectors in records:
+            if header["op"] == "add":
+                vectors.append(record_vectors)
+                jobs += header["jobs"]
+                continue
+            if jobs:
+                self.add_vectors(np.concatenate(vectors), jobs, log=False)
+                vectors, jobs = [], []
+            self.remove(header["ids"], log=False)
+        if jobs:
+            self.add_vectors(np.concatenate(vectors), jobs, log=False)
+        return len(records)
+
+    def maybe_reload(self):
+        """Pick up WAL records or a new generation written by another worker or the CLI"""
+        with self._sync_lock:
+            try:
+                mtime = os.stat(self._manifest_path()).st_mtime_ns
+            except FileNotFoundError:
+                return
+            if mtime != self._manifest_mtime:
+                self.load()
+            elif not self.stale:
+                try:
+                    size = os.path.getsize(self._wal_path(self.generation))
+                except FileNotFoundError:
+                    return
+                if size > self._wal_offset:
+                    self._replay()
+
+    def add(self, records, batch_size=JD_INGEST_BATCH):
+        """Embed JDs ``batch_size`` at a time and add them; a known id replaces the
+        old version. Returns ``(added, replaced)``. Inside commit() use
+        embed_jobs() first and add_vectors(), so the lock is not held while embedding.
+        """
+        if not records:
+            return 0, 0
+        return self.add_vectors(embed_jobs(records, batch_size), records)
+
+    def add_vectors(self, vectors, records, log=True):
+        """add() for JDs that are already embedded. The vectors go to the delta
+        segment; with ``log`` the change is queued for the WAL (see commit())."""
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        jobs = [_job_fields(r) for r in records]
+
+        replaced = 0
+        with self._lock:
+            if self.delta is None:
+                self.delta = _faiss().IndexFlatIP(vectors.shape[1])
+            elif self._searches:
+                # Searches hold the current delta outside the lock; add to a copy
+                self.delta = _faiss().clone_index(self.delta)
+            first = len(self.alive)
+            self.delta.add(vectors)
+            for field in FIELDS:
+                self.delta_columns[field].extend([job[field] for job in jobs])
+            self.alive = np.concatenate([self.alive, np.ones(len(jobs), dtype=bool)])
+            for row, job in enumerate(jobs, first):
+                previous = self._find(job["id"])
+                if previous is not None:
+                    self.alive[previous] = False
+                    replaced += 1
+                else:
+                    self.live += 1
+                self.delta_ids[job["id"]] = row
+            self._selectors = {}
+            if log:
+                self._pending.append(encode_wal_record({"op": "add", "jobs": jobs}, vectors))
+        return len(jobs), replaced
+
+    def remove(self, job_ids, log=True):
+        """Drop JDs by id; returns how many were live"""
+        removed = []
+        with self._lock:
+            for job_id in map(str, job_ids):
+                row = self._find(job_id)
+                if row is not None:
+                    self.alive[row] = False
+                    self.delta_ids.pop(job_id, None)
+                    self.live -= 1
+                    removed.append(job_id)
+            self._selectors = {}
+            if log and removed:
+                self._pending.append(encode_wal_record({"op": "remove", "ids": removed}))
+        return len(removed)
+
+    def _find(self, job_id):
+        """Row of the live version of a JD, or None"""
+        row = self.delta_ids.get(job_id)
+        if row is not None:
+            return row
+        h = _id_hash(job_id)
+        ids = self.columns["id"]
+        # Old versions share the hash; a 64-bit collision with another id is checked for too
+        for i in range(np.searchsorted(self.id_hashes, h), len(self.id_hashes)):
+            if self.id_hashes[i] != h:
+                break
+            row = int(self.id_rows[i])
+            if self.alive[row] and ids[row] == job_id:
+                return row
+        return None
+
+    def merge(self):
+        """Fold the delta segment into the base index, in memory.
+
+        Dead delta rows are dropped; dead base rows too once they make up
+        _PURGE_DEAD_SHARE of the base (that rebuilds an HNSW graph). Rows are
+        renumbered, so the index, metadata and filtered search only grow with
+        the live corpus. Slow for large deltas (HNSW inserts, IVF-PQ
+        training) and not safe against concurrent searches; compact() runs
+        it on a private copy.
+        """
+        base_alive = self.alive[:self.base_rows]
+        base_dead = self.base_rows - int(base_alive.sum())
+        purge = self.index is not None and base_dead and base_dead >= _PURGE_DEAD_SHARE * self.base_rows
+        if (self.delta is None or not self.delta.ntotal) and not purge:
+            return
+        delta_keep = np.flatnonzero(self.alive[self.base_rows:])
+        index = self.index
+        if self.delta is not None:
+            vectors = self.delta.reconstruct_n(0, self.delta.ntotal)[delta_keep]
+        else:
+            vectors = np.zeros((0, index.d), dtype=np.float32)
+        if purge:
+            base_keep = np.flatnonzero(base_alive)
+            index, kept = _drop_rows(index, base_alive)
+            if kept is not None:
+                vectors = np.concatenate([kept, vectors])
+        else:
+            base_keep = np.arange(self.base_rows)
+        if (self.index_type == "ivfpq" and isinstance(index, _faiss().IndexFlat)
+                and index.ntotal + len(vectors) >= _IVFPQ_MIN_TRAIN):
+            # A corpus that started too small for IVF-PQ: train it now
+            vectors = np.concatenate([index.reconstruct_n(0, index.ntotal), vectors])
+            index = None
+        if index is None and len(vectors):
+            index = build_jd_index(vectors, self.index_type)
+        if index is not None:
+            index.add(vectors)  # every index type numbers vectors in order, i.e. by row
+
+        rows = len(base_keep) + len(delta_keep)
+        self.index, self.base_rows, self.delta = index, rows, None
+        self.columns = {
+            field: StringColumn.concat(self.columns[field].take(base_keep) if purge else self.columns[field],
+                                       self.delta_columns[field].take(delta_keep))
+            for field in FIELDS
+        }
+        self.delta_columns = {field: StringColumn() for field in FIELDS}
+        self.alive = np.ones(rows, dtype=bool)
+        self.live = rows
+        self.id_hashes, self.id_rows = _id_lookup(self.columns["id"])
+        self.delta_ids = {}
+        self._selectors = {}
+
+    def _selector(self, index, first):
+        """Live-row filter of a segment as ``(IDSelectorBitmap, bitmap)``, or None
+        when every row is live; call with the lock held"""
+        if first not in self._selectors:
+            alive = self.alive[first:first + index.ntotal]
+            if alive.all():
+                self._selectors[first] = None
+            else:
+                bitmap = np.packbits(alive, bitorder="little")
+                self._selectors[first] = (
+                    _faiss().IDSelectorBitmap(len(alive), _faiss().swig_ptr(bitmap)), bitmap
+                )
+        return self._selectors[first]
+
+    def _search_params(self, index, selector, k):
+        """Per-call search parameters: live-row filter and a wide enough beam"""
+        faiss = _faiss()
+        kwargs = {"sel": selector[0]} if selector is not None else {}
+        if isinstance(index, faiss.IndexRefine):
+            # The filter applies to the PQ candidates; re-ranking only reorders them
+            return faiss.IndexRefineSearchParameters(
+                k_factor=index.k_factor,
+                base_index_params=_base_params(faiss.downcast_index(index.base_index), k, kwargs)
+            )
+        return _base_params(index, k, kwargs)
+
+    def search(self, query_vectors, k):
+        """Top-k live JDs for a set of query vectors (a resume's chunks), by best similarity.
+
+        Returns the JDs' metadata with a ``score``, best first. The lock is
+        only held to take a snapshot (segments, live-row filters, metadata);
+        the FAISS searches run outside it, so a worker's searches overlap.
+        add_vectors() copies the delta while any are running.
+        """
+        with self._lock:
+            if not self.live:
+                return []
+            segments = [(index, first, self._selector(index, first))
+                        for index, first in ((self.index, 0), (self.delta, self.base_rows))
+                        if index is not None and index.ntotal]
+            base_rows, columns, delta_columns = self.base_rows, self.columns, self.delta_columns
+            self._searches += 1
+        try:
+            queries = np.ascontiguousarray(query_vectors, dtype=np.float32).reshape(-1, segments[0][0].d)
+            found_rows, found_scores = [], []
+            # segments holds the selector bitmaps, which must outlive the searches
+            for index, first, selector in segments:
+                fetch = min(k, index.ntotal)
+                scores, rows = index.search(queries, fetch, params=self._search_params(index, selector, fetch))
+                found = rows >= 0
+                found_rows.append(rows[found] + first)
+                found_scores.append(scores[found])
+        finally:
+            with self._lock:
+                self._searches -= 1
+        rows, scores = np.concatenate(found_rows), np.concatenate(found_scores)
+
+        # Best score per job over all query vectors
+        unique, inverse = np.unique(rows, return_inverse=True)
+        best = np.full(len(unique), -np.inf, dtype=np.float32)
+        np.maximum.at(best, inverse, scores)
+        order = np.argsort(-best, kind="stable")[:k]
+        return [
+            {**_record(int(unique[i]), base_rows, columns, delta_columns), "score": round(float(best[i]), 4)}
+            for i in order
+        ]
+
+    def record(self, row):
+        with self._lock:
+            return _record(row, self.base_rows, self.columns, self.delta_columns)
+
+    def commit(self, change):
+        """Apply ``change(corpus)`` on top of the latest state and append it to the WAL.
+
+        A file lock serializes workers and the ingestion CLI; the call
+        returns once the records are written (and fsynced, JD_WAL_FSYNC).
+        Every other writer waits on ``change``, so embed before calling.
+        """
+        with _file_lock(self.meta_dir + ".lock"), self._sync_lock:
+            self.maybe_reload()
+            if self.stale:
+                raise StaleCorpus("The JD corpus was embedded with another model; re-ingest it with --rebuild")
+            if not os.path.exists(self._manifest_path()):
+                self._publish(0, 0)
+                self._manifest_mtime = os.stat(self._manifest_path()).st_mtime_ns
+            try:
+                result = change(self)
+                self._write_pending()
+            except BaseException:
+                # Drop whatever did not reach the log
+                self.load()
+                raise
+        return result
+
+    def _write_pending(self):
+        if not self._pending:
+            return
+        with open(self._wal_path(self.generation), "ab") as f:
+            if f.tell() > self._wal_offset:
+                f.truncate(self._wal_offset)  # torn record of a writer that crashed
+            for record in self._pending:
+                f.write(record)
+            f.flush()
+            if JD_WAL_FSYNC:
+                os.fsync(f.fileno())
+            self._wal_offset = f.tell()
+        self._pending = []
+
+    def needs_compaction(self):
+        return len(self.alive) - self.base_rows >= JD_COMPACT_MIN_ROWS
+
+    def compact(self):
+        """Merge the WAL into a new generation and make it current.
+
+        Runs mostly outside the write lock: the merge works on a snapshot
+        (the base index re-read from disk plus a copy of the delta), and
+        records appended meanwhile are carried over to the new WAL. Returns
+        False when another process is compacting or the WAL is empty.
+        """
+        start = time.perf_counter()
+        with _file_lock(self.meta_dir + ".compact.lock", blocking=False) as locked:
+            if not locked:
+                return False
+            with _file_lock(self.meta_dir + ".lock"), self._sync_lock:
+                self.maybe_reload()
+                if self.stale or not self._wal_offset:
+                    return False
+                snapshot = self._snapshot()
+
+            snapshot.merge()
+            generation = snapshot.generation + 1
+            snapshot._write_base(generation)
+
+            with _file_lock(self.meta_dir + ".lock"), self._sync_lock:
+                self.maybe_reload()
+                with open(self._wal_path(snapshot.generation), "rb") as f:
+                    f.seek(snapshot._wal_offset)
+                    tail = f.read(self._wal_offset - snapshot._wal_offset)
+                self._publish(generation, len(snapshot.alive), tail)
+                if JD_MMAP:
+                    # Map the files just written, shared with the other workers, instead of
+                    # keeping the merge's private copy
+                    self.load()
+                else:
+                    snapshot.generation, snapshot._wal_offset = generation, 0
+                    snapshot._manifest_mtime = os.stat(self._manifest_path()).st_mtime_ns
+                    snapshot._replay()
+                    with self._lock:
+                        self._adopt(snapshot)
+            self._remove_old_generations()
+        self.compactions += 1
+        self.last_compaction_seconds = round(time.perf_counter() - start, 3)
+        print(f"[INFO] Compacted the JD corpus into generation {generation} "
+              f"({len(snapshot.alive)} rows) in {self.last_compaction_seconds}s")
+        return True
+
+    def clear(self):
+        """Start over with an empty generation (``--rebuild``)"""
+        with _file_lock(self.meta_dir + ".compact.lock"), _file_lock(self.meta_dir + ".lock"), self._sync_lock:
+            generation = self.generation + 1 if os.path.exists(self._manifest_path()) else 0
+            self._publish(generation, 0)
+            self.load()
+            self._remove_old_generations()
+
+    def _snapshot(self):
+        snapshot = JDCorpus(self.index_path, self.meta_dir, self.index_type)
+        if self.base_rows:
+            # Generations are immutable, so reading the base does not need the lock; not
+            # mapped, since the merge adds to it
+            snapshot.index = _faiss().read_index(self._index_file(self.generation))
+        with self._lock:
+            snapshot.base_rows = self.base_rows
+            snapshot.delta = _faiss().clone_index(self.delta) if self.delta is not None else None
+            snapshot.columns = self.columns
+            snapshot.delta_columns = {field: column.copy() for field, column in self.delta_columns.items()}
+            snapshot.id_hashes, snapshot.id_rows = self.id_hashes, self.id_rows
+            snapshot.delta_ids = dict(self.delta_ids)
+            snapshot.alive = self.alive.copy()
+            snapshot.live = self.live
+            snapshot.generation = self.generation
+            snapshot._wal_offset = self._wal_offset
+        return snapshot
+
+    def _write_base(self, generation):
+        """Write the base segment (call merge() first) as ``generation``'s files"""
+        base_dir = self._base_dir(generation)
+        staging = base_dir + ".tmp"
+        shutil.rmtree(staging, ignore_errors=True)
+        os.makedirs(staging)
+        for field, column in self.columns.items():
+            column.save(staging, field)
+        np.save(os.path.join(staging, "id_hashes.npy"), self.id_hashes)
+        np.save(os.path.join(staging, "id_rows.npy"), self.id_rows)
+        np.save(os.path.join(staging, "alive.npy"), self.alive)
+        for name in os.listdir(staging):
+            _fsync(os.path.join(staging, name))
+        shutil.rmtree(base_dir, ignore_errors=True)
+        os.rename(staging, base_dir)
+        if self.index is not None:
+            path = self._index_file(generation)
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            _faiss().write_index(self.index, path + ".tmp")
+            _fsync(path + ".tmp")
+            os.replace(path + ".tmp", path)
+
+    def _publish(self, generation, rows, wal=b""):
+        """Make ``generation`` current: write its WAL, then swap the manifest in.
+        Its base files (when ``rows``) must be in place."""
+        os.makedirs(self.meta_dir, exist_ok=True)
+        wal_path = self._wal_path(generation)
+        with open(wal_path + ".tmp", "wb") as f:
+            f.write(wal)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(wal_path + ".tmp", wal_path)
+        manifest = {"generation": generation, "model": embedding_model_id(), "index_type": self.index_type,
+                    "rows": rows, "saved_at": time.time()}
+        with open(self._manifest_path() + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(self._manifest_path() + ".tmp", self._manifest_path())
+        _fsync(self.meta_dir)
+
+    def _remove_old_generations(self):
+        """Delete files of other generations and of interrupted compactions"""
+        index_dir = os.path.dirname(self.index_path) or "."
+        index_name = os.path.basename(self.index_path)
+        candidates = [os.path.join(self.meta_dir, name) for name in os.listdir(self.meta_dir)]
+        candidates += [os.path.join(index_dir, name) for name in os.listdir(index_dir)
+                       if name.startswith(index_name + ".")]
+        for path in candidates:
+            match = _GENERATION_FILE.match(os.path.basename(path))
+            if match and (int(match.group(1)) != self.generation or path.endswith(".tmp")):
+                if os.path.isdir(path):
+                    shutil.rmtree(path, ignore_errors=True)
+                else:
+                    os.remove(path)
+
+    def stats(self):
+        index = self.index
+        return {
+            "index_type": type(index).__name__ if index is not None else None,
+            "generation": self.generation,
+            "mmap": JD_MMAP,
+            "jobs": self.live,
+            "rows": len(self.alive),
+            "base_rows": self.base_rows,
+            "delta_rows": int(len(self.alive) - self.base_rows),
+            "removed_rows": int(len(self.alive) - self.live),
+            "wal_bytes": self._wal_offset,
+            "compactions": self.compactions,
+            "last_compaction_seconds": self.last_compaction_seconds,
+            "metadata_bytes": sum(column.nbytes for columns in (self.columns, self.delta_columns)
+                                  for column in columns.values()),
+        }
+
+_corpus = None
+_corpus_lock = threading.Lock()
+_compactor = None
+
+def get_jd_corpus():
+    global _corpus
+    if _corpus is None:
+        with _corpus_lock:
+            if _corpus is None:
+                _corpus = JDCorpus().load()
+    return _corpus
+
+def jd_corpus_stats():
+    return get_jd_corpus().stats() if _corpus is not None else {"loaded": False}
+
+def compact_if_needed():
+    corpus = get_jd_corpus()
+    corpus.maybe_reload()
+    return corpus.needs_compaction() and corpus.compact()
+
+async def _compact_periodically():
+    while True:
+        await asyncio.sleep(JD_COMPACT_INTERVAL)
+        try:
+            await asyncio.to_thread(compact_if_needed)
+        except Exception as e:
+            print(f"[ERROR] JD corpus compaction failed: {e}")
+
+async def start_compactor():
+    """Background compaction of the JD corpus WAL (JD_COMPACT_INTERVAL); every
+    worker checks, the compaction lock lets one of them run it"""
+    global _compactor
+    if JD_COMPACT_INTERVAL > 0:
+        _compactor = asyncio.create_task(_compact_periodically())
+
+async def stop_compactor():
+    global _compactor
+    if _compactor is not None:
+        _compactor.cancel()
+        await asyncio.gather(_compactor, return_exceptions=True)
+        _compactor = None
+
+def _read_records(path):
+    with open(path, encoding="utf-8") as f:
+        for n, line in enumerate(f, 1):
+            if line.strip():
+                record = json.loads(line)
+                if "id" not in record or not record.get("text"):
+                    raise ValueError(f"{path}:{n}: records need an id and a text")
+                yield record
+
+def main():
+    """python -m backend.services.jd_corpus jobs.jsonl [--rebuild] [--no-compact]"""
+    parser = argparse.ArgumentParser(description="Bulk-load job descriptions into the /recommend corpus")
+    parser.add_argument("jobs", help="JSONL file of {id, title, text, company, location}")
+    parser.add_argument("--rebuild", action="store_true",
+                        help="start from an empty corpus (e.g. to change JD_INDEX_TYPE or EMBED_MODEL)")
+    parser.add_argument("--no-compact", action="store_true",
+                        help="leave the JDs in the WAL for the server's background compactor")
+    args = parser.parse_args()
+
+    records = list(_read_records(args.jobs))
+    corpus = JDCorpus().load()
+    if args.rebuild:
+        corpus.clear()
+
+    start = time.perf_counter()
+    # Commit in large slices: progress reports, and a crash keeps what was logged
+    for first in range(0, len(records), 50 * JD_INGEST_BATCH):
+        done = min(first + 50 * JD_INGEST_BATCH, len(records))
+        vectors = embed_jobs(records[first:done])
+        corpus.commit(lambda c: c.add_vectors(vectors, records[first:done]))
+        print(f"[INFO] {done}/{len(records)} JDs, {done / (time.perf_counter() - start):.0f}/s")
+    if not args.no_compact:
+        corpus.compact()
+    print(f"[INFO] {len(corpus)} JDs in {corpus.meta_dir}, generation {corpus.generation}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,392 @@
+# backend/services/jobs.py
+import asyncio
+import json
+import math
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import deque
+from backend.services.metrics import Histogram
+from backend.services.pipeline import analyze_resume_bytes
+from backend.config import (
+    JOB_BACKEND, JOB_DB_PATH, JOB_WORKERS, JOB_QUEUE_MAX, JOB_TIMEOUT, JOB_RESULT_TTL
+)
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+_FIELDS = ("id", "status", "created_at", "started_at", "finished_at", "result", "error")
+_PRUNE_EVERY = 60  # seconds between sweeps of expired and stale jobs
+_STALE_GRACE = 60  # extra seconds past JOB_TIMEOUT before a running job counts as dead
+
+def _new_job():
+    return {
+        "id": uuid.uuid4().hex,
+        "status": QUEUED,
+        "created_at": time.time(),
+        "started_at": None,
+        "finished_at": None,
+        "result": None,
+        "error": None,
+    }
+
+def _discard(payload):
+    """Remove the spooled upload of a job that will never be parsed"""
+    discard = getattr(payload[0], "discard", None) if payload is not None else None
+    if discard is not None:
+        discard()
+
+class MemoryJobStore:
+    """Jobs in a process-local dict; lost on restart.
+
+    Payloads are kept as ``read_upload`` returned them: uploads over
+    UPLOAD_SPOOL_BYTES wait in their spooled file, so a full queue holds at
+    most JOB_QUEUE_MAX * UPLOAD_SPOOL_BYTES in memory.
+    """
+
+    name = "memory"
+
+    def __init__(self):
+        self._jobs = {}
+        self._payloads = {}
+        self._lock = threading.Lock()
+
+    def add(self, job, file_bytes, params):
+        with self._lock:
+            self._jobs[job["id"]] = dict(job)
+            self._payloads[job["id"]] = (file_bytes, params)
+
+    def get(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job is not None else None
+
+    def claim(self, job_id, started_at):
+        """Move a queued job to running; returns its payload, or None if taken"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job["status"] != QUEUED:
+                return None
+            job.update(status=RUNNING, started_at=started_at)
+            return self._payloads[job_id]
+
+    def finish(self, job_id, status, result=None, error=None):
+        with self._lock:
+            self._jobs[job_id].update(status=status, finished_at=time.time(), result=result, error=error)
+            _discard(self._payloads.pop(job_id, None))
+
+    def requeue(self, job_id):
+        """Put a running job back to queued, e.g. when its worker is shut down"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None and job["status"] == RUNNING:
+                job.update(status=QUEUED, started_at=None)
+
+    def fail_stale(self, stale_before):
+        with self._lock:
+            for job_id, job in self._jobs.items():
+                if job["status"] == RUNNING and job["started_at"] < stale_before:
+                    job.update(status=FAILED, finished_at=time.time(), error="interrupted by a restart")
+                    _discard(self._payloads.pop(job_id, None))
+
+    def recover(self, stale_before):
+        return []
+
+    def prune(self, before):
+        with self._lock:
+            expired = [
+                job_id for job_id, job in self._jobs.items()
+                if job["finished_at"] is not None and job["finished_at"] < before
+            ]
+            for job_id in expired:
+                del self._jobs[job_id]
+
+class SQLiteJobStore:
+    """Jobs in a SQLite file: status survives restarts and is visible to every
+    worker process on the node; queued jobs are picked up again on startup"""
+
+    name = "sqlite"
+
+    def __init__(self, path=JOB_DB_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            """CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY, status TEXT NOT NULL, created_at REAL NOT NULL,
+                started_at REAL, finished_at REAL, result TEXT, error TEXT,
+                resume BLOB, params TEXT
+            )"""
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at)")
+        self._db.commit()
+        self._lock = threading.Lock()
+
+    def add(self, job, file_bytes, params):
+        if not isinstance(file_bytes, (bytes, bytearray, memoryview)):
+            # A spooled upload: the row must survive a restart, the temp file need not
+            with open(file_bytes, "rb") as f:
+                data = f.read()
+            _discard((file_bytes,))
+            file_bytes = data
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO jobs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (job["id"], job["status"], job["created_at"], None, None, None, None,
+                 file_bytes, json.dumps(params))
+            )
+            self._db.commit()
+
+    def get(self, job_id):
+        with self._lock:
+            row = self._db.execute(
+                f"SELECT {', '.join(_FIELDS)} FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        job = dict(zip(_FIELDS, row))
+        if job["result"] is not None:
+            job["result"] = json.loads(job["result"])
+        return job
+
+    def claim(self, job_id, started_at):
+        # The status check makes the claim atomic across worker processes
+        with self._lock:
+            claimed = self._db.execute(
+                "UPDATE jobs SET status = ?, started_at = ? WHERE id = ? AND status = ?",
+                (RUNNING, started_at, job_id, QUEUED)
+            ).rowcount
+            self._db.commit()
+            if not claimed:
+                return None
+            file_bytes, params = self._db.execute(
+                "SELECT resume, params FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        return file_bytes, json.loads(params)
+
+    def finish(self, job_id, status, result=None, error=None):
+        with self._lock:
+            self._db.execute(
+                "UPDATE jobs SET status = ?, finished_at = ?, result = ?, error = ?, resume = NULL "
+                "WHERE id = ?",
+                (status, time.time(), json.dumps(result) if result is not None else None, error, job_id)
+            )
+            self._db.commit()
+
+    def requeue(self, job_id):
+        """Put a running job back to queued, e.g. when its worker is shut down"""
+        with self._lock:
+            self._db.execute(
+                "UPDATE jobs SET status = ?, started_at = NULL WHERE id = ? AND status = ?",
+                (QUEUED, job_id, RUNNING)
+            )
+            self._db.commit()
+
+    def fail_stale(self, stale_before):
+        """Fail jobs left running by a process that died mid-job"""
+        with self._lock:
+            self._db.execute(
+                "UPDATE jobs SET status = ?, finished_at = ?, error = ?, resume = NULL "
+                "WHERE status = ? AND started_at < ?",
+                (FAILED, time.time(), "interrupted by a restart", RUNNING, stale_before)
+            )
+            self._db.commit()
+
+    def recover(self, stale_before):
+        """Fail jobs a dead process left running; return queued ids, oldest first"""
+        self.fail_stale(stale_before)
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT id FROM jobs WHERE status = ? ORDER BY created_at", (QUEUED,)
+            ).fetchall()
+        return [job_id for job_id, in rows]
+
+    def prune(self, before):
+        with self._lock:
+            self._db.execute("DELETE FROM jobs WHERE finished_at < ?", (before,))
+            self._db.commit()
+
+class JobQueue:
+    """Analyses run by a pool of worker tasks instead of on the request.
+
+    ``submit`` records the job in the store and puts its id on a bounded
+    in-process queue; ``workers`` tasks pull ids, claim the job, run the
+    handler under a per-job timeout and store the outcome. Store calls run
+    in a thread: a SQLite store shared by several worker processes can wait
+    on its busy timeout. A full queue raises ``asyncio.QueueFull`` so
+    callers can push back. Jobs recovered
+    from the store beyond ``max_queued`` wait in a backlog and are fed in
+    as queue slots free up; a job cut off by ``stop`` goes back to queued.
+    """
+
+    def __init__(self, handler, store, workers=JOB_WORKERS, max_queued=JOB_QUEUE_MAX,
+                 timeout=JOB_TIMEOUT, result_ttl=JOB_RESULT_TTL):
+        self.handler = handler
+        self.store = store
+        self.workers = max(1, workers)
+        self.max_queued = max_queued
+        self.timeout = timeout
+        self.result_ttl = result_ttl
+        self._queue = None  # created in start(), on the serving event loop
+        self._tasks = []
+        self._backlog = deque()  # recovered ids waiting for a queue slot
+        self._adding = 0  # queue slots held by submits still writing to the store
+        self._last_prune = time.time()
+
+        self.running = 0
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.timed_out = 0
+        self.rejected = 0
+        self.wait_seconds = Histogram()
+        self.run_seconds = Histogram()
+
+    async def start(self):
+        self._queue = asyncio.Queue(self.max_queued)
+        recovered = await asyncio.to_thread(self.store.recover, time.time() - self.timeout - _STALE_GRACE)
+        self._backlog.extend(recovered)
+        self._refill()
+        if recovered:
+            print(f"[INFO] Re-queued {len(recovered)} jobs from the job store")
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def submit(self, file_bytes, job_text, refresh=False, retrieval=None):
+        """Queue an analysis; returns the new job record"""
+        if self._queue is None:
+            raise RuntimeError("Job workers are not running")
+        self._refill()
+        if not self._free_slots():
+            self.rejected += 1
+            raise asyncio.QueueFull()
+
+        job = _new_job()
+        # Hold the slot while the row is written, so concurrent submits can't overfill the queue
+        self._adding += 1
+        try:
+            await asyncio.to_thread(
+                self.store.add, job, file_bytes,
+                {"job_text": job_text, "refresh": refresh, "retrieval": retrieval}
+            )
+        finally:
+            self._adding -= 1
+        self._queue.put_nowait(job["id"])
+        self.submitted += 1
+        await self._maybe_prune()
+        return job
+
+    async def get(self, job_id):
+        return await asyncio.to_thread(self.store.get, job_id)
+
+    def retry_after(self):
+        """Rough seconds until a queue slot frees up, for 429 responses"""
+        per_job = self.run_seconds.stats()["avg"] or 1.0
+        return max(1, math.ceil(per_job * self._queue.qsize() / self.workers))
+
+    async def _work(self):
+        while True:
+            job_id = await self._queue.get()
+            self._refill()
+            try:
+                await self._run(job_id)
+            except Exception as e:
+                print(f"[ERROR] Job {job_id} crashed the worker: {e}")
+            finally:
+                self._queue.task_done()
+            await self._maybe_prune()
+
+    def _free_slots(self):
+        return self.max_queued - self._queue.qsize() - self._adding
+
+    def _refill(self):
+        while self._backlog and self._free_slots() > 0:
+            self._queue.put_nowait(self._backlog.popleft())
+
+    async def _run(self, job_id):
+        started = time.time()
+        payload = await asyncio.to_thread(self.store.claim, job_id, started)
+        if payload is None:  # already taken by another worker process
+            return
+        file_bytes, params = payload
+        job = await asyncio.to_thread(self.store.get, job_id)
+        self.wait_seconds.observe(started - job["created_at"])
+
+        self.running += 1
+        try:
+            result = await asyncio.wait_for(self.handler(file_bytes, **params), self.timeout)
+        except asyncio.CancelledError:
+            # Shutdown or redeploy: leave the job for the next worker to pick up
+            await asyncio.to_thread(self.store.requeue, job_id)
+            raise
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            await asyncio.to_thread(self.store.finish, job_id, FAILED,
+                                    error=f"Timed out after {self.timeout:g}s")
+        except Exception as e:
+            self.failed += 1
+            print(f"[ERROR] Job {job_id} failed: {e}")
+            await asyncio.to_thread(self.store.finish, job_id, FAILED, error=str(e)[:200])
+        else:
+            self.completed += 1
+            await asyncio.to_thread(self.store.finish, job_id, DONE, result=result)
+        finally:
+            self.running -= 1
+            self.run_seconds.observe(time.time() - started)
+
+    async def _maybe_prune(self):
+        now = time.time()
+        if now - self._last_prune <= _PRUNE_EVERY:
+            return
+        self._last_prune = now
+        # wait_for caps every run at self.timeout, so anything running longer
+        # belongs to a process that died without finishing it
+        await asyncio.to_thread(self.store.fail_stale, now - self.timeout - _STALE_GRACE)
+        if self.result_ttl:
+            await asyncio.to_thread(self.store.prune, now - self.result_ttl)
+
+    def stats(self):
+        return {
+            "backend": self.store.name,
+            "workers": self.workers,
+            "queued": (self._queue.qsize() if self._queue is not None else 0) + len(self._backlog),
+            "max_queued": self.max_queued,
+            "running": self.running,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "timed_out": self.timed_out,
+            "rejected": self.rejected,
+            "wait_seconds": self.wait_seconds.stats(),
+            "run_seconds": self.run_seconds.stats(),
+        }
+
+def _make_store():
+    if JOB_BACKEND == "sqlite":
+        return SQLiteJobStore(JOB_DB_PATH)
+    return MemoryJobStore()
+
+_jobs = JobQueue(analyze_resume_bytes, _make_store())
+
+async def start_job_workers():
+    await _jobs.start()
+
+async def stop_job_workers():
+    await _jobs.stop()
+
+async def submit_job(file_bytes, job_text, refresh=False, retrieval=None):
+    return await _jobs.submit(file_bytes, job_text, refresh, retrieval)
+
+async def get_job(job_id):
+    return await _jobs.get(job_id)
+
+def job_retry_after():
+    return _jobs.retry_after()
+
+def job_queue_stats():
+    return _jobs.stats()
@@ -1,72 +1,228 @@
 # backend/services/llm.py
+import asyncio
 import json
+import math
 import re
 import os
-from backend.config import USE_SAGEMAKER, GROQ_API_KEY, USE_GROQ
+import threading
+import weakref
+from backend.config import (
+    USE_SAGEMAKER, SAGEMAKER_ENDPOINT, GROQ_API_KEY, USE_GROQ, GROQ_MODEL,
+    GROQ_BASE_URL, LLM_TIMEOUT, LLM_MAX_RETRIES, LLM_MAX_CONNECTIONS, SKILL_GAP_MODE
+)
 
-def call_groq_llm(prompt: str):
-    """Call Groq API for fast, reliable JSON generation"""
-    from groq import Groq
-    
-    client = Groq(api_key=GROQ_API_KEY)
-    
-    try:
-        response = client.chat.completions.create(
-            model="llama-3.3-70b-versatile",  # Fast and accurate
-            messages=[
-                {
-                    "role": "system",
-                    "content": """You are an expert resume analyzer and ATS evaluator. 
-You MUST respond with ONLY valid JSON in the exact format specified. 
+SYSTEM_PROMPT = """You are an expert resume analyzer and ATS evaluator.
+You MUST respond with ONLY valid JSON in the exact format specified.
 No additional text, explanations, or markdown - just pure JSON."""
-                },
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-            temperature=0.3,
-            max_tokens=800,
-            response_format={"type": "json_object"}  # Force JSON output
-        )
-        
-        output = response.choices[0].message.content
-        print(f"[DEBUG] Groq Output: {output[:200]}...")
-        
-        # Parse JSON
-        result = json.loads(output)
-        
-        # Validate structure
-        required_keys = ["score", "missing_skills", "suggestions", "rewritten_bullets"]
-        if all(key in result for key in required_keys):
-            print(f"[DEBUG] Successfully parsed result with score: {result.get('score')}")
-            return result
-        else:
-            print(f"[WARNING] Missing required keys in response")
-            return {
-                "score": result.get("score", 0),
-                "missing_skills": result.get("missing_skills", []),
-                "suggestions": result.get("suggestions", ["Incomplete response from AI"]),
-                "rewritten_bullets": result.get("rewritten_bullets", [])
+
+REQUIRED_KEYS = ["score", "missing_skills", "suggestions", "rewritten_bullets"]
+if SKILL_GAP_MODE == "replace":
+    # The skill-gap engine fills missing_skills; the prompt does not ask for it
+    REQUIRED_KEYS.remove("missing_skills")
+
+# One client per process (sync) / per event loop (async), so TLS sessions
+# and keep-alive connections are reused across requests
+_client = None
+_client_lock = threading.Lock()
+_async_clients = weakref.WeakKeyDictionary()
+
+def _error_result(message):
+    return {
+        "score": 0,
+        "missing_skills": [],
+        "suggestions": [message],
+        "rewritten_bullets": [],
+        "error": message
+    }
+
+def _coerce_score(value):
+    """The model's score as an int in 0-100, or None when it is not a number"""
+    if isinstance(value, bool):
+        return None
+    try:
+        score = float(value)
+    except (TypeError, ValueError):
+        return None
+    if math.isnan(score):
+        return None
+    return int(round(min(100.0, max(0.0, score))))
+
+def _string_list(value):
+    if isinstance(value, str):
+        return [value]
+    if not isinstance(value, list):
+        return []
+    return [item if isinstance(item, str) else json.dumps(item) for item in value if item is not None]
+
+def _chat_request(prompt: str):
+    return dict(
+        model=GROQ_MODEL,  # llama-3.3-70b-versatile by default: fast and accurate
+        messages=[
+            {
+                "role": "system",
+                "content": SYSTEM_PROMPT
+            },
+            {
+                "role": "user",
+                "content": prompt
             }
-        
+        ],
+        temperature=0.3,
+        max_tokens=800,
+        response_format={"type": "json_object"}  # Force JSON output
+    )
+
+def _parse_output(output):
+    """Parse and validate the model's JSON answer"""
+    print(f"[DEBUG] Groq Output: {output[:200]}...")
+
+    try:
+        result = json.loads(output)
     except json.JSONDecodeError as e:
         print(f"[ERROR] JSON Parse Error: {e}")
         print(f"[ERROR] Raw output: {output}")
-        return {
-            "score": 0,
-            "missing_skills": [],
-            "suggestions": ["AI generated invalid JSON response"],
-            "rewritten_bullets": []
-        }
+        return _error_result("AI generated invalid JSON response")
+
+    if not isinstance(result, dict):
+        print(f"[ERROR] Expected a JSON object, got {type(result).__name__}")
+        return _error_result("AI generated invalid JSON response")
+
+    # One fractional or non-numeric score must not fail response validation
+    score = _coerce_score(result.get("score"))
+    if score is None:
+        print(f"[ERROR] Non-numeric score: {result.get('score')!r}")
+        return _error_result("AI returned a non-numeric score")
+
+    # Validate structure
+    if all(key in result for key in REQUIRED_KEYS):
+        print(f"[DEBUG] Successfully parsed result with score: {score}")
+        suggestions = result.get("suggestions")
+    else:
+        print(f"[WARNING] Missing required keys in response")
+        suggestions = result.get("suggestions", ["Incomplete response from AI"])
+    return {
+        "score": score,
+        "missing_skills": _string_list(result.get("missing_skills", [])),
+        "suggestions": _string_list(suggestions),
+        "rewritten_bullets": _string_list(result.get("rewritten_bullets", []))
+    }
+
+def get_client():
+    """Shared synchronous Groq client"""
+    global _client
+    from groq import Groq
+
+    with _client_lock:
+        if _client is None:
+            _client = Groq(
+                api_key=GROQ_API_KEY,
+                base_url=GROQ_BASE_URL,
+                timeout=LLM_TIMEOUT,
+                max_retries=LLM_MAX_RETRIES
+            )
+        return _client
+
+def get_async_client():
+    """Shared AsyncGroq client with a bounded connection pool.
+
+    httpx connections belong to the event loop that opened them, so one
+    client is kept per running loop.
+    """
+    import httpx
+    from groq import AsyncGroq
+
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = AsyncGroq(
+            api_key=GROQ_API_KEY,
+            base_url=GROQ_BASE_URL,
+            timeout=LLM_TIMEOUT,
+            max_retries=LLM_MAX_RETRIES,
+            http_client=httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=LLM_MAX_CONNECTIONS,
+                    max_keepalive_connections=LLM_MAX_CONNECTIONS
+                ),
+                timeout=LLM_TIMEOUT
+            )
+        )
+        _async_clients[loop] = client
+    return client
+
+async def close_async_clients():
+    """Close the pooled connections of the current event loop's client"""
+    client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.close()
+
+def call_groq_llm(prompt: str):
+    """Call Groq API for fast, reliable JSON generation"""
+    try:
+        response = get_client().chat.completions.create(**_chat_request(prompt))
+        return _parse_output(response.choices[0].message.content)
     except Exception as e:
         print(f"[ERROR] Groq API Error: {e}")
-        return {
-            "score": 0,
-            "missing_skills": [],
-            "suggestions": [f"API Error: {str(e)[:100]}"],
-            "rewritten_bullets": []
-        }
+        return _error_result(f"API Error: {str(e)[:100]}")
+
+async def call_groq_llm_async(prompt: str, timeout: float = LLM_TIMEOUT):
+    """Non-blocking Groq call on the shared pooled client.
+
+    Cancelling the awaiting task aborts the HTTP request; a call that runs
+    past ``timeout`` seconds returns an error result.
+    """
+    try:
+        response = await asyncio.wait_for(
+            get_async_client().chat.completions.create(**_chat_request(prompt)),
+            timeout
+        )
+        return _parse_output(response.choices[0].message.content)
+    except asyncio.TimeoutError:
+        print(f"[ERROR] Groq API timed out after {timeout}s")
+        return _error_result(f"API Error: timed out after {timeout:g}s")
+    except Exception as e:
+        print(f"[ERROR] Groq API Error: {e}")
+        return _error_result(f"API Error: {str(e)[:100]}")
+
+async def stream_groq_llm_async(prompt: str, timeout: float = LLM_TIMEOUT):
+    """Streamed Groq call on the shared pooled client.
+
+    Yields ``{"token": text}`` for each content delta as it arrives and
+    finally ``{"result": analysis}``. If the stream cannot be opened the
+    call falls back to a single non-streamed request.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    parts = []
+    try:
+        stream = await asyncio.wait_for(
+            get_async_client().chat.completions.create(**_chat_request(prompt), stream=True),
+            timeout
+        )
+        try:
+            async for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    parts.append(delta)
+                    yield {"token": delta}
+                if loop.time() > deadline:
+                    raise asyncio.TimeoutError
+        finally:
+            await stream.close()
+    except asyncio.TimeoutError:
+        print(f"[ERROR] Groq API timed out after {timeout}s")
+        yield {"result": _error_result(f"API Error: timed out after {timeout:g}s")}
+        return
+    except Exception as e:
+        if not parts:
+            print(f"[WARNING] Groq streaming failed ({e}), retrying without streaming")
+            yield {"result": await call_groq_llm_async(prompt, max(deadline - loop.time(), 1.0))}
+            return
+        print(f"[ERROR] Groq API Error: {e}")
+        yield {"result": _error_result(f"API Error: {str(e)[:100]}")}
+        return
+
+    yield {"result": _parse_output("".join(parts))}
 
 def call_local_llm(prompt: str):
     """Fallback local model (kept for compatibility)"""
@@ -78,9 +234,19 @@ def call_local_llm(prompt: str):
             "Add GROQ_API_KEY to your .env file",
             "Get free API key from https://console.groq.com/keys"
         ],
-        "rewritten_bullets": []
+        "rewritten_bullets": [],
+        "error": "Groq API key not configured"
     }
 
+def llm_model_name():
+    """Identifier of the model call_llm currently dispatches to"""
+    if USE_SAGEMAKER:
+        return f"sagemaker:{SAGEMAKER_ENDPOINT}"
+    elif USE_GROQ:
+        return f"groq:{GROQ_MODEL}"
+    else:
+        return "local-fallback"
+
 def call_llm(prompt: str):
     """Main LLM dispatcher"""
     if USE_SAGEMAKER:
@@ -88,4 +254,23 @@ def call_llm(prompt: str):
     elif USE_GROQ:
         return call_groq_llm(prompt)
     else:
-        return call_local_llm(prompt)
\ No newline at end of file
+        return call_local_llm(prompt)
+
+async def call_llm_async(prompt: str, timeout: float = LLM_TIMEOUT):
+    """Async LLM dispatcher; never blocks the event loop"""
+    if USE_SAGEMAKER:
+        raise NotImplementedError("SageMaker integration not yet implemented")
+    elif USE_GROQ:
+        return await call_groq_llm_async(prompt, timeout)
+    else:
+        return call_local_llm(prompt)
+
+async def call_llm_stream(prompt: str, timeout: float = LLM_TIMEOUT):
+    """Async LLM dispatcher yielding token events where the backend streams"""
+    if USE_SAGEMAKER:
+        raise NotImplementedError("SageMaker integration not yet implemented")
+    elif USE_GROQ:
+        async for event in stream_groq_llm_async(prompt, timeout):
+            yield event
+    else:
+        yield {"result": call_local_llm(prompt)}
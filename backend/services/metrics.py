@@ -0,0 +1,56 @@
+# backend/services/metrics.py
+import bisect
+import threading
+
+# Seconds; covers cache hits through slow LLM calls
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+class Histogram:
+    """Fixed-bucket histogram for /metrics; O(log buckets) per observation.
+
+    Quantiles are reported as the upper bound of the bucket they fall in
+    (the observed maximum for the overflow bucket), like Prometheus.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        with self._lock:
+            self.counts[bisect.bisect_left(self.buckets, value)] += 1
+            self.count += 1
+            self.sum += value
+            self.max = max(self.max, value)
+
+    def quantile(self, q):
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank and n:
+                return min(self.buckets[i], self.max) if i < len(self.buckets) else self.max
+        return self.max
+
+    def stats(self):
+        with self._lock:
+            cumulative, seen = {}, 0
+            for bound, n in zip(self.buckets, self.counts):
+                seen += n
+                cumulative[f"le_{bound:g}"] = seen
+            cumulative["le_inf"] = self.count
+            return {
+                "count": self.count,
+                "avg": round(self.sum / self.count, 4) if self.count else 0.0,
+                "max": round(self.max, 4),
+                "p50": round(self.quantile(0.5), 4),
+                "p95": round(self.quantile(0.95), 4),
+                "p99": round(self.quantile(0.99), 4),
+                "buckets": cumulative,
+            }
@@ -0,0 +1,140 @@
+# backend/services/onnx_embedder.py
+import json
+import os
+import numpy as np
+from backend.config import EMBED_MODEL, ONNX_DIR
+
+_INPUTS = ["input_ids", "attention_mask", "token_type_ids"]
+
+def _paths(onnx_dir):
+    return (
+        os.path.join(onnx_dir, "model.onnx"),
+        os.path.join(onnx_dir, "model_int8.onnx"),
+        os.path.join(onnx_dir, "embedder.json"),
+    )
+
+def export_onnx(onnx_dir=ONNX_DIR, model_name=EMBED_MODEL):
+    """Export the SentenceTransformer's transformer to ONNX (plus an int8 copy).
+
+    Only the encoder is exported; pooling and normalization are done in
+    NumPy by OnnxEmbedder exactly as the torch Pooling/Normalize modules do.
+    Skipped when the files already exist.
+    """
+    model_path, int8_path, meta_path = _paths(onnx_dir)
+    if all(os.path.exists(p) for p in (model_path, int8_path, meta_path)):
+        return
+
+    import torch
+    from sentence_transformers import SentenceTransformer
+    from onnxruntime.quantization import quantize_dynamic, QuantType
+
+    st = SentenceTransformer(model_name, device="cpu")
+    pooling = st[1].get_config_dict() if len(st) > 1 else {}
+    if not pooling.get("pooling_mode_mean_tokens", pooling.get("pooling_mode") == "mean"):
+        raise ValueError(f"{model_name} does not use mean pooling; ONNX backend unsupported")
+
+    class Encoder(torch.nn.Module):
+        def __init__(self, model):
+            super().__init__()
+            self.model = model
+
+        def forward(self, input_ids, attention_mask, token_type_ids):
+            return self.model(
+                input_ids=input_ids,
+                attention_mask=attention_mask,
+                token_type_ids=token_type_ids
+            ).last_hidden_state
+
+    os.makedirs(onnx_dir, exist_ok=True)
+    sample = st.tokenizer(["export sample", "a slightly longer export sample"], padding=True, return_tensors="pt")
+    dynamic = {"batch": 0, "seq": 1}
+    torch.onnx.export(
+        Encoder(st[0].auto_model).eval(),
+        tuple(sample[name] for name in _INPUTS),
+        model_path + ".tmp",
+        input_names=_INPUTS,
+        output_names=["last_hidden_state"],
+        dynamic_axes={name: {v: k for k, v in dynamic.items()} for name in _INPUTS + ["last_hidden_state"]},
+        opset_version=17,
+        dynamo=False
+    )
+    os.replace(model_path + ".tmp", model_path)
+    quantize_dynamic(model_path, int8_path + ".tmp", weight_type=QuantType.QInt8)
+    os.replace(int8_path + ".tmp", int8_path)
+
+    st.tokenizer.save_pretrained(onnx_dir)  # writes tokenizer.json for the fast tokenizer
+    with open(meta_path, "w") as f:
+        json.dump({
+            "model": model_name,
+            "max_seq_length": st.max_seq_length,
+            "pad_token": st.tokenizer.pad_token,
+            "pad_id": st.tokenizer.pad_token_id,
+        }, f)
+
+class OnnxEmbedder:
+    """all-MiniLM-L6-v2 on ONNX Runtime, a drop-in for SentenceTransformer.encode.
+
+    Same tokenizer and truncation length as the torch model, mean pooling
+    over the attention mask and L2 normalization, so vectors agree with the
+    torch backend to float precision (int8: approximately). Only
+    ``tokenizers`` and ``onnxruntime`` are imported, not torch/transformers.
+    """
+
+    def __init__(self, quantized=False, onnx_dir=ONNX_DIR, max_batch=4):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        export_onnx(onnx_dir)
+        model_path, int8_path, meta_path = _paths(onnx_dir)
+        with open(meta_path) as f:
+            meta = json.load(f)
+        self.max_seq_length = meta["max_seq_length"]
+        self.tokenizer = Tokenizer.from_file(os.path.join(onnx_dir, "tokenizer.json"))
+        self.tokenizer.enable_truncation(self.max_seq_length)
+        self.tokenizer.enable_padding(pad_id=meta["pad_id"], pad_token=meta["pad_token"])
+
+        # The arena would keep the largest batch's activations allocated forever
+        options = ort.SessionOptions()
+        options.enable_cpu_mem_arena = False
+        self.session = ort.InferenceSession(
+            int8_path if quantized else model_path,
+            options,
+            providers=["CPUExecutionProvider"]
+        )
+        self._input_names = {i.name for i in self.session.get_inputs()}
+        self.dim = self.session.get_outputs()[0].shape[-1]
+        # On CPU per-text cost grows with batch size, so callers' larger
+        # batches are run in slices of max_batch (see benchmarks/bench_onnx.py)
+        self.max_batch = max_batch
+
+    def get_max_seq_length(self):
+        return self.max_seq_length
+
+    def encode(self, texts, batch_size=64, normalize_embeddings=True, **kwargs):
+        if isinstance(texts, str):
+            texts = [texts]
+        texts = list(texts)
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        if not texts:
+            return out
+
+        # Length-sorted batches keep padding (and wasted compute) low
+        batch_size = min(batch_size, self.max_batch)
+        order = np.argsort([-len(text) for text in texts], kind="stable")
+        for start in range(0, len(texts), batch_size):
+            idx = order[start:start + batch_size]
+            encoded = self.tokenizer.encode_batch([texts[i] for i in idx])
+            mask = np.array([e.attention_mask for e in encoded], dtype=np.int64)
+            feeds = {
+                "input_ids": np.array([e.ids for e in encoded], dtype=np.int64),
+                "attention_mask": mask,
+                "token_type_ids": np.array([e.type_ids for e in encoded], dtype=np.int64),
+            }
+            hidden = self.session.run(None, {k: v for k, v in feeds.items() if k in self._input_names})[0]
+
+            weights = mask[..., None].astype(np.float32)
+            pooled = (hidden * weights).sum(axis=1) / np.clip(weights.sum(axis=1), 1e-9, None)
+            if normalize_embeddings:
+                pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+            out[idx] = pooled
+        return out
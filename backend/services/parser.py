@@ -1,20 +1,332 @@
 # backend/services/parser.py
 import fitz
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import io
+import multiprocessing
+import os
+import threading
+import time
+import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from html.parser import HTMLParser
+from xml.etree import ElementTree
+from backend.services.metrics import Histogram
+from backend.services.text_cache import get_parsed_text, cache_parsed_text
+from backend.config import (
+    PARSE_ENGINE, PARSE_WORKERS, PARSE_PAGES_PER_TASK, PARSE_MAX_BYTES, PARSE_MAX_PAGES, PARSE_TIMEOUT
+)
 
-# Create executor for CPU-bound work
-_executor = ThreadPoolExecutor(max_workers=2)
+FORMATS = ("pdf", "docx", "html", "txt")
+# Part of the parsed-text cache key: bump whenever extraction output changes
+PARSER_VERSION = 1
 
-def _extract_sync(file_bytes):
-    """Synchronous PDF extraction"""
+class DocumentTooLarge(ValueError):
+    """The upload exceeds a parse limit (bytes, pages or time)"""
+
+class UnsupportedFormat(ValueError):
+    """The upload is not a PDF, DOCX, HTML or text document"""
+
+# Create executor for CPU-bound work; the process pool is started on first use
+_executor = None
+_executor_lock = threading.Lock()
+
+_parse_seconds = Histogram()
+_pages = Histogram((1, 2, 5, 10, 20, 50, 100, 200, 500, 1000))
+_parse_seconds_by_format = {fmt: Histogram() for fmt in FORMATS}
+_stats = {"documents": 0, "rejected": 0, "split": 0}
+
+_SNIFF_BYTES = 1024
+_HASH_INLINE_BYTES = 1024 * 1024  # larger byte strings are hashed off the event loop
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_DOCX_MAX_XML_BYTES = 64 * 1024 * 1024  # decompressed document.xml; stops zip bombs
+_HTML_SKIP = {"script", "style", "head", "noscript", "template", "svg"}
+_HTML_BLOCKS = {
+    "p", "div", "br", "li", "tr", "td", "th", "h1", "h2", "h3", "h4", "h5", "h6",
+    "section", "article", "header", "footer", "ul", "ol", "table", "blockquote", "pre",
+}
+
+def _process_workers():
+    return PARSE_WORKERS or os.cpu_count() or 1
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            if PARSE_ENGINE == "process":
+                # spawn: forking a process that runs the embedding and asyncio
+                # threads can deadlock the child
+                _executor = ProcessPoolExecutor(
+                    max_workers=_process_workers(),
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            else:
+                _executor = ThreadPoolExecutor(max_workers=PARSE_WORKERS or 2)
+        return _executor
+
+def _ping():
+    return os.getpid()
+
+def warm_up_parser():
+    """Start every worker of the process engine so the first uploads do not
+    pay process start-up and imports (and count them against PARSE_TIMEOUT)"""
+    executor = _get_executor()
+    if isinstance(executor, ProcessPoolExecutor):
+        futures = [executor.submit(_ping) for _ in range(_process_workers())]
+        for future in futures:
+            future.result()
+
+def check_document_size(size):
+    """Reject an upload over PARSE_MAX_BYTES before it is queued or parsed"""
+    if PARSE_MAX_BYTES and size > PARSE_MAX_BYTES:
+        _stats["rejected"] += 1
+        raise DocumentTooLarge(f"Document is {size} bytes (limit {PARSE_MAX_BYTES})")
+
+def _is_bytes(source):
+    return isinstance(source, (bytes, bytearray, memoryview))
+
+def _check_deadline(deadline):
+    if deadline is not None and time.time() > deadline:
+        raise DocumentTooLarge(f"Document took longer than {PARSE_TIMEOUT:g}s to parse")
+
+def _head(source):
+    if _is_bytes(source):
+        return bytes(source[:_SNIFF_BYTES])
+    with open(source, "rb") as f:
+        return f.read(_SNIFF_BYTES)
+
+def detect_format(head):
+    """Document format from its first bytes; file names and content types are not trusted"""
+    if b"%PDF-" in head:  # the header may sit anywhere in the first 1024 bytes
+        return "pdf"
+    if head.startswith(b"PK\x03\x04"):
+        return "docx"
+    if head.startswith((b"\xff\xfe", b"\xfe\xff")):
+        return "txt"  # UTF-16 text
+    if b"\x00" in head:
+        raise UnsupportedFormat("Unsupported document format (expected PDF, DOCX, HTML or text)")
+    sample = head.lstrip(b"\xef\xbb\xbf \t\r\n").lower()
+    if sample.startswith((b"<!doctype html", b"<html")) or b"<body" in sample or b"<html" in sample:
+        return "html"
+    return "txt"
+
+def document_format(document):
+    """detect_format for an upload as bytes or a spooled file"""
+    return detect_format(_head(document if _is_bytes(document) else os.fspath(document)))
+
+def _read_all(source):
+    if _is_bytes(source):
+        return bytes(source)
+    with open(source, "rb") as f:
+        return f.read()
+
+def _decode(data):
+    if data.startswith((b"\xff\xfe", b"\xfe\xff")):
+        return data.decode("utf-16")
+    try:
+        return data.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        return data.decode("cp1252", errors="replace")
+
+def _extract_txt(source, deadline=None):
+    text = _decode(_read_all(source))
+    return text.replace("\r\n", "\n").replace("\r", "\n").strip()
+
+class _HTMLText(HTMLParser):
+    """Visible text of an HTML page, one line per block element"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self._skip = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _HTML_SKIP:
+            self._skip += 1
+        elif tag in _HTML_BLOCKS:
+            self.parts.append("\n")
+
+    def handle_endtag(self, tag):
+        if tag in _HTML_SKIP:
+            self._skip = max(0, self._skip - 1)
+        elif tag in _HTML_BLOCKS:
+            self.parts.append("\n")
+
+    def handle_data(self, data):
+        if not self._skip:
+            self.parts.append(data)
+
+def _extract_html(source, deadline=None):
+    text = _decode(_read_all(source))
+    parser = _HTMLText()
+    for start in range(0, len(text), 65536):
+        _check_deadline(deadline)
+        parser.feed(text[start:start + 65536])
+    parser.close()
+    lines = (" ".join(line.split()) for line in "".join(parser.parts).splitlines())
+    return "\n".join(line for line in lines if line)
+
+def _extract_docx(source, deadline=None):
+    """Paragraph text of word/document.xml, streamed out of the zip without building a DOM"""
+    try:
+        archive = zipfile.ZipFile(io.BytesIO(source) if _is_bytes(source) else source)
+    except zipfile.BadZipFile:
+        raise UnsupportedFormat("Corrupt DOCX file")
+    with archive:
+        try:
+            info = archive.getinfo("word/document.xml")
+        except KeyError:
+            raise UnsupportedFormat("ZIP upload is not a DOCX document")
+        if info.file_size > _DOCX_MAX_XML_BYTES:
+            raise DocumentTooLarge(f"DOCX body is {info.file_size} bytes uncompressed")
+
+        paragraphs, current = [], []
+        try:
+            with archive.open(info) as xml:
+                for _, elem in ElementTree.iterparse(xml, events=("end",)):
+                    tag = elem.tag
+                    if tag == _W + "t":
+                        current.append(elem.text or "")
+                    elif tag == _W + "tab":
+                        current.append("\t")
+                    elif tag in (_W + "br", _W + "cr"):
+                        current.append("\n")
+                    elif tag == _W + "p":
+                        paragraphs.append("".join(current))
+                        current = []
+                        elem.clear()
+                        if len(paragraphs) % 256 == 0:
+                            _check_deadline(deadline)
+        except (zipfile.BadZipFile, zlib.error, ElementTree.ParseError):
+            # Truncated or damaged member: the zip directory alone looked fine
+            raise UnsupportedFormat("Corrupt DOCX file")
+    return "\n".join(paragraphs).strip()
+
+_EXTRACTORS = {"docx": _extract_docx, "html": _extract_html, "txt": _extract_txt}
+
+def _open(source):
+    # A path lets MuPDF read pages from disk on demand instead of from a copy in memory
+    try:
+        if _is_bytes(source):
+            return fitz.open(stream=source, filetype='pdf')
+        return fitz.open(source, filetype='pdf')
+    except fitz.FileDataError:
+        # Damaged or truncated file; map it like a corrupt DOCX so callers see a 415
+        raise UnsupportedFormat("Corrupt PDF file")
+
+def _extract_sync(source, first_page=0, last_page=None, deadline=None, max_pages=0):
+    """Synchronous PDF extraction of pages [first_page, last_page); returns (text, page_count)"""
     pages_text = []
-    with fitz.open(stream=file_bytes, filetype='pdf') as doc:
-        for page in doc:
-            pages_text.append(page.get_text())
-    return "\n".join(pages_text).strip()
-
-async def extract_text_from_pdf(file_bytes):
-    """Async wrapper for PDF extraction"""
-    loop = asyncio.get_event_loop()
-    return await loop.run_in_executor(_executor, _extract_sync, file_bytes)
\ No newline at end of file
+    with _open(source) as doc:
+        if max_pages and doc.page_count > max_pages:
+            raise DocumentTooLarge(f"Document has {doc.page_count} pages (limit {max_pages})")
+        last_page = doc.page_count if last_page is None else min(last_page, doc.page_count)
+        for number in range(first_page, last_page):
+            _check_deadline(deadline)
+            pages_text.append(doc[number].get_text())
+        return "\n".join(pages_text), doc.page_count
+
+def _extract_first(source, last_page=None, deadline=None, max_pages=0):
+    """Detect the format and extract the document (a PDF only up to last_page).
+
+    Returns (text, page_count, format); page_count is None for non-PDFs.
+    """
+    fmt = detect_format(_head(source))
+    if fmt == "pdf":
+        text, page_count = _extract_sync(source, 0, last_page, deadline, max_pages)
+        return text, page_count, fmt
+    return _EXTRACTORS[fmt](source, deadline), None, fmt
+
+async def extract_text(document):
+    """Async text extraction on the configured engine, enforcing the parse limits.
+
+    ``document`` is the upload as bytes or a spooled file (anything with
+    ``__fspath__``; it is discarded once parsed). The format (PDF, DOCX,
+    HTML or text) is detected from the content. The process engine parses
+    the first PARSE_PAGES_PER_TASK pages of a PDF in one task and, for
+    longer documents, fans the remaining page ranges out across the pool.
+    Raises DocumentTooLarge when a limit is hit and UnsupportedFormat for
+    anything else.
+
+    Text is cached by the SHA-256 of the upload, so a repeat upload never
+    reaches the pool. Spooled files carry the digest computed while they
+    were written.
+    """
+    try:
+        size = len(document)
+        check_document_size(size)
+        digest = getattr(document, "sha256", None)
+        if digest is None:
+            digest = (hashlib.sha256(document).hexdigest() if size <= _HASH_INLINE_BYTES
+                      else await asyncio.to_thread(lambda: hashlib.sha256(document).hexdigest()))
+        key = f"v{PARSER_VERSION}:{digest}"
+
+        # The cache's SQLite tier is shared by every worker; keep it off the event loop
+        text = await asyncio.to_thread(get_parsed_text, key)
+        if text is not None:
+            return text
+        start = time.perf_counter()
+        text = await _extract(document if _is_bytes(document) else os.fspath(document))
+        await asyncio.to_thread(cache_parsed_text, key, text, size, time.perf_counter() - start)
+        return text
+    finally:
+        discard = getattr(document, "discard", None)
+        if discard is not None:
+            discard()
+
+async def _extract(source):
+    """Parse bytes or a file path on the pool; records the histograms"""
+    loop = asyncio.get_running_loop()
+    executor = _get_executor()
+    split = PARSE_PAGES_PER_TASK if PARSE_ENGINE == "process" else None
+    deadline = time.time() + PARSE_TIMEOUT if PARSE_TIMEOUT else None
+    start = time.perf_counter()
+
+    async def parse():
+        text, page_count, fmt = await loop.run_in_executor(
+            executor, _extract_first, source, split, deadline, PARSE_MAX_PAGES
+        )
+        rest = []
+        if split and page_count and page_count > split:
+            _stats["split"] += 1
+            rest = await asyncio.gather(*(
+                loop.run_in_executor(executor, _extract_sync, source, first, first + split, deadline)
+                for first in range(split, page_count, split)
+            ))
+        return "\n".join([text] + [part for part, _ in rest]).strip(), page_count, fmt
+
+    try:
+        # The deadline is also checked between pages; this bounds a single slow page
+        text, page_count, fmt = await asyncio.wait_for(parse(), PARSE_TIMEOUT or None)
+    except asyncio.TimeoutError:
+        _stats["rejected"] += 1
+        raise DocumentTooLarge(f"Document took longer than {PARSE_TIMEOUT:g}s to parse")
+    except (DocumentTooLarge, UnsupportedFormat):
+        _stats["rejected"] += 1
+        raise
+
+    elapsed = time.perf_counter() - start
+    _stats["documents"] += 1
+    _parse_seconds.observe(elapsed)
+    _parse_seconds_by_format[fmt].observe(elapsed)
+    if page_count is not None:
+        _pages.observe(page_count)
+    return text
+
+def shutdown_parser():
+    """Stop the worker pool (the process engine's children would outlive us)"""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+def parser_stats():
+    return {
+        "engine": PARSE_ENGINE,
+        **_stats,
+        "parse_seconds": _parse_seconds.stats(),
+        "pages": _pages.stats(),
+        "parse_seconds_by_format": {fmt: hist.stats() for fmt, hist in _parse_seconds_by_format.items()},
+    }
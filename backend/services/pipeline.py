@@ -1,43 +1,374 @@
-from backend.services.parser import extract_text_from_pdf
-from backend.services.chunker import chunk_text
-from backend.services.embeddings import embed_texts
-from backend.services.retriever import create_index, search
-from backend.services.llm import call_llm
-from backend.models.prompts import PROMPT_TEMPLATE
-from functools import lru_cache
-
-@lru_cache(maxsize=100)
-def get_jd_embedding(job_text):
-    """Cache job description embeddings"""
-    return embed_texts([job_text])[0]
-
-async def analyze_resume(resume_file, job_text):
-    # Read and parse PDF
-    file_bytes = await resume_file.read()
-    resume_text = await extract_text_from_pdf(file_bytes)
-    
-    # Chunk and embed resume
-    chunks = chunk_text(resume_text, size=200, overlap=30)  # Smaller chunks
-    vectors = embed_texts(chunks)
-    cache_key = create_index(vectors, chunks, resume_text)
-    
-    # Get cached job embedding and search
-    query_vec = get_jd_embedding(job_text)
-    top_chunks = search(query_vec, cache_key, k=3)  # Top 3 chunks only
-    
+import asyncio
+import re
+import time
+import numpy as np
+from backend.services.parser import extract_text, DocumentTooLarge, UnsupportedFormat
+from backend.services.uploads import read_upload
+from backend.services.chunker import chunk_resume, chunk_spans_batch
+from backend.services.embedding_cache import embed_texts_cached_async
+from backend.services.retriever import create_index, search_many
+from backend.services.llm import call_llm_async, call_llm_stream
+from backend.services.ranker import prerank_scores, top_n, best_chunks
+from backend.services.result_cache import result_key, get_cached_result, cache_result
+from backend.services.skills import skill_gaps_async, skill_gaps_for_resumes_async, skill_index_gaps_async
+from backend.services.fast_score import fast_features, fast_result
+from backend.services.jd_corpus import get_jd_corpus
+from backend.models.prompts import (
+    PROMPT_TEMPLATE, MISSING_SKILLS_FIELD, MISSING_SKILLS_RULE, SKILL_GAPS_BLOCK, SKILL_GAPS_RULE
+)
+from backend.config import (
+    BATCH_LLM_CONCURRENCY, RANK_PARSE_CONCURRENCY, RANK_TOP_N, SKILL_GAP_MODE, RECOMMEND_TOP_K
+)
+
+ANALYZE_MODES = ("llm", "fast")
+
+_BULLET = re.compile(r"^\s*(?:[-*\u2022\u25aa\u25cf]|\d+[.)])\s*")
+
+async def get_jd_embedding(job_text):
+    """Job description embedding (served from the embedding cache)"""
+    return (await embed_texts_cached_async([job_text]))[0]
+
+def split_requirements(job_text, max_lines=16):
+    """Requirement-like lines of a JD (bullets, short sentences)"""
+    requirements = []
+    for line in re.split(r"[\n;]+", job_text):
+        line = _BULLET.sub("", line).strip()
+        if 3 <= len(line.split()) <= 40 and line not in requirements:
+            requirements.append(line)
+        if len(requirements) == max_lines:
+            break
+    return requirements
+
+def jd_queries(job_text):
+    """The whole JD followed by its requirement lines"""
+    return [job_text] + split_requirements(job_text)
+
+async def get_jd_query_vectors(job_text):
+    """The JD embedding plus one embedding per requirement line"""
+    return await embed_texts_cached_async(jd_queries(job_text))
+
+def merge_evidence(ranked_lists, k=3):
+    """Pick the k chunks that are top-ranked evidence for the most queries"""
+    votes = {}
+    for results in ranked_lists:
+        for rank, chunk in enumerate(results):
+            count, best_rank = votes.get(chunk, (0, rank))
+            votes[chunk] = (count + 1, min(best_rank, rank))
+    # dicts keep insertion order, so ties go to the full-JD query's hits
+    return sorted(votes, key=lambda chunk: (-votes[chunk][0], votes[chunk][1]))[:k]
+
+async def read_resume_text(resume_file):
+    """Read and parse an uploaded resume"""
+    return await extract_text(await read_upload(resume_file))
+
+async def chunk_resume_async(resume_text):
+    """chunk_resume off the event loop: tokenizing, and on first use loading
+    the tokenizer, would otherwise stall every other request"""
+    return await asyncio.to_thread(chunk_resume, resume_text)
+
+async def index_resume(resume_text):
+    """Chunk, embed and index resume text; returns the index cache key"""
+    chunks = await chunk_resume_async(resume_text)
+    vectors = await embed_texts_cached_async(chunks)
+    return await asyncio.to_thread(create_index, vectors, chunks, resume_text)
+
+async def search_many_async(query_vecs, cache_key, k=3, query_texts=None, retrieval=None):
+    """search_many off the event loop: a cache miss reloads the index from
+    disk (np.load, faiss.read_index) and the search itself is CPU-bound"""
+    return await asyncio.to_thread(
+        search_many, query_vecs, cache_key, k=k, query_texts=query_texts, retrieval=retrieval
+    )
+
+def build_prompt(top_chunks, job_text, gaps=None):
+    """Fill the prompt template with retrieved resume context, the JD and
+    the precomputed skill gaps (None: the LLM works them out alone)"""
     # Limit context length
     context = "\n".join(top_chunks)[:1500]  # Max 1500 chars
     job_text_truncated = job_text[:1000]  # Max 1000 chars
-    
-    # Build prompt
-    prompt = PROMPT_TEMPLATE.format(
+
+    # No known skills in the JD: nothing to hint, the LLM has to find them
+    if gaps is not None and gaps["coverage"] is None:
+        gaps = None
+    ask_missing = gaps is None or SKILL_GAP_MODE != "replace"
+
+    return PROMPT_TEMPLATE.format(
         resume=context,
-        jd=job_text_truncated
+        jd=job_text_truncated,
+        skill_gaps=SKILL_GAPS_BLOCK.format(
+            missing=", ".join(gaps["missing_skills"]) or "none",
+            matched=", ".join(gaps["matched_skills"][:10]) or "none"
+        ) if gaps is not None else "",
+        missing_skills_field=MISSING_SKILLS_FIELD if ask_missing else "",
+        missing_skills_rule=(MISSING_SKILLS_RULE + (SKILL_GAPS_RULE if gaps is not None else ""))
+        if ask_missing else ""
     )
-    
+
+async def score_features(resume_text, job_text):
+    """Fast-mode features and skill gaps of one (resume, JD) pair, no LLM call"""
+    chunks = await chunk_resume_async(resume_text)
+    # Both requests land in the same micro-batch
+    vectors, query_vecs = await asyncio.gather(
+        embed_texts_cached_async(chunks),
+        get_jd_query_vectors(job_text)
+    )
+    # The engine runs here whatever SKILL_GAP_MODE says; coverage is a feature
+    gaps = (await skill_index_gaps_async([resume_text], [job_text]))[0]
+    return fast_features(vectors, query_vecs, resume_text, job_text, gaps), gaps
+
+def apply_skill_gaps(result, gaps):
+    """Attach the engine's coverage; in "replace" mode its gaps are the missing_skills"""
+    if gaps is None or gaps["coverage"] is None:
+        return {**result, "missing_skills": result.get("missing_skills", [])}
+    missing = gaps["missing_skills"] if SKILL_GAP_MODE == "replace" else result.get("missing_skills", [])
+    return {**result, "missing_skills": missing, "skill_coverage": gaps["coverage"]}
+
+async def analyze_resume(resume_file, job_text, refresh=False, mode="llm", retrieval=None):
+    return await analyze_resume_bytes(await read_upload(resume_file), job_text, refresh, mode, retrieval)
+
+async def analyze_resume_bytes(file_bytes, job_text, refresh=False, mode="llm", retrieval=None):
+    """analyze_resume for an upload that was already read (bytes or a spooled file)"""
+    if mode not in ANALYZE_MODES:
+        raise ValueError(f"mode must be one of {ANALYZE_MODES}")
+    resume_text = await extract_text(file_bytes)
+    if mode == "fast":
+        # Deterministic and cheap, so not worth a result cache entry
+        features, gaps = await score_features(resume_text, job_text)
+        return {**fast_result(features, gaps), "cached": False}
+
+    # Identical (resume, JD, prompt, model) -> reuse the earlier verdict
+    result_cache_key = result_key(resume_text, job_text, retrieval)
+    if not refresh:
+        cached = get_cached_result(result_cache_key)
+        if cached is not None:
+            return {**cached, "cached": True}
+
+    cache_key = await index_resume(resume_text)
+
+    # Retrieve evidence for the whole JD and each requirement line in one search
+    query_vecs = await get_jd_query_vectors(job_text)
+    top_chunks = merge_evidence(
+        await search_many_async(query_vecs, cache_key, k=3, query_texts=jd_queries(job_text), retrieval=retrieval),
+        k=3
+    )  # Top 3 chunks only
+
+    # Build prompt
+    gaps = (await skill_gaps_async(resume_text, [job_text]))[0]
+    prompt = build_prompt(top_chunks, job_text, gaps)
+
     print(f"[DEBUG] Prompt length: {len(prompt)} chars")
-    
-    # Call LLM
-    result = call_llm(prompt)
-    
-    return result
\ No newline at end of file
+
+    # Call LLM without blocking the event loop
+    result = apply_skill_gaps(await call_llm_async(prompt), gaps)
+    cache_result(result_cache_key, result)
+
+    return {**result, "cached": False}
+
+async def analyze_resume_stream(file_bytes, job_text, refresh=False, retrieval=None):
+    """Run the analysis as an async iterator of ``(event, data)`` stage events.
+
+    Emits ``parsed``, ``chunked``, ``embedded``, ``retrieved`` and ``skills`` as each
+    stage finishes, ``token`` for every LLM output delta and finally
+    ``result`` with the same payload ``analyze_resume`` returns. Stage events
+    carry ``elapsed_ms`` since the stream started.
+    """
+    start = time.perf_counter()
+
+    def elapsed():
+        return round((time.perf_counter() - start) * 1000, 1)
+
+    resume_text = await extract_text(file_bytes)
+    yield "parsed", {"chars": len(resume_text), "elapsed_ms": elapsed()}
+
+    result_cache_key = result_key(resume_text, job_text, retrieval)
+    if not refresh:
+        cached = get_cached_result(result_cache_key)
+        if cached is not None:
+            yield "result", {**cached, "cached": True}
+            return
+
+    chunks = await chunk_resume_async(resume_text)
+    yield "chunked", {"chunks": len(chunks), "elapsed_ms": elapsed()}
+
+    # Both requests land in the same micro-batch
+    vectors, query_vecs = await asyncio.gather(
+        embed_texts_cached_async(chunks),
+        get_jd_query_vectors(job_text)
+    )
+    yield "embedded", {"vectors": len(vectors) + len(query_vecs), "elapsed_ms": elapsed()}
+
+    cache_key = await asyncio.to_thread(create_index, vectors, chunks, resume_text)
+    top_chunks = merge_evidence(
+        await search_many_async(query_vecs, cache_key, k=3, query_texts=jd_queries(job_text), retrieval=retrieval),
+        k=3
+    )
+    yield "retrieved", {"evidence": top_chunks, "elapsed_ms": elapsed()}
+
+    gaps = (await skill_gaps_async(resume_text, [job_text]))[0]
+    if gaps is not None:
+        yield "skills", {**gaps, "elapsed_ms": elapsed()}
+
+    result = None
+    async for event in call_llm_stream(build_prompt(top_chunks, job_text, gaps)):
+        if "token" in event:
+            yield "token", {"text": event["token"]}
+        else:
+            result = event["result"]
+    result = apply_skill_gaps(result, gaps)
+    cache_result(result_cache_key, result)
+
+    yield "result", {**result, "cached": False}
+
+async def analyze_resume_batch(resume_file, job_texts, concurrency=BATCH_LLM_CONCURRENCY,
+                               refresh=False, retrieval=None):
+    """Score one resume against many job descriptions.
+
+    The resume is parsed, chunked and embedded once and all job descriptions
+    are embedded in a single call. Returns an async iterator that yields
+    ``{"index": i, **result}`` in completion order (memoized results first),
+    so callers can stream results while slower LLM calls are still in flight.
+    """
+    resume_text = await read_resume_text(resume_file)
+    keys = [result_key(resume_text, job_text, retrieval) for job_text in job_texts]
+
+    cached = {}
+    if not refresh:
+        for i, key in enumerate(keys):
+            result = get_cached_result(key)
+            if result is not None:
+                cached[i] = result
+    pending = [i for i in range(len(job_texts)) if i not in cached]
+
+    prompts, gaps = [], []
+    if pending:
+        cache_key = await index_resume(resume_text)
+        pending_texts = [job_texts[i] for i in pending]
+        job_vecs = await embed_texts_cached_async(pending_texts)
+        # One vectorized pass for every pending JD
+        gaps = await skill_gaps_async(resume_text, pending_texts)
+        evidence = await search_many_async(job_vecs, cache_key, k=3, query_texts=pending_texts, retrieval=retrieval)
+        prompts = [
+            build_prompt(top_chunks, job_texts[i], job_gaps)
+            for top_chunks, i, job_gaps in zip(evidence, pending, gaps)
+        ]
+    print(f"[DEBUG] Batch of {len(job_texts)} jobs, {len(cached)} cached, concurrency={concurrency}")
+
+    return _stream_batch(cached, pending, keys, prompts, gaps, max(1, concurrency))
+
+async def _stream_batch(cached, pending, keys, prompts, gaps, concurrency):
+    for i, result in cached.items():
+        yield {"index": i, **result, "cached": True}
+
+    async for item in _run_llm_batch(prompts, concurrency):
+        position = item.pop("index")
+        i = pending[position]
+        item = apply_skill_gaps(item, gaps[position])
+        cache_result(keys[i], item)
+        yield {"index": i, **item, "cached": False}
+
+async def rank_resumes(resume_files, job_text, n=RANK_TOP_N, aggregate="max",
+                       concurrency=BATCH_LLM_CONCURRENCY):
+    """Rank many resumes against one JD in two stages.
+
+    Stage one embeds every resume chunk in one call and scores all resumes
+    with a single matrix product (max or mean chunk similarity). Only the
+    top ``n`` are sent to the LLM. Returns one entry per resume ordered by
+    the cheap score, with the LLM verdict attached to the shortlisted ones.
+    """
+    semaphore = asyncio.Semaphore(RANK_PARSE_CONCURRENCY)
+
+    async def parse(resume_file):
+        async with semaphore:
+            try:
+                return await extract_text(await read_upload(resume_file))
+            except (DocumentTooLarge, UnsupportedFormat) as e:
+                # One oversized or unreadable upload should not sink the whole ranking
+                print(f"[WARNING] Skipping {resume_file.filename}: {e}")
+                return ""
+
+    texts = await asyncio.gather(*(parse(f) for f in resume_files))
+    # One batched tokenizer call for every resume, off the event loop
+    span_lists = await asyncio.to_thread(chunk_spans_batch, texts)
+    chunk_lists = [[text[start:end] for start, end in spans] for text, spans in zip(texts, span_lists)]
+    counts = [len(chunks) for chunks in chunk_lists]
+    all_chunks = [chunk for chunks in chunk_lists for chunk in chunks]
+
+    # Stage 1: one embed call and one matmul for the whole batch
+    if all_chunks:
+        vectors = await embed_texts_cached_async(all_chunks)
+    else:
+        vectors = np.empty((0, 0), dtype="float32")
+    scores, sims = prerank_scores(vectors, counts, await get_jd_embedding(job_text), aggregate)
+    order = top_n(scores, len(scores))
+    shortlist = [int(i) for i in order[:n] if counts[i] > 0]
+    print(f"[DEBUG] Pre-ranked {len(resume_files)} resumes, sending {len(shortlist)} to LLM")
+
+    # Stage 2: LLM only for the shortlist, reusing the chunk similarities
+    offsets = np.cumsum(counts) - counts
+    gaps = await skill_gaps_for_resumes_async([texts[i] for i in shortlist], job_text)
+    prompts = [
+        build_prompt(
+            best_chunks(chunk_lists[i], sims[offsets[i]:offsets[i] + counts[i]], k=3),
+            job_text,
+            resume_gaps
+        )
+        for i, resume_gaps in zip(shortlist, gaps)
+    ]
+    llm_results = {}
+    async for item in _run_llm_batch(prompts, max(1, concurrency)):
+        position = item.pop("index")
+        llm_results[shortlist[position]] = apply_skill_gaps(item, gaps[position])
+
+    def entry(rank, i):
+        result = llm_results.get(i)
+        failed = result is not None and result.get("error") is not None
+        return {
+            "rank": rank + 1,
+            "filename": resume_files[i].filename,
+            "prefilter_score": round(float(scores[i]), 4),
+            # A failed call reports score 0; that is not a verdict to rank by
+            "llm_score": result["score"] if result is not None and not failed else None,
+            "analysis": result,
+            "error": result["error"] if failed else None,
+        }
+
+    return [entry(rank, int(i)) for rank, i in enumerate(order)]
+
+def _current_corpus():
+    corpus = get_jd_corpus()
+    corpus.maybe_reload()
+    return corpus
+
+async def recommend_jobs(resume_file, k=RECOMMEND_TOP_K):
+    """The k best JDs of the corpus for a resume.
+
+    Every resume chunk queries the ANN index and a job scores its best
+    chunk match, so one strong section is enough to surface a job.
+    Returns ``(results, corpus size)``.
+    """
+    resume_text = await read_resume_text(resume_file)
+    corpus = await asyncio.to_thread(_current_corpus)
+    chunks = await chunk_resume_async(resume_text)
+    if not chunks:
+        return [], len(corpus)
+    vectors = await embed_texts_cached_async(chunks)
+    results = await asyncio.to_thread(corpus.search, vectors, k)
+    return [{"rank": rank + 1, **job} for rank, job in enumerate(results)], len(corpus)
+
+async def _run_llm_batch(prompts, concurrency):
+    """Fan out LLM calls with bounded concurrency, yielding as they finish"""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(i, prompt):
+        async with semaphore:
+            result = await call_llm_async(prompt)
+        return i, result
+
+    tasks = [asyncio.create_task(run(i, prompt)) for i, prompt in enumerate(prompts)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            i, result = await next_done
+            yield {"index": i, **result}
+    finally:
+        # Client went away or the consumer stopped early
+        for task in tasks:
+            task.cancel()
@@ -0,0 +1,62 @@
+# backend/services/quantize.py
+import numpy as np
+
+VECTOR_STORAGES = ("fp32", "fp16", "int8")
+
+def check_storage(storage):
+    if storage not in VECTOR_STORAGES:
+        raise ValueError(f"Vector storage must be one of {VECTOR_STORAGES}, not {storage!r}")
+    return storage
+
+def quantize(vectors, storage):
+    """Stored form of float32 row vectors: ``(codes, scales)``.
+
+    fp16 is a cast (``scales`` is None). int8 scales each row by its largest
+    magnitude / 127, so ``codes * scales[:, None]`` is within half a step
+    of the original; 4 bytes of scale per row buy a much finer step than
+    one range for all normalized embeddings.
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if check_storage(storage) == "fp32":
+        return np.ascontiguousarray(vectors), None
+    if storage == "fp16":
+        return vectors.astype(np.float16), None
+    scales = np.abs(vectors).max(axis=1) / 127
+    scales[scales == 0] = 1.0
+    codes = np.rint(vectors / scales[:, None]).astype(np.int8)
+    return codes, scales.astype(np.float32)
+
+def dequantize(codes, scales=None):
+    """float32 rows back from quantize(), always a new, writable array"""
+    vectors = np.array(codes, dtype=np.float32)
+    if scales is not None:
+        vectors = vectors * np.asarray(scales, dtype=np.float32)[:, None]
+    return vectors
+
+def faiss_sq_index(d, storage):
+    """An inner-product FAISS index holding vectors in ``storage`` precision, untrained"""
+    import faiss
+    if check_storage(storage) == "fp32":
+        return faiss.IndexFlatIP(d)
+    qtype = faiss.ScalarQuantizer.QT_fp16 if storage == "fp16" else faiss.ScalarQuantizer.QT_8bit
+    return faiss.IndexScalarQuantizer(d, qtype, faiss.METRIC_INNER_PRODUCT)
+
+def record_dtype(storage, d):
+    """dtype of one stored row: the codes, with the row's scale in front for int8"""
+    if check_storage(storage) == "int8":
+        return np.dtype([("scale", np.float32), ("codes", np.int8, (d,))])
+    return np.dtype((np.float32 if storage == "fp32" else np.float16, (d,)))
+
+def pack(codes, scales=None):
+    """quantize() output as one array of record_dtype rows, e.g. to save"""
+    if scales is None:
+        return codes
+    records = np.empty(len(codes), dtype=record_dtype("int8", codes.shape[1]))
+    records["scale"], records["codes"] = scales, codes
+    return records
+
+def unpack(records):
+    """``(codes, scales)`` back from pack(); views, not copies"""
+    if records.dtype.names:
+        return records["codes"], records["scale"]
+    return records, None
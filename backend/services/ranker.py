@@ -0,0 +1,45 @@
+# backend/services/ranker.py
+import numpy as np
+
+AGGREGATES = ("max", "mean")
+
+def prerank_scores(chunk_vectors, chunk_counts, jd_vector, aggregate="max"):
+    """Score every resume against a JD with a single matrix-vector product.
+
+    chunk_vectors holds the normalized chunk embeddings of all resumes stacked
+    in order, chunk_counts the number of chunks each resume contributed.
+    Returns (scores, sims): one cosine score per resume (-1.0 for resumes
+    without any text) and the per-chunk similarities.
+    """
+    if aggregate not in AGGREGATES:
+        raise ValueError(f"aggregate must be one of {AGGREGATES}")
+
+    counts = np.asarray(chunk_counts, dtype=np.int64)
+    scores = np.full(len(counts), -1.0, dtype=np.float32)
+    if len(chunk_vectors) == 0:
+        return scores, np.empty(0, dtype=np.float32)
+
+    sims = chunk_vectors @ jd_vector  # vectors are normalized, so this is cosine
+
+    # reduceat needs the start offset of every non-empty group
+    has_chunks = counts > 0
+    starts = (np.cumsum(counts) - counts)[has_chunks]
+    if aggregate == "max":
+        scores[has_chunks] = np.maximum.reduceat(sims, starts)
+    else:
+        scores[has_chunks] = np.add.reduceat(sims, starts) / counts[has_chunks]
+
+    return scores, sims
+
+def top_n(scores, n):
+    """Indices of the n highest scores, best first"""
+    n = min(n, len(scores))
+    if n <= 0:
+        return np.empty(0, dtype=np.int64)
+    candidates = np.argpartition(-scores, n - 1)[:n]
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+def best_chunks(chunks, sims, k=3):
+    """The k chunks of one resume most similar to the JD, best first"""
+    order = top_n(sims, k)
+    return [chunks[i] for i in order]
@@ -0,0 +1,38 @@
+# backend/services/result_cache.py
+import hashlib
+from backend.services.cache import LRUCache
+from backend.services.embedding_cache import normalize_text
+from backend.services.llm import llm_model_name
+from backend.services.skills import skill_index_version
+from backend.models.prompts import PROMPT_VERSION
+from backend.config import (
+    USE_GROQ, RESULT_CACHE_MAX_ITEMS, RESULT_CACHE_TTL, SKILL_GAP_MODE, RETRIEVAL_MODE
+)
+
+_cache = LRUCache(max_items=RESULT_CACHE_MAX_ITEMS, ttl=RESULT_CACHE_TTL or None)
+
+def result_key(resume_text, job_text, retrieval=None):
+    """Key an analysis on everything that determines the LLM verdict"""
+    parts = (
+        hashlib.sha256(resume_text.encode()).hexdigest(),
+        normalize_text(job_text),
+        PROMPT_VERSION,
+        retrieval or RETRIEVAL_MODE,
+        SKILL_GAP_MODE,
+        skill_index_version(),
+        llm_model_name(),
+    )
+    return hashlib.sha256("\0".join(parts).encode()).hexdigest()
+
+def get_cached_result(key):
+    result = _cache.get(key)
+    return dict(result) if result is not None else None
+
+def cache_result(key, result):
+    # Only memoize real verdicts: the unconfigured fallback and the API/JSON
+    # error paths all report a score of 0 and should be retried next time
+    if USE_GROQ and result.get("score"):
+        _cache.put(key, dict(result))
+
+def result_cache_stats():
+    return _cache.stats()
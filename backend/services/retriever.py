@@ -1,29 +1,394 @@
-import faiss
 import hashlib
+import json
+import os
+import queue
 import threading
+import time
+import numpy as np
+from backend.services.cache import LRUCache
+from backend.services.sparse import SparseIndex
+from backend.services.quantize import quantize, dequantize, faiss_sq_index, pack, unpack
+from backend.config import (
+    RETRIEVAL_MODE,
+    RRF_K,
+    RRF_DEPTH,
+    SMALL_INDEX_MAX_CHUNKS,
+    INDEX_CACHE_DIR,
+    INDEX_CACHE_MAX_BYTES,
+    INDEX_CACHE_TTL,
+    INDEX_CACHE_DISK_MAX_BYTES,
+    VECTOR_STORAGE,
+)
+
+RETRIEVAL_MODES = ("dense", "hybrid")
 
-_INDEX_CACHE = {}
 _lock = threading.Lock()
 
+def _faiss():
+    """faiss is only needed for large indexes and spilled FAISS entries"""
+    import faiss
+    return faiss
+
+_disk_stats = {"spills": 0, "disk_hits": 0, "disk_evictions": 0}
+
+_PRUNE_EVERY = 200  # spills between full scans of INDEX_CACHE_DIR
+_PRUNE_TARGET = 0.9  # prune down to this share of the budget, so the next spill doesn't rescan
+_TMP_MAX_AGE = 3600  # seconds before a leftover .tmp file is treated as orphaned
+
+_MISSING_SCORE = -np.finfo(np.float32).max  # what FAISS reports for empty result slots
+
+class NumpyIndex:
+    """Exact inner-product search over a small, contiguous chunk matrix.
+
+    A resume only has a handful of chunks, so there is no need to build a
+    FAISS index per request: the chunk matrix is kept as-is and a query is
+    one matmul plus argpartition. Mirrors the ``IndexFlatIP`` interface used
+    here (``ntotal``, ``d``, ``search``) and returns the same results.
+
+    The matrix is stored as ``storage`` (VECTOR_STORAGE: fp32, fp16 or int8
+    codes with a scale per row) and widened to float32 for each search.
+    """
+
+    def __init__(self, vectors, storage=VECTOR_STORAGE):
+        self.codes, self.scales = quantize(vectors, storage)
+
+    @classmethod
+    def from_codes(cls, codes, scales=None):
+        index = cls.__new__(cls)
+        index.codes, index.scales = codes, scales
+        return index
+
+    @property
+    def ntotal(self):
+        return self.codes.shape[0]
+
+    @property
+    def d(self):
+        return self.codes.shape[1]
+
+    @property
+    def nbytes(self):
+        return self.codes.nbytes + (self.scales.nbytes if self.scales is not None else 0)
+
+    def search(self, queries, k):
+        queries = np.asarray(queries, dtype=np.float32).reshape(-1, self.d)
+        if self.codes.dtype == np.float32:
+            neg = queries @ self.codes.T
+        else:
+            neg = queries @ dequantize(self.codes, self.scales).T
+        np.negative(neg, out=neg)  # ascending sort of -score == best first
+        n = self.ntotal
+        top = min(k, n)
+        rows = np.arange(len(neg))[:, None]
+
+        if top < n:
+            candidates = neg.argpartition(top - 1, axis=1)[:, :top]
+            order = neg[rows, candidates].argsort(axis=1, kind="stable")
+            indices = candidates[rows, order]
+        else:
+            indices = neg.argsort(axis=1, kind="stable")
+        distances = -neg[rows, indices]
+
+        if top < k:
+            # Pad like FAISS does when k exceeds the number of vectors
+            padded_distances = np.full((len(neg), k), _MISSING_SCORE, dtype=np.float32)
+            padded_indices = np.full((len(neg), k), -1, dtype=np.int64)
+            padded_distances[:, :top] = distances
+            padded_indices[:, :top] = indices
+            return padded_distances, padded_indices
+        return distances, indices
+
+def build_index(vectors, storage=VECTOR_STORAGE):
+    """Pick the search backend by corpus size (vectors are L2-normalized)"""
+    if len(vectors) <= SMALL_INDEX_MAX_CHUNKS:
+        return NumpyIndex(vectors, storage)
+
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    index = faiss_sq_index(vectors.shape[1], storage)
+    if not index.is_trained:
+        index.train(vectors)  # 8-bit ranges per dimension, from the resume's own chunks
+    index.add(vectors)
+    return index
+
 def hash_text(text):
     return hashlib.md5(text.encode()).hexdigest()
 
+def _index_nbytes(index):
+    if isinstance(index, NumpyIndex):
+        return index.nbytes
+    return index.ntotal * index.sa_code_size()
+
+def _entry_nbytes(entry):
+    index, chunks, sparse = entry
+    return _index_nbytes(index) + sum(len(chunk) for chunk in chunks) + sparse.nbytes
+
+def _paths(key):
+    return (
+        os.path.join(INDEX_CACHE_DIR, f"{key}.index"),
+        os.path.join(INDEX_CACHE_DIR, f"{key}.npy"),
+        os.path.join(INDEX_CACHE_DIR, f"{key}.json"),
+    )
+
+def _tmp_path(path):
+    # Unique per process and thread: workers sharing the directory never
+    # write to the same temp file
+    return f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+def _spill(key, entry):
+    """Persist an evicted entry under INDEX_CACHE_DIR, keyed by content hash;
+    returns the bytes written"""
+    index, chunks, _ = entry
+    index_path, matrix_path, chunks_path = _paths(key)
+    if isinstance(index, NumpyIndex):
+        index_path = matrix_path
+    if os.path.exists(index_path) and os.path.exists(chunks_path):
+        return 0
+
+    os.makedirs(INDEX_CACHE_DIR, exist_ok=True)
+    # Write to temp names and rename so readers never see half a file
+    index_tmp, chunks_tmp = _tmp_path(index_path), _tmp_path(chunks_path)
+    if isinstance(index, NumpyIndex):
+        with open(index_tmp, "wb") as f:
+            np.save(f, pack(index.codes, index.scales))
+    else:
+        _faiss().write_index(index, index_tmp)
+    with open(chunks_tmp, "w", encoding="utf-8") as f:
+        json.dump(chunks, f)
+    written = os.path.getsize(index_tmp) + os.path.getsize(chunks_tmp)
+    os.replace(chunks_tmp, chunks_path)
+    os.replace(index_tmp, index_path)
+    _disk_stats["spills"] += 1
+    return written
+
+def _prune_disk():
+    """Drop the oldest spilled entries once the disk tier is over budget, and
+    temp files left behind by a crashed writer; returns the bytes kept"""
+    files = {}
+    now = time.time()
+    for item in os.scandir(INDEX_CACHE_DIR):
+        key, ext = os.path.splitext(item.name)
+        if ext == ".tmp":
+            try:
+                if now - item.stat().st_mtime > _TMP_MAX_AGE:
+                    os.remove(item.path)
+            except FileNotFoundError:
+                pass
+        elif ext in (".index", ".npy", ".json"):
+            try:
+                stat = item.stat()
+            except FileNotFoundError:  # pruned by another worker meanwhile
+                continue
+            size, mtime = files.get(key, (0, stat.st_mtime))
+            files[key] = (size + stat.st_size, min(mtime, stat.st_mtime))
+
+    total = sum(size for size, _ in files.values())
+    if total <= INDEX_CACHE_DISK_MAX_BYTES:
+        return total
+    target = INDEX_CACHE_DISK_MAX_BYTES * _PRUNE_TARGET
+    for key, (size, _) in sorted(files.items(), key=lambda kv: kv[1][1]):
+        if total <= target:
+            break
+        for path in _paths(key):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        total -= size
+        _disk_stats["disk_evictions"] += 1
+    return total
+
+class _Spiller:
+    """Writes evicted entries to disk on a background thread.
+
+    The LRU cache calls ``submit`` from its eviction callback with its lock
+    (and often ``_lock``) held, so the write happens later, off the event
+    loop. Until it has, the entry stays readable through ``pending``. Disk
+    usage is tracked from the bytes written; the directory is only scanned
+    when that estimate goes over budget or every ``_PRUNE_EVERY`` spills, to
+    pick up files written or removed by other workers.
+    """
+
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._pending = {}
+        self._pending_lock = threading.Lock()
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._disk_bytes = None  # unknown until the first scan
+        self._since_prune = 0
+
+    def submit(self, key, entry):
+        with self._pending_lock:
+            self._pending[key] = entry
+        self._ensure_started()
+        self._queue.put(key)
+
+    def pending(self, key):
+        with self._pending_lock:
+            return self._pending.get(key)
+
+    def join(self):
+        """Wait until every submitted entry has been written"""
+        if self._thread is not None:
+            self._queue.join()
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="index-spiller", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            key = self._queue.get()
+            try:
+                entry = self.pending(key)
+                if entry is not None:
+                    self.write(key, entry)
+            except Exception as e:
+                print(f"[ERROR] Failed to spill index {key}: {e}")
+            finally:
+                with self._pending_lock:
+                    self._pending.pop(key, None)
+                self._queue.task_done()
+
+    def write(self, key, entry, prune=True):
+        written = _spill(key, entry)
+        if not written:
+            return
+        if self._disk_bytes is not None:
+            self._disk_bytes += written
+        self._since_prune += 1
+        if prune:
+            self.maybe_prune()
+
+    def maybe_prune(self, force=False):
+        if (force or self._disk_bytes is None or self._disk_bytes > INDEX_CACHE_DISK_MAX_BYTES
+                or self._since_prune >= _PRUNE_EVERY):
+            self._disk_bytes = _prune_disk()
+            self._since_prune = 0
+
+_spiller = _Spiller()
+
+def _load(key):
+    """Load a spilled entry back from disk, memory-mapping the index"""
+    index_path, matrix_path, chunks_path = _paths(key)
+    try:
+        if os.path.exists(matrix_path):
+            # Stored as saved, whatever VECTOR_STORAGE is now
+            index = NumpyIndex.from_codes(*unpack(np.load(matrix_path, mmap_mode="r")))
+        else:
+            faiss = _faiss()
+            index = faiss.read_index(index_path, faiss.IO_FLAG_MMAP | faiss.IO_FLAG_MMAP_IFC)
+        with open(chunks_path, encoding="utf-8") as f:
+            chunks = json.load(f)
+    except (RuntimeError, OSError, ValueError):
+        return None
+    _disk_stats["disk_hits"] += 1
+    # Rebuilding the postings takes about a millisecond, so they are not spilled
+    return index, chunks, SparseIndex(chunks)
+
+_INDEX_CACHE = LRUCache(
+    max_bytes=INDEX_CACHE_MAX_BYTES,
+    ttl=INDEX_CACHE_TTL or None,
+    sizeof=_entry_nbytes,
+    on_evict=_spiller.submit,
+)
+
+def _get_entry(key):
+    entry = _INDEX_CACHE.get(key)
+    if entry is None:
+        # Evicted but not yet written out: still usable as is
+        entry = _spiller.pending(key) or _load(key)
+        if entry is not None:
+            _INDEX_CACHE.put(key, entry)
+    return entry
+
 def create_index(vectors, chunks, resume_text):
-    key = hash_text(resume_text)
+    # Keyed on the chunks rather than the text alone, so a chunking change
+    # never serves an index built from the old chunks
+    key = hash_text("\0".join([resume_text] + chunks))
 
     with _lock:
-        if key in _INDEX_CACHE:
+        if _get_entry(key) is not None:
             return key
 
-        dim = vectors.shape[1]
-        index = faiss.IndexFlatL2(dim)
-        index.add(vectors)
-
-        _INDEX_CACHE[key] = (index, chunks)
+        _INDEX_CACHE.put(key, (build_index(vectors), chunks, SparseIndex(chunks)))
 
     return key
 
+def _unique_chunks(chunks, indices):
+    """Map result indices to chunks, skipping empty slots (-1) and repeats"""
+    seen = set()
+    results = []
+    for i in indices:
+        if i < 0 or chunks[i] in seen:
+            continue
+        seen.add(chunks[i])
+        results.append(chunks[i])
+    return results
+
 def search(query_vec, key, k=5):
-    index, chunks = _INDEX_CACHE[key]
-    distances, indices = index.search(query_vec.reshape(1, -1), k)
-    return [chunks[i] for i in indices[0]]
\ No newline at end of file
+    return search_many(query_vec.reshape(1, -1), key, k)[0]
+
+def _fuse(rankings, k):
+    """Reciprocal rank fusion: ids ordered by the sum of 1 / (RRF_K + rank)"""
+    scores = {}
+    for ranking in rankings:
+        for rank, i in enumerate(ranking):
+            scores[i] = scores.get(i, 0.0) + 1.0 / (RRF_K + rank + 1)
+    # sorted() is stable, so ties keep the dense ranking's order
+    return sorted(scores, key=scores.get, reverse=True)[:k]
+
+def search_many(query_vecs, key, k=5, query_texts=None, retrieval=None):
+    """Top-k chunks for every row of query_vecs in a single index.search call.
+
+    k is clamped to the number of chunks, so a short resume never yields
+    padding slots, and each result list is free of duplicate chunks. In
+    "hybrid" mode (``retrieval`` or RETRIEVAL_MODE) the dense ranking of
+    each query is fused with the BM25 ranking of its text, when given, so
+    exact terms like "Kubernetes" or "SOC 2" are not lost.
+    """
+    retrieval = retrieval or RETRIEVAL_MODE
+    if retrieval not in RETRIEVAL_MODES:
+        raise ValueError(f"retrieval must be one of {RETRIEVAL_MODES}")
+    entry = _get_entry(key)
+    if entry is None:
+        raise KeyError(f"No index cached for {key}")
+    index, chunks, sparse = entry
+
+    query_vecs = np.ascontiguousarray(query_vecs, dtype=np.float32).reshape(-1, index.d)
+    k = min(k, index.ntotal)
+    if k <= 0:
+        return [[] for _ in range(len(query_vecs))]
+
+    if retrieval == "dense" or query_texts is None:
+        distances, indices = index.search(query_vecs, k)
+        return [_unique_chunks(chunks, row) for row in indices]
+
+    depth = min(max(k, RRF_DEPTH), index.ntotal)
+    distances, indices = index.search(query_vecs, depth)
+    return [
+        _unique_chunks(chunks, _fuse([row[row >= 0], sparse.rank(text, depth)], k))
+        for row, text in zip(indices, query_texts)
+    ]
+
+def flush_index_cache():
+    """Spill every in-memory entry to disk so it survives a restart.
+
+    Blocking; call it from a thread. The disk budget is enforced once at the
+    end rather than after every entry.
+    """
+    _spiller.join()
+    for key, entry in _INDEX_CACHE.items():
+        try:
+            _spiller.write(key, entry, prune=False)
+        except Exception as e:
+            print(f"[ERROR] Failed to persist index {key}: {e}")
+    if os.path.isdir(INDEX_CACHE_DIR):
+        _spiller.maybe_prune(force=True)
+
+def index_cache_stats():
+    return {**_INDEX_CACHE.stats(), **_disk_stats}
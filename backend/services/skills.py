@@ -0,0 +1,217 @@
+# backend/services/skills.py
+import asyncio
+import hashlib
+import json
+import os
+import re
+import threading
+import numpy as np
+from backend.models.skills import SKILLS, CASE_SENSITIVE, SKILLS_VERSION
+from backend.services.embeddings import embed_texts, embedding_model_id
+from backend.config import (
+    SKILL_INDEX_DIR, SKILL_MATCH_THRESHOLD, SKILL_VOCAB_PATH, SKILL_GAP_MAX, SKILL_GAP_MODE
+)
+
+# Whole tokens, keeping "C++", "C#", "Node.js", ".NET" and "R&D" in one piece;
+# "-" and "/" split tokens, so "CI/CD" matches "ci cd"
+_TOKENS = re.compile(r"\.?[A-Za-z0-9][A-Za-z0-9+#&]*(?:\.[A-Za-z0-9]+)*")
+_OPTIONAL = re.compile(r"nice to have|bonus|a plus|preferred|optional|familiarity", re.I)
+_OPTIONAL_WEIGHT = 0.5  # JD mentions on "nice to have" lines count half
+
+def load_vocabulary(path=SKILL_VOCAB_PATH):
+    """SKILLS plus the optional JSON file of {canonical name: [aliases]}"""
+    vocabulary = {name: tuple(aliases) for name, aliases in SKILLS.items()}
+    if path:
+        with open(path, encoding="utf-8") as f:
+            for name, aliases in json.load(f).items():
+                vocabulary[name] = vocabulary.get(name, ()) + tuple(aliases)
+    return vocabulary
+
+class SkillIndex:
+    """Skill vocabulary with a token n-gram matcher and a skill similarity matrix.
+
+    ``extract`` finds vocabulary skills in a text by longest whole-token
+    n-gram lookup. ``related`` is the vocabulary's names embedded once
+    (cached under ``index_dir`` per model and vocabulary) with cosine
+    similarity thresholded: a resume covers skill j when it mentions any
+    skill i with ``related[j, i]``. ``gaps`` finds the missing skills of
+    every (resume, JD) pair with matrix operations over multi-hot rows.
+    """
+
+    def __init__(self, vocabulary=None, index_dir=SKILL_INDEX_DIR, threshold=SKILL_MATCH_THRESHOLD):
+        vocabulary = vocabulary or load_vocabulary()
+        self.names = list(vocabulary)
+        self.index_dir = index_dir
+        self.threshold = threshold
+        self.version = hashlib.sha256(
+            json.dumps([SKILLS_VERSION, vocabulary, sorted(CASE_SENSITIVE)]).encode()
+        ).hexdigest()[:12]
+
+        # lower-cased token tuple -> (skill id, spelling that must match exactly or None)
+        self._lookup = {}
+        for i, name in enumerate(self.names):
+            for alias in (name,) + vocabulary[name]:
+                tokens = tuple(_TOKENS.findall(alias))
+                if tokens:
+                    exact = tokens if alias in CASE_SENSITIVE else None
+                    self._lookup.setdefault(tuple(t.lower() for t in tokens), (i, exact))
+        self.max_ngram = max(map(len, self._lookup))
+        self._related = None
+        self._lock = threading.Lock()
+
+    def extract(self, text):
+        """{skill id: (weight, first token position)} for the skills a text mentions"""
+        found = {}
+        position = 0
+        for line in text.splitlines():
+            weight = _OPTIONAL_WEIGHT if _OPTIONAL.search(line) else 1.0
+            matches = list(_TOKENS.finditer(line))
+            tokens = [m.group() for m in matches]
+            lowered = [t.lower() for t in tokens]
+            i = 0
+            while i < len(tokens):
+                for n in range(min(self.max_ngram, len(tokens) - i), 0, -1):
+                    hit = self._lookup.get(tuple(lowered[i:i + n]))
+                    if hit is None:
+                        continue
+                    skill, exact = hit
+                    if exact is not None and (tuple(tokens[i:i + n]) != exact
+                                              or line[matches[i + n - 1].end():][:1] == "-"):
+                        continue  # "go to market", "C-level"
+                    weight_so_far, first = found.get(skill, (0.0, position + i))
+                    found[skill] = (weight_so_far + weight, first)
+                    i += n - 1
+                    break
+                i += 1
+            position += len(tokens)
+        return found
+
+    def _matrix(self, texts):
+        """(weights, first positions) as (len(texts), V) arrays"""
+        weights = np.zeros((len(texts), len(self.names)), dtype=np.float32)
+        first = np.full((len(texts), len(self.names)), np.iinfo(np.int32).max, dtype=np.int32)
+        for row, text in enumerate(texts):
+            for skill, (weight, position) in self.extract(text).items():
+                weights[row, skill] = weight
+                first[row, skill] = position
+        return weights, first
+
+    def related(self):
+        """(V, V) bool matrix of skills close enough to stand in for each other"""
+        if self._related is None:
+            with self._lock:
+                if self._related is None:
+                    self._related = self._build_related()
+        return self._related
+
+    def _build_related(self):
+        key = hashlib.sha256(f"{self.version}\0{embedding_model_id()}".encode()).hexdigest()[:16]
+        path = os.path.join(self.index_dir, f"skills-{key}.npy")
+        try:
+            if os.path.exists(path):
+                vectors = np.load(path)
+            else:
+                vectors = embed_texts(self.names)
+                os.makedirs(self.index_dir, exist_ok=True)
+                with open(path + ".tmp", "wb") as f:
+                    np.save(f, vectors)
+                os.replace(path + ".tmp", path)
+            related = (vectors @ vectors.T) >= self.threshold
+        except Exception as e:
+            # Exact matches still work; only near-synonyms are lost
+            print(f"[WARNING] Skill similarity index unavailable, exact matching only: {e}")
+            related = np.zeros((len(self.names), len(self.names)), dtype=bool)
+        np.fill_diagonal(related, True)
+        return related
+
+    def gaps(self, resume_texts, job_texts, limit=SKILL_GAP_MAX):
+        """Skill gaps for every (resume, JD) pair; one side may be a single text.
+
+        Returns one ``{"missing_skills", "matched_skills", "coverage"}`` per
+        pair. Missing skills are ordered by how prominent they are in the JD
+        (mentions, "nice to have" counting half, then first mention);
+        coverage is the weighted share of the JD's skills the resume covers,
+        None when the JD names no known skill.
+        """
+        resume_weights, _ = self._matrix(resume_texts)
+        job_weights, job_first = self._matrix(job_texts)
+
+        related = self.related().astype(np.float32)
+        covered = (resume_weights > 0).astype(np.float32) @ related.T > 0  # (resumes, V)
+        mentioned = job_weights > 0  # (jobs, V); broadcast against covered
+        missing = mentioned & ~covered
+        matched = mentioned & covered
+
+        # Prominence first, earlier mention breaks ties
+        prominence = job_weights.astype(np.float64) * 1e7 - np.minimum(job_first, 1e7 - 1)
+        order = np.argsort(-prominence, axis=1, kind="stable")
+        missing, matched, order = np.broadcast_arrays(missing, matched, order)
+        covered_weight = (job_weights * matched).sum(axis=1)
+        total = np.broadcast_to(job_weights.sum(axis=1), covered_weight.shape)
+        coverage = covered_weight / np.maximum(total, 1e-9)
+
+        results = []
+        for row in range(len(missing)):
+            ranked = order[row]
+            results.append({
+                "missing_skills": [self.names[i] for i in ranked[missing[row, ranked]][:limit]],
+                "matched_skills": [self.names[i] for i in ranked[matched[row, ranked]]],
+                "coverage": round(float(coverage[row]), 4) if total[row] > 0 else None,
+            })
+        return results
+
+    def stats(self):
+        related = self._related
+        return {
+            "mode": SKILL_GAP_MODE,
+            "vocabulary": len(self.names),
+            "aliases": len(self._lookup),
+            "version": self.version,
+            "related_pairs": int((related.sum() - len(self.names)) // 2) if related is not None else None,
+        }
+
+_index = None
+_index_lock = threading.Lock()
+
+def get_skill_index():
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = SkillIndex()
+    return _index
+
+def warm_up_skills():
+    """Load or build the skill similarity matrix (embeds the vocabulary once);
+    also in "llm" mode, since fast-mode scoring uses the engine regardless"""
+    get_skill_index().related()
+
+def skill_gaps(resume_text, job_texts):
+    """Gaps of one resume against each JD; None per JD in "llm" mode"""
+    if SKILL_GAP_MODE == "llm":
+        return [None] * len(job_texts)
+    return get_skill_index().gaps([resume_text], job_texts)
+
+def skill_gaps_for_resumes(resume_texts, job_text):
+    """Gaps of each resume against one JD; None per resume in "llm" mode"""
+    if SKILL_GAP_MODE == "llm":
+        return [None] * len(resume_texts)
+    return get_skill_index().gaps(resume_texts, [job_text])
+
+# Off the event loop: without warm-up the first call embeds the whole vocabulary
+
+async def skill_gaps_async(resume_text, job_texts):
+    return await asyncio.to_thread(skill_gaps, resume_text, job_texts)
+
+async def skill_gaps_for_resumes_async(resume_texts, job_text):
+    return await asyncio.to_thread(skill_gaps_for_resumes, resume_texts, job_text)
+
+async def skill_index_gaps_async(resume_texts, job_texts):
+    """SkillIndex.gaps whatever SKILL_GAP_MODE says (fast-mode scoring)"""
+    return await asyncio.to_thread(get_skill_index().gaps, resume_texts, job_texts)
+
+def skill_index_version():
+    return get_skill_index().version if SKILL_GAP_MODE != "llm" else "llm"
+
+def skill_index_stats():
+    return get_skill_index().stats() if SKILL_GAP_MODE != "llm" else {"mode": "llm"}
@@ -0,0 +1,84 @@
+# backend/services/sparse.py
+import re
+import zlib
+import numpy as np
+from backend.config import BM25_K1, BM25_B
+
+_TERMS = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9]+)*")
+_STOPWORDS = frozenset("""
+a about above after all also an and any are as at be been being both but by can could do does
+doing during each either etc for from had has have having he her here hers him his how i if in
+into is it its itself just may me more most must my no nor not of off on once only or other our
+ours out over own per plus same she should so some such than that the their theirs them then
+there these they this those through to too under until up us very was we were what when where
+which while who whom why will with within without would you your yours
+able ability across work working team teams role candidate candidates experience experienced
+years year strong excellent good great skills skill knowledge understanding including include
+includes join looking responsible responsibilities requirements required preferred plus new
+""".split())
+
+def tokenize(text):
+    """Lower-cased content words of a text in order; stopwords and one-letter tokens
+    are dropped, but digits stay ("SOC 2", "5 years")"""
+    return [t for t in _TERMS.findall(text.lower())
+            if t not in _STOPWORDS and (len(t) > 1 or t.isdigit())]
+
+def _term_ids(terms):
+    # crc32 is stable across processes; a collision only merges two terms' postings
+    return np.fromiter((zlib.crc32(t.encode()) for t in terms), dtype=np.uint32, count=len(terms))
+
+class SparseIndex:
+    """BM25 inverted index over the chunks of one resume.
+
+    Postings are CSR arrays: sorted ``term_ids`` (uint32 term hashes),
+    ``indptr`` into ``docs`` (chunk ids) and ``weights`` (BM25 weight of
+    the term in that chunk, idf and length normalization folded in at
+    build time). Scoring a query is a searchsorted plus one scatter-add
+    per matched term.
+    """
+
+    def __init__(self, chunks, k1=BM25_K1, b=BM25_B):
+        self.size = len(chunks)
+        per_chunk = [_term_ids(tokenize(chunk)) for chunk in chunks]
+        lengths = np.array([len(ids) for ids in per_chunk], dtype=np.int64)
+        if not lengths.sum():
+            self.term_ids = np.empty(0, dtype=np.uint32)
+            self.indptr = np.zeros(1, dtype=np.int32)
+            self.docs = np.empty(0, dtype=np.int32)
+            self.weights = np.empty(0, dtype=np.float32)
+            return
+
+        # Unique (term, chunk) pairs, sorted by term then chunk, with their counts
+        chunk_ids = np.repeat(np.arange(self.size, dtype=np.uint64), lengths)
+        pairs, tf = np.unique((np.concatenate(per_chunk).astype(np.uint64) << 32) | chunk_ids,
+                              return_counts=True)
+        terms = (pairs >> 32).astype(np.uint32)
+        self.docs = (pairs & 0xFFFFFFFF).astype(np.int32)
+        self.term_ids, starts, df = np.unique(terms, return_index=True, return_counts=True)
+        self.indptr = np.append(starts, len(terms)).astype(np.int32)
+
+        idf = np.log1p((self.size - df + 0.5) / (df + 0.5))
+        norm = k1 * (1 - b + b * lengths[self.docs] / lengths.mean())
+        self.weights = (np.repeat(idf, df) * tf * (k1 + 1) / (tf + norm)).astype(np.float32)
+
+    @property
+    def nbytes(self):
+        return self.term_ids.nbytes + self.indptr.nbytes + self.docs.nbytes + self.weights.nbytes
+
+    def scores(self, text):
+        """BM25 score of every chunk for a query text"""
+        scores = np.zeros(self.size, dtype=np.float32)
+        ids = np.unique(_term_ids(tokenize(text)))
+        rows = np.searchsorted(self.term_ids, ids)
+        found = rows < len(self.term_ids)
+        rows = rows[found][self.term_ids[rows[found]] == ids[found]]
+        for row in rows:
+            start, end = self.indptr[row], self.indptr[row + 1]
+            scores[self.docs[start:end]] += self.weights[start:end]  # chunk ids are unique per term
+        return scores
+
+    def rank(self, text, k):
+        """Ids of the top-k chunks that match any query term, best first"""
+        scores = self.scores(text)
+        matched = np.flatnonzero(scores)
+        return matched[np.argsort(-scores[matched], kind="stable")][:k]
@@ -0,0 +1,84 @@
+# backend/services/startup.py
+import asyncio
+import time
+from backend.services.embeddings import get_model, get_tokenizer, embed_texts
+from backend.services.parser import warm_up_parser
+from backend.services.skills import warm_up_skills
+from backend.services.jd_corpus import get_jd_corpus
+
+# Filled in as the worker boots; served by /ready and /metrics
+_state = {
+    "status": "starting",
+    "error": None,
+    "import_seconds": None,
+    "warmup_seconds": None,
+    "ready_seconds": None,
+}
+_started_at = None
+
+def mark_imported(started_at):
+    """Record how long importing the app took (started_at: perf_counter)"""
+    global _started_at
+    _started_at = started_at
+    _state["import_seconds"] = round(time.perf_counter() - started_at, 3)
+
+def _warm_up():
+    """Load the heavy libraries and models; runs off the event loop"""
+    timings = {}
+
+    start = time.perf_counter()
+    get_model()
+    embed_texts(["warm up"])  # first encode allocates kernels and buffers
+    timings["embedding_model_seconds"] = round(time.perf_counter() - start, 3)
+
+    start = time.perf_counter()
+    get_tokenizer()  # the chunker's copy of the embedder's tokenizer
+    timings["tokenizer_seconds"] = round(time.perf_counter() - start, 3)
+
+    start = time.perf_counter()
+    import faiss  # noqa: F401
+    timings["faiss_seconds"] = round(time.perf_counter() - start, 3)
+
+    start = time.perf_counter()
+    warm_up_parser()
+    timings["parser_seconds"] = round(time.perf_counter() - start, 3)
+
+    start = time.perf_counter()
+    warm_up_skills()
+    timings["skills_seconds"] = round(time.perf_counter() - start, 3)
+
+    start = time.perf_counter()
+    get_jd_corpus()
+    timings["jd_corpus_seconds"] = round(time.perf_counter() - start, 3)
+
+    return timings
+
+async def warm_up():
+    """Background warm-up; flips the readiness state when done"""
+    _state["status"] = "warming_up"
+    start = time.perf_counter()
+    try:
+        _state.update(await asyncio.get_running_loop().run_in_executor(None, _warm_up))
+        _state["status"] = "ready"
+    except Exception as e:
+        # Models still load lazily on first use; report it but keep serving
+        print(f"[ERROR] Warm-up failed: {e}")
+        _state["status"] = "failed"
+        _state["error"] = str(e)[:200]
+    _state["warmup_seconds"] = round(time.perf_counter() - start, 3)
+    if _started_at is not None:
+        _state["ready_seconds"] = round(time.perf_counter() - _started_at, 3)
+    print(f"[INFO] Startup {_state['status']} after {_state['ready_seconds']}s "
+          f"(import {_state['import_seconds']}s, warm-up {_state['warmup_seconds']}s)")
+
+def mark_ready():
+    """Skip warm-up: everything loads lazily on first use"""
+    _state["status"] = "ready"
+    if _started_at is not None:
+        _state["ready_seconds"] = round(time.perf_counter() - _started_at, 3)
+
+def is_ready():
+    return _state["status"] == "ready"
+
+def startup_state():
+    return dict(_state)
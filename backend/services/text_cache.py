@@ -0,0 +1,108 @@
+# backend/services/text_cache.py
+import os
+import sqlite3
+import threading
+from backend.services.cache import LRUCache
+from backend.config import TEXT_CACHE_MAX_BYTES, TEXT_CACHE_PATH, TEXT_CACHE_DISK_MAX_ITEMS
+
+_PRUNE_EVERY = 1000  # disk writes between prunes of the SQLite tier
+
+class ParsedTextCache:
+    """Two-tier cache of extracted resume text keyed by the upload's hash.
+
+    Entries are ``(text, source_bytes, parse_seconds)``. Lookups go to an
+    in-process LRU bounded by text size first, then to a SQLite file shared
+    by all workers on the node. The source size and parse time recorded with
+    each entry are what a hit saves, and feed ``bytes_saved`` and
+    ``seconds_saved``.
+    """
+
+    def __init__(self, path=TEXT_CACHE_PATH, max_bytes=TEXT_CACHE_MAX_BYTES,
+                 disk_max_items=TEXT_CACHE_DISK_MAX_ITEMS):
+        self.memory = LRUCache(max_bytes=max_bytes, sizeof=lambda entry: len(entry[0]))
+        self.disk_max_items = disk_max_items
+        self._db = None
+        self._db_lock = threading.Lock()
+        self._writes = 0
+        if path:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                """CREATE TABLE IF NOT EXISTS parsed (
+                    key TEXT PRIMARY KEY, text TEXT NOT NULL,
+                    source_bytes INTEGER NOT NULL, parse_seconds REAL NOT NULL
+                )"""
+            )
+            self._db.commit()
+
+        self.disk_hits = 0
+        self.bytes_saved = 0
+        self.seconds_saved = 0.0
+
+    def get(self, key):
+        """Cached text for key, or None"""
+        entry = self.memory.get(key)
+        if entry is None and self._db is not None:
+            entry = self._load(key)
+            if entry is not None:
+                self.disk_hits += 1
+                self.memory.put(key, entry)
+        if entry is None:
+            return None
+        self.bytes_saved += entry[1]
+        self.seconds_saved += entry[2]
+        return entry[0]
+
+    def put(self, key, text, source_bytes, parse_seconds):
+        entry = (text, source_bytes, parse_seconds)
+        self.memory.put(key, entry)
+        if self._db is not None:
+            self._store(key, entry)
+
+    def _load(self, key):
+        with self._db_lock:
+            row = self._db.execute(
+                "SELECT text, source_bytes, parse_seconds FROM parsed WHERE key = ?", (key,)
+            ).fetchone()
+        return tuple(row) if row is not None else None
+
+    def _store(self, key, entry):
+        try:
+            with self._db_lock:
+                self._db.execute("INSERT OR IGNORE INTO parsed VALUES (?, ?, ?, ?)", (key, *entry))
+                self._writes += 1
+                if self.disk_max_items and self._writes % _PRUNE_EVERY == 0:
+                    # rowid grows with inserts, so this drops the oldest entries
+                    self._db.execute(
+                        "DELETE FROM parsed WHERE rowid <= "
+                        "(SELECT MAX(rowid) FROM parsed) - ?", (self.disk_max_items,)
+                    )
+                self._db.commit()
+        except sqlite3.Error as e:
+            # A busy or read-only store only costs us persistence
+            print(f"[WARNING] Parsed-text cache write failed: {e}")
+
+    def stats(self):
+        memory = self.memory.stats()
+        hits = memory["hits"]  # disk hits are memory misses that were found on disk
+        misses = memory["misses"] - self.disk_hits
+        lookups = hits + self.disk_hits + misses
+        return {
+            **memory,
+            "disk_hits": self.disk_hits,
+            "overall_hit_rate": round((hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+            "bytes_saved": self.bytes_saved,
+            "seconds_saved": round(self.seconds_saved, 3),
+        }
+
+_cache = ParsedTextCache()
+
+def get_parsed_text(key):
+    return _cache.get(key)
+
+def cache_parsed_text(key, text, source_bytes, parse_seconds):
+    _cache.put(key, text, source_bytes, parse_seconds)
+
+def text_cache_stats():
+    return _cache.stats()
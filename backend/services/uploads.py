@@ -0,0 +1,141 @@
+# backend/services/uploads.py
+import hashlib
+import json
+import os
+import tempfile
+from backend.services.parser import check_document_size
+from backend.config import UPLOAD_MAX_BYTES, UPLOAD_SPOOL_BYTES, UPLOAD_DIR, RANK_UPLOAD_MAX_BYTES
+
+_CHUNK = 1024 * 1024
+
+class SpooledFile:
+    """An upload copied to a temporary file; the parser opens it by path.
+
+    Owned by whoever parses it: ``extract_text`` removes it once
+    the text is out (call ``discard`` yourself if it is never parsed).
+    """
+
+    def __init__(self, path, size, sha256=None):
+        self.path = path
+        self.size = size
+        self.sha256 = sha256  # hex digest of the contents, for the parsed-text cache
+
+    def __len__(self):
+        return self.size
+
+    def __fspath__(self):
+        return self.path
+
+    def discard(self):
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+async def read_upload(upload):
+    """Read an UploadFile in 1 MB chunks, enforcing PARSE_MAX_BYTES as it goes.
+
+    Returns bytes for uploads up to UPLOAD_SPOOL_BYTES; larger ones are
+    spooled to a SpooledFile so no full in-memory copy is ever made.
+    """
+    buffer = bytearray()
+    spool = None
+    size = 0
+    digest = None  # only spooled uploads are hashed here, as they stream
+    try:
+        while True:
+            chunk = await upload.read(_CHUNK)
+            if not chunk:
+                break
+            size += len(chunk)
+            check_document_size(size)
+            if spool is None and size > UPLOAD_SPOOL_BYTES:
+                if UPLOAD_DIR:
+                    os.makedirs(UPLOAD_DIR, exist_ok=True)
+                spool = tempfile.NamedTemporaryFile(
+                    dir=UPLOAD_DIR or None, prefix="upload-", delete=False
+                )
+                spool.write(buffer)
+                digest = hashlib.sha256(buffer)
+                buffer = None
+            if spool is not None:
+                spool.write(chunk)
+                digest.update(chunk)
+            else:
+                buffer += chunk
+    except BaseException:
+        if spool is not None:
+            spool.close()
+            os.unlink(spool.name)
+        raise
+
+    if spool is None:
+        return bytes(buffer)
+    spool.close()
+    return SpooledFile(spool.name, size, digest.hexdigest())
+
+class UploadLimitMiddleware:
+    """Reject request bodies over the upload limit while they stream in.
+
+    A Content-Length over the limit is refused before any of the body is
+    read; otherwise bytes are counted as they arrive and the request is cut
+    off with a 413 at the limit, before the rest is received or spooled.
+    """
+
+    def __init__(self, app, max_bytes=UPLOAD_MAX_BYTES, path_limits=None):
+        self.app = app
+        self.max_bytes = max_bytes
+        self.path_limits = {"/rank": RANK_UPLOAD_MAX_BYTES} if path_limits is None else path_limits
+
+    async def __call__(self, scope, receive, send):
+        limit = self.path_limits.get(scope.get("path"), self.max_bytes) if scope["type"] == "http" else 0
+        if not limit:
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        length = headers.get(b"content-length")
+        if length is not None and length.isdigit() and int(length) > limit:
+            await _reject(send, limit)
+            return
+
+        received = 0
+        rejected = False
+        response_started = False
+
+        async def limited_receive():
+            nonlocal received, rejected
+            if rejected:
+                return {"type": "http.disconnect"}
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit and not response_started:
+                    rejected = True
+                    await _reject(send, limit)
+                    # The app sees a client that went away and stops reading
+                    return {"type": "http.disconnect"}
+            return message
+
+        async def guarded_send(message):
+            nonlocal response_started
+            if rejected:
+                return  # our 413 already went out
+            response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except Exception:
+            if not rejected:
+                raise
+
+async def _reject(send, limit):
+    body = json.dumps({"detail": f"Request body is over {limit} bytes"}).encode()
+    await send({
+        "type": "http.response.start",
+        "status": 413,
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode()),
+                    (b"connection", b"close")],
+    })
+    await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,190 @@
+"""Word-window chunk_text vs the token-aware, structure-aware chunker.
+
+Generates synthetic resumes (headed sections, job lines, bullets, skills)
+and reports, for each chunker:
+
+- chunking throughput (resumes/s; the new chunker per text and batched)
+- tokens per chunk and the share of chunks over the model's window
+- the share of resume tokens past the window, i.e. never embedded
+- bullets split across chunks and chunks that straddle a section heading
+  (small sections are packed together on purpose, so this is not zero)
+- nested chunks (a chunk inside the previous one) across overlap settings;
+  the run fails if there are any
+- retrieval hit@1/hit@3: for bullets picked at random, does a top chunk
+  (as the model sees it, truncated to the window) contain the whole bullet?
+  Scored with the configured embedding backend.
+
+Token counts use the embedder's tokenizer, or ``--tokenizer
+path/to/tokenizer.json`` (any HF fast tokenizer) when it has none.
+
+    python -m benchmarks.bench_chunker [--tokenizer tokenizer.json]
+"""
+import argparse
+import random
+import re
+import time
+import numpy as np
+from backend.services.chunker import chunk_text, chunk_spans, chunk_spans_batch, is_heading, WordTokenizer
+from backend.services.embeddings import embed_texts, get_tokenizer, max_seq_length
+
+RESUMES = 100
+QUERIES_PER_RESUME = 5
+OLD = {"size": 200, "overlap": 30}  # what the pipeline used before
+
+_VERBS = ["Built", "Migrated", "Designed", "Led", "Automated", "Optimized", "Launched", "Scaled", "Refactored"]
+_OBJECTS = ["billing ledger", "search ranking service", "fraud detection pipeline", "payments gateway",
+            "recommendation engine", "data warehouse", "mobile checkout", "observability stack",
+            "identity platform", "inventory forecasting model", "customer support bot", "feature store"]
+_TECH = ["Kafka", "Cassandra", "Kubernetes", "Terraform", "PostgreSQL", "Spark", "Airflow", "React",
+         "Go", "Rust", "TensorFlow", "PyTorch", "Redis", "Elasticsearch", "Snowflake", "gRPC"]
+_RESULTS = ["cutting p99 latency by {n}%", "saving ${n}k per year", "serving {n}M requests a day",
+            "raising conversion {n}%", "reducing incidents {n}%"]
+
+def make_resume(rng):
+    lines = ["JANE DOE", "jane@example.com | Berlin", "", "Summary"]
+    bullets = []
+    lines.append(" ".join(
+        f"{rng.choice(['Engineer', 'Developer', 'Lead'])} with {rng.randint(3, 15)} years of experience "
+        f"in {rng.choice(_TECH)} and {rng.choice(_TECH)}." for _ in range(rng.randint(2, 4))
+    ))
+    lines += ["", "Experience"]
+    for job in range(rng.randint(3, 6)):
+        lines.append(f"Senior Engineer, Company {job} ({2010 + job} - {2012 + job})")
+        for _ in range(rng.randint(4, 9)):
+            bullet = (f"• {rng.choice(_VERBS)} the {rng.choice(_OBJECTS)} on {rng.choice(_TECH)} and "
+                      f"{rng.choice(_TECH)}, " + rng.choice(_RESULTS).format(n=rng.randint(5, 90)))
+            lines.append(bullet)
+            bullets.append(bullet[2:])
+    lines += ["", "Skills", ", ".join(rng.sample(_TECH, 8)), "", "Education",
+              "M.Sc. Computer Science, Technical University (2009)", "", "Projects"]
+    for project in range(rng.randint(1, 3)):
+        bullet = f"- Open-source {rng.choice(_OBJECTS)} in {rng.choice(_TECH)} with {rng.randint(1, 9)}k stars"
+        lines.append(bullet)
+        bullets.append(bullet[2:])
+    return "\n".join(lines), bullets
+
+def _normalize(text):
+    return " ".join(text.split())
+
+def _window(chunk, tokenizer, limit):
+    """The part of a chunk the model actually embeds"""
+    offsets = [o for o in tokenizer.encode(chunk, add_special_tokens=False).offsets if o[1] > o[0]]
+    return chunk if len(offsets) <= limit else chunk[:offsets[limit - 1][1]]
+
+def _word_window_spans(text, size, overlap):
+    """Character spans of chunk_text's word windows in the original text"""
+    words = [m.span() for m in re.finditer(r"\S+", text)]
+    return [(words[i][0], words[min(i + size, len(words)) - 1][1]) for i in range(0, len(words), size - overlap)]
+
+def _headings(text):
+    return [m.start(1) for m in re.finditer(r"^[ \t]*(\S[^\n]*)", text, re.M) if is_heading(m.group(1))]
+
+def _check_nesting(texts, tokenizer):
+    """No chunk may sit inside the previous one, whatever the overlap"""
+    for max_tokens, overlap in ((64, 16), (64, 32), (128, 48), (128, 64), (256, 128)):
+        chunks = nested = 0
+        for spans in chunk_spans_batch(texts, max_tokens, overlap, tokenizer=tokenizer):
+            chunks += len(spans)
+            nested += sum(s >= ps and e <= pe for (ps, pe), (s, e) in zip(spans, spans[1:]))
+        print(f"  {max_tokens}/{overlap}: {chunks / len(texts):.1f} chunks per resume, {nested} nested")
+        assert not nested, f"{nested} chunks nested in their predecessor at {max_tokens}/{overlap}"
+
+def _long_bullets(rng):
+    """Resumes whose bullets run past a small window, where nesting used to show up"""
+    texts = []
+    for text, _ in (make_resume(rng) for _ in range(20)):
+        texts.append(re.sub(r"^(• .*)$", lambda m: " ".join([m.group(1)] * 6), text, flags=re.M))
+    return texts
+
+def _quality(name, texts, bullets, chunk_lists, span_lists, tokenizer, limit, rng):
+    token_counts, embedded, total, split, straddle = [], 0, 0, 0, 0
+    windows = []
+    for text, chunks, spans, resume_bullets in zip(texts, chunk_lists, span_lists, bullets):
+        total += len(tokenizer.encode(text, add_special_tokens=False).ids)
+        headings = _headings(text)
+        seen = []
+        for chunk, (start, end) in zip(chunks, spans):
+            count = len(tokenizer.encode(chunk, add_special_tokens=False).ids)
+            token_counts.append(count)
+            windows.append(_window(chunk, tokenizer, limit))
+            seen.append(_normalize(windows[-1]))
+            straddle += any(start < position < end for position in headings)
+        embedded_text = " ".join(seen)
+        embedded += len(tokenizer.encode(embedded_text, add_special_tokens=False).ids)
+        split += sum(not any(b in s for s in seen) for b in map(_normalize, resume_bullets))
+
+    # Old chunks overlap, so "embedded" can exceed the text; clamp the loss at 0
+    lost = max(0.0, 1 - embedded / total)
+    counts = np.array(token_counts)
+
+    hits1 = hits3 = queries = 0
+    offset = 0
+    vectors = embed_texts(windows)
+    for chunks, resume_bullets in zip(chunk_lists, bullets):
+        resume_vectors = vectors[offset:offset + len(chunks)]
+        resume_windows = [_normalize(w) for w in windows[offset:offset + len(chunks)]]
+        offset += len(chunks)
+        for bullet in rng.sample(resume_bullets, min(QUERIES_PER_RESUME, len(resume_bullets))):
+            query = embed_texts([re.sub(r"^\w+ the ", "", bullet)])[0]
+            order = np.argsort(-(resume_vectors @ query))
+            target = _normalize(bullet)
+            hits1 += target in resume_windows[order[0]]
+            hits3 += any(target in resume_windows[i] for i in order[:3])
+            queries += 1
+
+    print(f"{name:>10} {len(counts) / len(texts):>7.1f} {counts.mean():>7.0f} {counts.max():>6} "
+          f"{(counts > limit).mean():>8.1%} {lost:>8.1%} {split / sum(map(len, bullets)):>8.1%} "
+          f"{straddle / len(counts):>9.1%} {hits1 / queries:>6.1%} {hits3 / queries:>6.1%}")
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tokenizer", help="tokenizer.json to count tokens with")
+    args = parser.parse_args()
+
+    if args.tokenizer:
+        from tokenizers import Tokenizer
+        tokenizer = Tokenizer.from_file(args.tokenizer)
+        tokenizer.no_truncation()
+        tokenizer.no_padding()
+    else:
+        tokenizer = get_tokenizer()
+        if tokenizer is None:
+            raise SystemExit("The embedder has no fast tokenizer; pass --tokenizer")
+    limit = max_seq_length() - 2
+
+    rng = random.Random(0)
+    resumes = [make_resume(rng) for _ in range(RESUMES)]
+    texts = [text for text, _ in resumes]
+    bullets = [b for _, b in resumes]
+    words = sum(len(t.split()) for t in texts)
+    tokens = sum(len(e.ids) for e in tokenizer.encode_batch(texts, add_special_tokens=False))
+    print(f"{RESUMES} resumes, {words / RESUMES:.0f} words / {tokens / RESUMES:.0f} tokens each "
+          f"({tokens / words:.2f} tokens/word), model window {limit} tokens")
+
+    def timed(fn):
+        start = time.perf_counter()
+        for _ in range(3):
+            result = fn()
+        return result, 3 * RESUMES / (time.perf_counter() - start)
+
+    old, old_rate = timed(lambda: [chunk_text(t, **OLD) for t in texts])
+    single, single_rate = timed(lambda: [chunk_spans(t, tokenizer=tokenizer) for t in texts])
+    spans, batch_rate = timed(lambda: chunk_spans_batch(texts, tokenizer=tokenizer))
+    assert spans == single
+    new = [[text[s:e] for s, e in resume_spans] for text, resume_spans in zip(texts, spans)]
+    print(f"throughput: word windows {old_rate:.0f}/s, token-aware {single_rate:.0f}/s per text, "
+          f"{batch_rate:.0f}/s batched")
+
+    print("nesting check (long bullets):")
+    long_texts = _long_bullets(random.Random(2))
+    _check_nesting(long_texts, tokenizer)
+    _check_nesting(long_texts, WordTokenizer())
+
+    print(f"{'chunker':>10} {'chunks':>7} {'tokens':>7} {'max':>6} {'>window':>8} {'lost':>8} "
+          f"{'cut bul.':>8} {'straddle':>9} {'hit@1':>6} {'hit@3':>6}")
+    old_spans = [_word_window_spans(text, **OLD) for text in texts]
+    _quality("words", texts, bullets, old, old_spans, tokenizer, limit, random.Random(1))
+    _quality("tokens", texts, bullets, new, spans, tokenizer, limit, random.Random(1))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Embedding throughput with and without micro-batching.
+
+Simulates N concurrent analyses, each embedding a resume-sized request
+(CHUNKS_PER_REQUEST texts) in a loop. "direct" runs embed_texts per request
+in a thread pool (one model call per request); "batched" goes through the
+shared EmbeddingBatcher. Needs the sentence-transformers model (CPU is fine).
+
+    python -m benchmarks.bench_embed_batcher
+"""
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from backend.services.embeddings import embed_texts
+from backend.services.embed_batcher import EmbeddingBatcher
+
+CHUNKS_PER_REQUEST = 5
+REQUESTS_PER_CLIENT = 8
+
+def _request_texts(client, i):
+    return [
+        f"Client {client} request {i} chunk {c}: built data pipelines in Python, "
+        f"deployed services with Docker and Kubernetes, and led a team of {c + 2} engineers."
+        for c in range(CHUNKS_PER_REQUEST)
+    ]
+
+async def _run(label, embed, clients):
+    async def client(c):
+        latencies = []
+        for i in range(REQUESTS_PER_CLIENT):
+            start = time.perf_counter()
+            await embed(_request_texts(c, i))
+            latencies.append(time.perf_counter() - start)
+        return latencies
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(client(c) for c in range(clients)))
+    elapsed = time.perf_counter() - start
+    latencies = sorted(l for r in results for l in r)
+    texts = clients * REQUESTS_PER_CLIENT * CHUNKS_PER_REQUEST
+    print(f"{label:>8} clients={clients:<3} {texts / elapsed:8.1f} texts/s   "
+          f"p50 {latencies[len(latencies) // 2] * 1000:7.1f} ms   "
+          f"p95 {latencies[int(len(latencies) * 0.95)] * 1000:7.1f} ms")
+
+async def main(client_counts=(1, 8, 32)):
+    embed_texts(["warm up"])
+    pool = ThreadPoolExecutor(max_workers=32)
+    loop = asyncio.get_running_loop()
+
+    async def direct(texts):
+        return await loop.run_in_executor(pool, embed_texts, texts)
+
+    for clients in client_counts:
+        batcher = EmbeddingBatcher()
+        await _run("direct", direct, clients)
+        await _run("batched", batcher.embed, clients)
+        print(f"{'':>8} batcher: {batcher.stats()}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
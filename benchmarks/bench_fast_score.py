@@ -0,0 +1,82 @@
+"""Requests/sec of /analyze mode=fast vs the LLM path.
+
+Starts benchmarks.stub_llm_server (STUB_LLM_DELAY seconds per call,
+default 0.5; the real API takes seconds), then runs analyze_resume_bytes
+on fresh synthetic resumes against one JD with bounded concurrency, in
+fast mode and in LLM mode (refresh=True). Each path gets its own resumes
+so neither reuses the other's cached embeddings. Caches live in a
+throwaway directory.
+
+    python -m benchmarks.bench_fast_score [--requests 64] [--concurrency 8]
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+import numpy as np
+
+JOB = """Senior Backend Engineer
+Requirements:
+- 5+ years building services in Python or Go
+- Kafka, PostgreSQL and Redis in production
+- Kubernetes and Terraform on AWS
+Nice to have: Spark, gRPC, Elasticsearch"""
+
+async def _run(label, texts, mode, concurrency):
+    from backend.services.pipeline import analyze_resume_bytes
+
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(text):
+        async with semaphore:
+            start = time.perf_counter()
+            result = await analyze_resume_bytes(text.encode(), JOB, refresh=True, mode=mode)
+            latencies.append(time.perf_counter() - start)
+            return result["score"]
+
+    start = time.perf_counter()
+    scores = await asyncio.gather(*(one(t) for t in texts))
+    elapsed = time.perf_counter() - start
+    p50, p95 = np.percentile(latencies, [50, 95]) * 1000
+    print(f"{label:>5}: {len(texts) / elapsed:8.1f} req/s   p50 {p50:8.1f} ms   p95 {p95:8.1f} ms   "
+          f"scores {min(scores)}-{max(scores)}")
+    return len(texts) / elapsed
+
+async def main(requests, concurrency):
+    from benchmarks.bench_chunker import make_resume
+    from backend.services.llm import close_async_clients
+
+    rng = random.Random(0)
+    texts = [make_resume(rng)[0] for _ in range(2 * requests + 2)]
+    # Load the model and open the pooled connection outside the timings
+    await _run("warm", texts[-2:], "llm", 2)
+    print(f"{requests} requests, concurrency {concurrency}, stub LLM delay "
+          f"{float(os.getenv('STUB_LLM_DELAY', '0.5')):.2f}s")
+    fast = await _run("fast", texts[:requests], "fast", concurrency)
+    llm = await _run("llm", texts[requests:2 * requests], "llm", concurrency)
+    print(f"fast mode: {fast / llm:.1f}x the requests/sec")
+    await close_async_clients()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=64)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    from benchmarks.bench_llm_concurrency import _start_stub_server
+
+    port = _start_stub_server()
+    with tempfile.TemporaryDirectory() as tmp:
+        # config is read at import time, so set everything first
+        os.environ["GROQ_API_KEY"] = "stub"
+        os.environ["GROQ_BASE_URL"] = f"http://127.0.0.1:{port}"
+        os.environ["RESULT_CACHE_MAX_ITEMS"] = "0"
+        for name, file in (("EMBED_CACHE_PATH", "embedding_cache.sqlite3"),
+                           ("TEXT_CACHE_PATH", "text_cache.sqlite3"),
+                           ("INDEX_CACHE_DIR", "resume_index"),
+                           ("SKILL_INDEX_DIR", "skills")):
+            os.environ[name] = os.path.join(tmp, file)
+        asyncio.run(main(args.requests, args.concurrency))
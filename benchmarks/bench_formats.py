@@ -0,0 +1,110 @@
+"""Text extraction throughput per resume format: PDF, DOCX, HTML and TXT.
+
+Renders the same synthetic resume (a few hundred lines of sections and
+bullets) in each format, checks the extracted text covers it, then times
+sequential extractions through ``extract_text`` on the default engine and
+reports documents/s and input MB/s.
+
+    python -m benchmarks.bench_formats
+"""
+import asyncio
+import html
+import io
+import time
+import zipfile
+import fitz
+
+SECTIONS = 20
+BULLETS = 12
+REPEATS = 50
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '</Types>'
+)
+_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Target="word/document.xml" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"/>'
+    '</Relationships>'
+)
+
+def resume_lines():
+    lines = ["Jane Doe", "Senior Software Engineer"]
+    for s in range(SECTIONS):
+        lines.append(f"Experience {s}: Example Corp")
+        for b in range(BULLETS):
+            lines.append(f"- Built Python services on Kubernetes and AWS, cut latency {b + 10}% (project {s}.{b})")
+    return lines
+
+def make_txt(lines):
+    return "\n".join(lines).encode()
+
+def make_html(lines):
+    body = "".join(
+        f"<li>{html.escape(line[2:])}</li>" if line.startswith("- ") else f"<h2>{html.escape(line)}</h2>"
+        for line in lines
+    )
+    return (f"<!DOCTYPE html><html><head><title>Resume</title><style>li {{margin: 0}}</style></head>"
+            f"<body><ul>{body}</ul><script>var x = 1;</script></body></html>").encode()
+
+def make_docx(lines):
+    ns = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+    paragraphs = "".join(
+        f'<w:p><w:r><w:rPr><w:b/></w:rPr><w:t xml:space="preserve">{html.escape(line)}</w:t></w:r></w:p>'
+        for line in lines
+    )
+    document = (f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                f'<w:document xmlns:w="{ns}"><w:body>{paragraphs}</w:body></w:document>')
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("[Content_Types].xml", _CONTENT_TYPES)
+        archive.writestr("_rels/.rels", _RELS)
+        archive.writestr("word/document.xml", document)
+    return buffer.getvalue()
+
+def make_pdf(lines):
+    doc = fitz.open()
+    per_page = 60
+    for start in range(0, len(lines), per_page):
+        page = doc.new_page()
+        page.insert_textbox(fitz.Rect(40, 40, 560, 800), "\n".join(lines[start:start + per_page]), fontsize=8)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+async def _measure(documents, expected):
+    from backend.services.parser import extract_text, shutdown_parser
+
+    print(f"{'format':>6} {'KB':>8} {'ms/doc':>8} {'docs/s':>8} {'MB/s':>8} {'lines found':>12}")
+    for fmt, data in documents.items():
+        text = await extract_text(data)
+        found = sum(line in text for line in expected) / len(expected)
+        start = time.perf_counter()
+        for _ in range(REPEATS):
+            await extract_text(data)
+        elapsed = (time.perf_counter() - start) / REPEATS
+        print(f"{fmt:>6} {len(data) / 1024:>8.1f} {elapsed * 1000:>8.2f} {1 / elapsed:>8.0f} "
+              f"{len(data) / 2**20 / elapsed:>8.1f} {found:>12.0%}")
+    shutdown_parser()
+
+def main():
+    lines = resume_lines()
+    documents = {
+        "pdf": make_pdf(lines),
+        "docx": make_docx(lines),
+        "html": make_html(lines),
+        "txt": make_txt(lines),
+    }
+    # Bullets lose their "- " marker in HTML, so compare the bullet text only
+    expected = [line[2:] if line.startswith("- ") else line for line in lines]
+    asyncio.run(_measure(documents, expected))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Dense-only vs hybrid (BM25 + dense, reciprocal rank fusion) chunk retrieval.
+
+Builds synthetic resumes (benchmarks.bench_chunker) and plants one bullet
+per resume with a rare, exact term of the kind ATS matching hinges on
+("SOC 2", "HIPAA", "CKA"). Two query sets, phrased like JD requirement
+lines:
+
+- keyword: names the planted term, e.g. "Hands-on SOC 2 audit work"
+- topical: names a project and a technology from a random bullet
+
+A query is a hit when a returned chunk contains the target bullet.
+Reports recall@1, recall@3 and MRR per mode, and the latency of the
+BM25 ranking alone and of a full search_many call (JD + requirement
+lines, as the pipeline issues it). Scored with the configured embedder.
+
+    python -m benchmarks.bench_hybrid
+"""
+import random
+import re
+import time
+import numpy as np
+from benchmarks.bench_chunker import make_resume, _OBJECTS, _TECH
+from backend.services.chunker import chunk_resume
+from backend.services.embeddings import embed_texts
+from backend.services.retriever import create_index, search_many, _get_entry
+
+RESUMES = 200
+K = 3
+
+# (bullet planted in the resume, requirement line asking for it)
+_RARE = [
+    ("Led the SOC 2 Type II audit for the platform team", "Hands-on SOC 2 audit work"),
+    ("Kept patient records HIPAA compliant across 4 clinics", "HIPAA compliance experience"),
+    ("Passed the CKA exam and ran cluster upgrades", "CKA certification preferred"),
+    ("Wrote PCI DSS controls for card tokenization", "Familiarity with PCI DSS controls"),
+    ("Tuned JVM garbage collection with ZGC on 64 GB heaps", "JVM tuning, ZGC a plus"),
+    ("Shipped GDPR data-deletion flows for EU users", "GDPR requirements in product work"),
+    ("Built FedRAMP-ready logging for public sector tenants", "FedRAMP experience"),
+    ("Migrated reporting jobs from COBOL batch to Python", "COBOL migration background"),
+]
+
+def _with_rare(rng):
+    text, bullets = make_resume(rng)
+    bullet, query = rng.choice(_RARE)
+    lines = text.split("\n")
+    position = lines.index("Skills") - 1
+    lines.insert(position, f"• {bullet}")
+    return "\n".join(lines), bullets + [bullet], (bullet, query)
+
+def _topical(rng, bullets):
+    bullet = rng.choice([b for b in bullets if any(o in b for o in _OBJECTS)])
+    obj = next(o for o in _OBJECTS if o in bullet)
+    tech = rng.choice([t for t in _TECH if re.search(rf"\b{re.escape(t)}\b", bullet)])
+    return bullet, f"Experience building a {obj} with {tech}"
+
+def _normalize(text):
+    return " ".join(text.split())
+
+def _evaluate(name, cases):
+    hits1 = hits3 = rr = 0.0
+    latencies = []
+    for key, query, vector, bullet in cases:
+        start = time.perf_counter()
+        results = search_many(vector[None, :], key, k=K, query_texts=[query], retrieval=name)[0]
+        latencies.append(time.perf_counter() - start)
+        target = _normalize(bullet)
+        ranks = [i for i, chunk in enumerate(results) if target in _normalize(chunk)]
+        hits1 += bool(ranks) and ranks[0] == 0
+        hits3 += bool(ranks)
+        rr += 1 / (ranks[0] + 1) if ranks else 0
+    n = len(cases)
+    return hits1 / n, hits3 / n, rr / n, np.median(latencies) * 1e3
+
+def main():
+    rng = random.Random(0)
+    resumes = [_with_rare(rng) for _ in range(RESUMES)]
+    chunk_lists = [chunk_resume(text) for text, _, _ in resumes]
+    vectors = embed_texts([chunk for chunks in chunk_lists for chunk in chunks])
+
+    keys, offset = [], 0
+    for (text, _, _), chunks in zip(resumes, chunk_lists):
+        keys.append(create_index(vectors[offset:offset + len(chunks)], chunks, text))
+        offset += len(chunks)
+    print(f"{RESUMES} resumes, {offset / RESUMES:.1f} chunks each, top {K}")
+
+    keyword = [(key, query, bullet) for key, (_, _, (bullet, query)) in zip(keys, resumes)]
+    topical = [(key, *reversed(_topical(rng, bullets))) for key, (_, bullets, _) in zip(keys, resumes)]
+    print(f"{'queries':>8} {'mode':>7} {'recall@1':>9} {'recall@3':>9} {'MRR':>6} {'ms/query':>9}")
+    for label, cases in (("keyword", keyword), ("topical", topical)):
+        query_vectors = embed_texts([query for _, query, _ in cases])
+        cases = [(key, query, vector, bullet) for (key, query, bullet), vector in zip(cases, query_vectors)]
+        for mode in ("dense", "hybrid"):
+            r1, r3, mrr, ms = _evaluate(mode, cases)
+            print(f"{label:>8} {mode:>7} {r1:>9.1%} {r3:>9.1%} {mrr:>6.3f} {ms:>9.3f}")
+
+    # BM25 alone, and a pipeline-sized call: whole JD plus 16 requirement lines
+    sparse = _get_entry(keys[0])[2]
+    queries = [query for _, query in _RARE] * 2 + ["Senior Backend Engineer " * 40]
+    query_vectors = embed_texts(queries)
+    for label, fn in (
+        ("BM25 rank, 1 query", lambda: sparse.rank(queries[0], 20)),
+        ("search_many dense, 17 queries", lambda: search_many(query_vectors, keys[0], k=K, retrieval="dense")),
+        ("search_many hybrid, 17 queries",
+         lambda: search_many(query_vectors, keys[0], k=K, query_texts=queries, retrieval="hybrid")),
+    ):
+        fn()
+        start = time.perf_counter()
+        for _ in range(200):
+            fn()
+        print(f"{label:>32}: {(time.perf_counter() - start) / 200 * 1e3:.3f} ms")
+
+if __name__ == "__main__":
+    main()
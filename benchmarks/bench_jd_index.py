@@ -0,0 +1,100 @@
+"""Recall vs latency of the JD corpus ANN indexes against exact (flat) search.
+
+Builds a synthetic corpus of normalized vectors drawn around cluster
+centres (real JD embeddings are clustered by role, which is what IVF
+and HNSW rely on; uniform random vectors would understate both), then
+runs /recommend-shaped queries: a "resume" of 20 chunk vectors near one
+cluster, top-k jobs by best chunk match, through JDCorpus.search. For
+HNSW (efSearch sweep) and IVF-PQ (nprobe sweep) it reports recall@k
+against the flat index, median latency per resume, build time and
+index size; then IVF-PQ re-ranked with exact vectors (JD_PQ_REFINE).
+
+    python -m benchmarks.bench_jd_index [--n 200000] [--k 20]
+"""
+import argparse
+import time
+import numpy as np
+
+DIM = 384
+CLUSTERS = 2000
+RESUMES = 100
+CHUNKS = 20
+
+def _normalize(x):
+    return (x / np.linalg.norm(x, axis=1, keepdims=True)).astype(np.float32)
+
+def make_corpus(n, rng):
+    centres = rng.standard_normal((CLUSTERS, DIM)).astype(np.float32)
+    labels = rng.integers(0, CLUSTERS, n)
+    vectors = _normalize(centres[labels] + 0.9 * rng.standard_normal((n, DIM)).astype(np.float32))
+    queries = []
+    for label in rng.integers(0, CLUSTERS, RESUMES):
+        queries.append(_normalize(centres[label] + 1.1 * rng.standard_normal((CHUNKS, DIM)).astype(np.float32)))
+    return vectors, queries
+
+def _build(index_type, vectors, records):
+    from backend.services.jd_corpus import JDCorpus
+
+    corpus = JDCorpus(index_path="/dev/null", meta_dir="/dev/null", index_type=index_type)
+    start = time.perf_counter()
+    corpus.add_vectors(vectors, records, log=False)
+    corpus.merge()
+    return corpus, time.perf_counter() - start
+
+def _measure(corpus, queries, k, truth):
+    latencies, recalls = [], []
+    for query, expected in zip(queries, truth):
+        start = time.perf_counter()
+        found = corpus.search(query, k)
+        latencies.append(time.perf_counter() - start)
+        recalls.append(len({job["id"] for job in found} & expected) / len(expected))
+    return np.mean(recalls), np.median(latencies) * 1000
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, default=200000)
+    parser.add_argument("--k", type=int, default=20)
+    args = parser.parse_args()
+
+    import faiss
+
+    rng = np.random.default_rng(0)
+    vectors, queries = make_corpus(args.n, rng)
+    records = [{"id": str(i), "text": "-"} for i in range(args.n)]
+    print(f"{args.n} JDs x {DIM} dims, {RESUMES} resumes of {CHUNKS} chunks, top {args.k}, "
+          f"{faiss.omp_get_max_threads()} threads")
+
+    flat, seconds = _build("flat", vectors, records)
+    truth = [{job["id"] for job in flat.search(query, args.k)} for query in queries]
+    _, latency = _measure(flat, queries, args.k, truth)
+    print(f"{'index':>8} {'param':>12} {'recall@k':>9} {'ms/resume':>10} {'build s':>8} {'MB':>8}")
+    size = len(faiss.serialize_index(flat.index)) / 2**20
+    print(f"{'flat':>8} {'-':>12} {1:>9.3f} {latency:>10.2f} {seconds:>8.1f} {size:>8.1f}")
+    del flat
+
+    for index_type, param, values in (("hnsw", "efSearch", (16, 32, 64, 128, 256)),
+                                      ("ivfpq", "nprobe", (4, 8, 16, 32, 64))):
+        corpus, seconds = _build(index_type, vectors, records)
+        size = len(faiss.serialize_index(corpus.index)) / 2**20
+        for value in values:
+            if index_type == "hnsw":
+                corpus.index.hnsw.efSearch = value
+            else:
+                corpus.index.nprobe = value
+            recall, latency = _measure(corpus, queries, args.k, truth)
+            print(f"{index_type:>8} {f'{param}={value}':>12} {recall:>9.3f} {latency:>10.2f} "
+                  f"{seconds:>8.1f} {size:>8.1f}")
+        if index_type == "ivfpq":
+            ivf = corpus.index
+            ivf.nprobe = 16
+            for k_factor in (2, 4, 8):
+                corpus.index = faiss.IndexRefineFlat(ivf, faiss.swig_ptr(vectors))
+                corpus.index.k_factor = k_factor
+                recall, latency = _measure(corpus, queries, args.k, truth)
+                size = len(faiss.serialize_index(corpus.index)) / 2**20
+                print(f"{'+refine':>8} {f'k_factor={k_factor}':>12} {recall:>9.3f} {latency:>10.2f} "
+                      f"{'-':>8} {size:>8.1f}")
+        del corpus
+
+if __name__ == "__main__":
+    main()
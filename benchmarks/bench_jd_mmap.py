@@ -0,0 +1,113 @@
+"""Per-worker memory of the JD corpus with and without JD_MMAP.
+
+Builds a corpus of ``--n`` synthetic JDs (benchmarks.bench_jd_index
+vectors, 300-character snippets) in a temporary directory, then starts
+``--workers`` processes the way uvicorn workers would each load it. Every
+worker loads the corpus and runs /recommend-shaped searches and record
+lookups. Once all of them are up, each reports what the corpus added to
+its memory:
+
+- RssAnon: private memory, paid once per worker
+- RssFile: file pages mapped, shared through the page cache
+- PSS: proportional set size, shared pages divided among the processes
+  that map them; the PSS sum is what the node actually pays
+
+    python -m benchmarks.bench_jd_mmap [--n 100000] [--workers 8]
+"""
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import numpy as np
+
+def _memory():
+    """(RssAnon, RssFile, Pss) of this process in MB"""
+    fields = {}
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith(("RssAnon:", "RssFile:")):
+                fields[line.split(":")[0]] = int(line.split()[1]) / 1024
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            if line.startswith("Pss:"):
+                fields["Pss"] = int(line.split()[1]) / 1024
+    return np.array([fields["RssAnon"], fields["RssFile"], fields["Pss"]])
+
+def worker(workdir):
+    """One worker: load, search, report, wait for the parent, report again"""
+    import faiss  # noqa: F401  (libraries are not the corpus's memory)
+    from backend.services.jd_corpus import JDCorpus
+    from benchmarks.bench_jd_index import make_corpus
+
+    _, queries = make_corpus(1, np.random.default_rng(int.from_bytes(os.urandom(4), "little")))
+    before = _memory()
+    start = time.perf_counter()
+    corpus = JDCorpus(os.path.join(workdir, "faiss_index"), os.path.join(workdir, "jd_meta")).load()
+    load_seconds = time.perf_counter() - start
+    for query in queries:
+        corpus.search(query, 20)
+    for row in np.random.default_rng(0).integers(0, len(corpus), 5000):
+        corpus.record(int(row))
+    print(f"ready {load_seconds:.3f}", flush=True)
+    sys.stdin.readline()  # every worker is loaded
+    print(" ".join(f"{x:.1f}" for x in _memory() - before), flush=True)
+    sys.stdin.readline()
+
+def _run_workers(workdir, n_workers, mmap):
+    env = dict(os.environ, JD_MMAP="true" if mmap else "false")
+    procs = [subprocess.Popen([sys.executable, "-m", "benchmarks.bench_jd_mmap", "--worker", workdir],
+                              stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True, env=env)
+             for _ in range(n_workers)]
+    loads = [float(p.stdout.readline().split()[1]) for p in procs]
+    usage = []
+    for p in procs:
+        p.stdin.write("\n")
+        p.stdin.flush()
+        usage.append([float(x) for x in p.stdout.readline().split()])
+    for p in procs:
+        p.stdin.write("\n")
+        p.stdin.flush()
+        p.wait()
+    return np.median(loads), np.array(usage)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, default=100000)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.worker:
+        return worker(args.worker)
+
+    from backend.services.jd_corpus import JDCorpus
+    from benchmarks.bench_jd_index import make_corpus
+
+    rng = np.random.default_rng(0)
+    vectors, _ = make_corpus(args.n, rng)
+    words = np.array("python kubernetes backend engineer remote senior data platform team build "
+                     "services customers cloud product design scale".split())
+    records = [{"id": f"job-{i}", "title": f"Engineer {i}", "company": "Acme", "location": "Remote",
+                "text": " ".join(rng.choice(words, 45))} for i in range(args.n)]
+    workdir = tempfile.mkdtemp(prefix="jd_mmap_")
+    try:
+        corpus = JDCorpus(os.path.join(workdir, "faiss_index"), os.path.join(workdir, "jd_meta")).load()
+        corpus.commit(lambda c: c.add_vectors(vectors, records))
+        corpus.compact()
+        del corpus
+        size = sum(os.path.getsize(os.path.join(root, f)) for root, _, files in os.walk(workdir) for f in files
+                   if ".log" not in f) / 2**20
+        print(f"{args.n} JDs, {size:.0f} MB of base files, {args.workers} workers")
+        print(f"{'JD_MMAP':>8} {'load s':>7} {'RssAnon':>8} {'RssFile':>8} {'PSS':>7} {'PSS sum':>8}  (MB per worker)")
+        for mmap in (False, True):
+            load_seconds, usage = _run_workers(workdir, args.workers, mmap)
+            anon, file, pss = usage.mean(axis=0)
+            print(f"{str(mmap).lower():>8} {load_seconds:>7.3f} {anon:>8.1f} {file:>8.1f} {pss:>7.1f} "
+                  f"{usage[:, 2].sum():>8.1f}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Ingest throughput, load time and compaction of the JD corpus WAL.
+
+Works on pre-embedded synthetic vectors (benchmarks.bench_jd_index), so
+the numbers are storage costs only; embedding dominates real ingestion.
+In a temporary directory it:
+
+- bulk-loads ``--n`` JDs through the WAL and compacts them into a base
+  generation (JD_INDEX_TYPE)
+- appends batches of ``--batch`` JDs through commit() (WAL append plus
+  fsync, JD_WAL_FSYNC) and compares that with rewriting the whole
+  generation per batch, which is what an update cost before the WAL
+- loads the corpus with an empty WAL and with ``--delta`` JDs to replay,
+  and times /recommend-shaped searches with and without the delta segment
+- compacts the delta into a new generation
+- appends a torn record and checks that a load recovers every complete one
+
+    python -m benchmarks.bench_jd_persistence [--n 50000] [--batch 100] [--delta 10000]
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+import numpy as np
+from benchmarks.bench_jd_index import make_corpus, RESUMES
+from backend.services.jd_corpus import JDCorpus
+
+def _records(first, n):
+    return [{"id": f"j{i}", "title": f"Job {i}", "company": "Acme", "location": "Remote",
+             "text": f"Synthetic job description number {i}"} for i in range(first, first + n)]
+
+def _search_ms(corpus, queries, k=20):
+    start = time.perf_counter()
+    for query in queries:
+        corpus.search(query, k)
+    return (time.perf_counter() - start) / len(queries) * 1e3
+
+def _disk_mb(directory):
+    return sum(os.path.getsize(os.path.join(root, f)) for root, _, files in os.walk(directory) for f in files) / 2**20
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, default=50000)
+    parser.add_argument("--batch", type=int, default=100)
+    parser.add_argument("--delta", type=int, default=10000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    vectors, queries = make_corpus(args.n + args.delta, rng)
+    workdir = tempfile.mkdtemp(prefix="jd_corpus_")
+    paths = dict(index_path=os.path.join(workdir, "faiss_index"), meta_dir=os.path.join(workdir, "jd_meta"))
+    try:
+        corpus = JDCorpus(**paths).load()
+        start = time.perf_counter()
+        for first in range(0, args.n, 10000):
+            n = min(10000, args.n - first)
+            corpus.commit(lambda c: c.add_vectors(vectors[first:first + n], _records(first, n)))
+        wal_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        corpus.compact()
+        compact_seconds = time.perf_counter() - start
+        print(f"{args.n} JDs, {corpus.stats()['index_type']}, {RESUMES} resumes per search timing")
+        print(f"bulk load: WAL {args.n / wal_seconds:,.0f} JDs/s, first compaction {compact_seconds:.1f}s, "
+              f"generation {_disk_mb(workdir):.0f} MB on disk")
+
+        # Small online updates: WAL append vs rewriting the generation
+        batches = 20
+        latencies = []
+        for b in range(batches):
+            first = args.n + b * args.batch
+            start = time.perf_counter()
+            corpus.commit(lambda c: c.add_vectors(vectors[first:first + args.batch], _records(first, args.batch)))
+            latencies.append(time.perf_counter() - start)
+        append_ms = np.median(latencies) * 1e3
+        start = time.perf_counter()
+        corpus._write_base(corpus.generation + 1)
+        rewrite_ms = (time.perf_counter() - start) * 1e3
+        print(f"update of {args.batch} JDs: WAL append {append_ms:.1f} ms ({args.batch / append_ms * 1e3:,.0f} JDs/s), "
+              f"full rewrite {rewrite_ms:.0f} ms ({args.batch / rewrite_ms * 1e3:,.0f} JDs/s), "
+              f"{rewrite_ms / append_ms:.0f}x")
+        corpus.clear()  # drop the rewrite's files and start the delta over
+
+        corpus = JDCorpus(**paths).load()
+        corpus.commit(lambda c: c.add_vectors(vectors[:args.n], _records(0, args.n)))
+        corpus.compact()
+        start = time.perf_counter()
+        fresh = JDCorpus(**paths).load()
+        base_load = time.perf_counter() - start
+        base_search = _search_ms(fresh, queries)
+
+        first = args.n
+        corpus.commit(lambda c: c.add_vectors(vectors[first:first + args.delta], _records(first, args.delta)))
+        start = time.perf_counter()
+        fresh = JDCorpus(**paths).load()
+        replay_load = time.perf_counter() - start
+        delta_search = _search_ms(fresh, queries)
+        wal_mb = fresh.stats()["wal_bytes"] / 2**20
+        print(f"load: base only {base_load:.2f}s, base + {args.delta} WAL JDs ({wal_mb:.0f} MB) {replay_load:.2f}s")
+        print(f"search: base only {base_search:.2f} ms/resume, with {args.delta}-row delta {delta_search:.2f} ms/resume")
+
+        start = time.perf_counter()
+        fresh.compact()
+        print(f"compaction of {args.delta} delta rows into {args.n}: {time.perf_counter() - start:.1f}s, "
+              f"then {_search_ms(fresh, queries):.2f} ms/resume")
+
+        # Crash mid-append: half a record at the end of the log
+        fresh.commit(lambda c: c.add_vectors(vectors[:args.batch], _records(10**9, args.batch)))
+        wal = fresh._wal_path(fresh.generation)
+        with open(wal, "rb") as f:
+            record = f.read()
+        with open(wal, "ab") as f:
+            f.write(record[:len(record) // 2])
+        recovered = JDCorpus(**paths).load()
+        print(f"torn WAL tail: recovered {len(recovered)} of {len(fresh)} JDs")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Event-loop impact of the blocking vs async LLM call.
+
+Starts benchmarks.stub_llm_server on a local port, then issues N concurrent
+analyses through call_llm (blocking, as analyze_resume used to) and through
+call_llm_async, while a ticker task measures how long the event loop stalls.
+
+    python -m benchmarks.bench_llm_concurrency
+"""
+import asyncio
+import os
+import socket
+import threading
+import time
+
+def _start_stub_server():
+    import uvicorn
+    from benchmarks.stub_llm_server import app
+
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(app, port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return port
+
+async def _ticker(stop, lags):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0.01)
+        lags.append(time.perf_counter() - start - 0.01)
+
+async def _run(label, call, n):
+    stop, lags = asyncio.Event(), []
+    ticker = asyncio.create_task(_ticker(stop, lags))
+    start = time.perf_counter()
+    await asyncio.gather(*(call() for _ in range(n)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await ticker
+    print(f"{label:>6} x{n:<3} wall {elapsed:6.2f}s   max loop stall {max(lags, default=0) * 1000:7.1f} ms")
+
+async def main(concurrency=(1, 8, 32)):
+    from backend.services.llm import call_llm, call_llm_async, close_async_clients
+
+    async def blocking():
+        return call_llm("prompt")
+
+    async def non_blocking():
+        return await call_llm_async("prompt")
+
+    await non_blocking()  # open the pooled connection
+    for n in concurrency:
+        await _run("sync", blocking, n)
+        await _run("async", non_blocking, n)
+    await close_async_clients()
+
+if __name__ == "__main__":
+    port = _start_stub_server()
+    # config is read at import time, so point it at the stub first
+    os.environ["GROQ_API_KEY"] = "stub"
+    os.environ["GROQ_BASE_URL"] = f"http://127.0.0.1:{port}"
+    asyncio.run(main())
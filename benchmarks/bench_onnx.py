@@ -0,0 +1,105 @@
+"""Torch vs ONNX Runtime (fp32 / int8) embedding backends.
+
+Each backend runs in its own subprocess (so RSS is not shared) and embeds
+the same corpus; the parent reports per-text latency at several batch
+sizes, RSS after loading and at peak, cosine agreement with the torch
+vectors and top-k retrieval agreement.
+
+    python -m benchmarks.bench_onnx
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import numpy as np
+
+BACKENDS = ("torch", "onnx", "onnx-int8")
+BATCH_SIZES = (1, 8, 64)
+TOP_K = 5
+LATENCY_TEXTS = 128
+
+SKILLS = ["Python", "Kubernetes", "AWS", "SQL", "React", "Docker", "Spark", "Go", "Terraform", "Kafka",
+          "PyTorch", "GraphQL", "Java", "CI/CD", "Airflow", "Snowflake", "Rust", "Azure", "Redis", "SOC 2"]
+
+def corpus(n=512):
+    rng = np.random.default_rng(0)
+    texts = []
+    for i in range(n):
+        picked = rng.choice(SKILLS, size=rng.integers(2, 6), replace=False)
+        words = int(rng.integers(5, 120))
+        texts.append(f"Role {i}: worked with {', '.join(picked)}; " + " ".join(
+            rng.choice(["built", "led", "scaled", "designed", "migrated", "pipelines", "services",
+                        "teams", "latency", "reduced", "customers", "platform"], size=words)))
+    return texts
+
+def _memory_mb(field):
+    # VmHWM (peak) is per address space; ru_maxrss would carry over the
+    # parent's peak across fork/exec
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith(field + ":"):
+                return int(line.split()[1]) / 1024
+
+def _worker(backend, out_path):
+    os.environ["EMBED_BACKEND"] = backend
+    from backend.services.embeddings import embed_texts, get_model
+
+    texts = corpus()
+    get_model()
+    embed_texts(texts[:8])  # warm up
+    loaded_mb = _memory_mb("VmRSS")
+
+    # Same texts at every batch size, so ms/text is comparable
+    sample = texts[:LATENCY_TEXTS]
+    latency = {}
+    for size in BATCH_SIZES:
+        start = time.perf_counter()
+        for i in range(0, len(sample), size):
+            embed_texts(sample[i:i + size])
+        latency[size] = (time.perf_counter() - start) / len(sample) * 1000
+
+    vectors = embed_texts(texts)
+    np.save(out_path, vectors)
+    peak_mb = _memory_mb("VmHWM")
+    print(json.dumps({"latency_ms": latency, "loaded_mb": loaded_mb, "peak_mb": peak_mb}))
+
+def main():
+    # Export once up front so the ONNX workers only load the model
+    from backend.services.onnx_embedder import export_onnx
+    export_onnx()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for backend in BACKENDS:
+            out_path = os.path.join(tmp, f"{backend}.npy")
+            proc = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_onnx", "--worker", backend, out_path],
+                capture_output=True, text=True, check=True
+            )
+            stats = json.loads(proc.stdout.strip().splitlines()[-1])
+            stats["vectors"] = np.load(out_path)
+            results[backend] = stats
+
+    reference = results["torch"]["vectors"]
+    queries, docs = reference[:64], reference[64:]
+    ref_top = np.argsort(-(queries @ docs.T), axis=1)[:, :TOP_K]
+
+    header = " ".join(f"{'b=' + str(b):>7}" for b in BATCH_SIZES)
+    print("ms/text per embed_texts call of b texts; RSS in MB after load / peak")
+    print(f"{'backend':>10} {header} {'loaded':>7} {'peak':>6} {'mean cos':>9} {'min cos':>8} {'top-' + str(TOP_K) + ' agree':>11}")
+    for backend, stats in results.items():
+        vectors = stats["vectors"]
+        cos = np.sum(vectors * reference, axis=1)
+        top = np.argsort(-(vectors[:64] @ vectors[64:].T), axis=1)[:, :TOP_K]
+        agree = np.mean([len(set(a) & set(b)) / TOP_K for a, b in zip(top, ref_top)])
+        lat = " ".join(f"{stats['latency_ms'][str(b)]:>7.1f}" for b in BATCH_SIZES)
+        print(f"{backend:>10} {lat} {stats['loaded_mb']:>7.0f} {stats['peak_mb']:>6.0f} "
+              f"{cos.mean():>9.5f} {cos.min():>8.5f} {agree:>11.3f}")
+
+if __name__ == "__main__":
+    if len(sys.argv) == 4 and sys.argv[1] == "--worker":
+        _worker(sys.argv[2], sys.argv[3])
+    else:
+        main()
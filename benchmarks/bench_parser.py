@@ -0,0 +1,70 @@
+"""PDF parse time per engine: thread pool vs process pool (with page ranges).
+
+Builds synthetic text PDFs of several page counts, then for each engine
+parses one document at a time (latency) and CONCURRENT documents at once
+(throughput). Each engine runs in its own subprocess because the parser
+reads its configuration at import.
+
+    python -m benchmarks.bench_parser
+"""
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+import fitz
+
+PAGE_COUNTS = (2, 40, 200)
+CONCURRENT = 8
+ENGINES = {
+    "thread": {"PARSE_ENGINE": "thread"},
+    "process": {"PARSE_ENGINE": "process", "PARSE_PAGES_PER_TASK": "1000000"},
+    "process+pages": {"PARSE_ENGINE": "process", "PARSE_PAGES_PER_TASK": "16"},
+}
+
+def make_pdf(pages):
+    doc = fitz.open()
+    line = "Senior engineer: built Python services, Kubernetes, AWS, data pipelines, led teams. "
+    for p in range(pages):
+        page = doc.new_page()
+        page.insert_textbox(fitz.Rect(40, 40, 560, 800), f"Page {p}. " + line * 30, fontsize=9)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+async def _measure(pdfs):
+    from backend.services.parser import extract_text, shutdown_parser
+
+    await extract_text(pdfs[PAGE_COUNTS[0]])  # start the pool
+    results = {}
+    for pages, data in pdfs.items():
+        start = time.perf_counter()
+        await extract_text(data)
+        single = time.perf_counter() - start
+
+        start = time.perf_counter()
+        await asyncio.gather(*(extract_text(data) for _ in range(CONCURRENT)))
+        concurrent = time.perf_counter() - start
+        results[pages] = {"single_ms": single * 1000, "docs_per_s": CONCURRENT / concurrent}
+    shutdown_parser()
+    return results
+
+def main():
+    print(f"cpus={os.cpu_count()}  concurrent docs={CONCURRENT}")
+    print(f"{'engine':>14} {'pages':>6} {'single ms':>10} {'docs/s':>8}")
+    for engine, env in ENGINES.items():
+        proc = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_parser", "--worker"],
+            env={**os.environ, **env}, capture_output=True, text=True, check=True
+        )
+        results = json.loads(proc.stdout.strip().splitlines()[-1])
+        for pages, stats in results.items():
+            print(f"{engine:>14} {pages:>6} {stats['single_ms']:>10.1f} {stats['docs_per_s']:>8.1f}")
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ["--worker"]:
+        pdfs = {pages: make_pdf(pages) for pages in PAGE_COUNTS}
+        print(json.dumps(asyncio.run(_measure(pdfs))))
+    else:
+        main()
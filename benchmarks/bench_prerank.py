@@ -0,0 +1,31 @@
+"""Stage-one pre-ranking cost for a bulk /rank request.
+
+Uses random normalized vectors so it runs without the embedding model; the
+embed_texts call itself is not included.
+
+    python -m benchmarks.bench_prerank
+"""
+import time
+import numpy as np
+from backend.services.ranker import prerank_scores, top_n
+
+DIM = 384
+
+def main(n_resumes=5000, chunks_per_resume=(2, 10), repeats=20):
+    rng = np.random.default_rng(0)
+    counts = rng.integers(chunks_per_resume[0], chunks_per_resume[1] + 1, n_resumes)
+    vectors = rng.standard_normal((counts.sum(), DIM)).astype("float32")
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    jd = vectors[0]
+
+    for aggregate in ("max", "mean"):
+        start = time.perf_counter()
+        for _ in range(repeats):
+            scores, _ = prerank_scores(vectors, counts, jd, aggregate)
+            top_n(scores, 10)
+        elapsed = (time.perf_counter() - start) / repeats
+        print(f"{aggregate:>4}: {n_resumes} resumes / {counts.sum()} chunks "
+              f"scored in {elapsed * 1000:.2f} ms")
+
+if __name__ == "__main__":
+    main()
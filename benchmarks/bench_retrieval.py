@@ -0,0 +1,60 @@
+"""NumPy vs FAISS flat search latency for per-resume indexes.
+
+Checks that both backends return identical neighbours, then times index
+construction and a single top-k query across chunk counts. A request builds
+the index once and queries it once, so "total" is what SMALL_INDEX_MAX_CHUNKS
+should be tuned on.
+
+    python -m benchmarks.bench_retrieval
+"""
+import time
+import faiss
+import numpy as np
+from backend.services.retriever import NumpyIndex
+
+DIM = 384
+K = 3
+
+def _normalized(rng, n):
+    vectors = rng.standard_normal((n, DIM)).astype("float32")
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+def _time(fn, repeats):
+    fn()  # warm up
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) / repeats * 1e6
+
+def main(chunk_counts=(2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500), repeats=2000):
+    rng = np.random.default_rng(0)
+    print(f"{'chunks':>7} {'search np':>10} {'search faiss':>13} {'build np':>9} "
+          f"{'build faiss':>12} {'total np':>9} {'total faiss':>12}   (microseconds)")
+    for n in chunk_counts:
+        vectors = _normalized(rng, n)
+        queries = _normalized(rng, 64)
+
+        np_index = NumpyIndex(vectors)
+        flat = faiss.IndexFlatIP(DIM)
+        flat.add(vectors)
+
+        for k in (K, n + 2):
+            np_d, np_i = np_index.search(queries, k)
+            fa_d, fa_i = flat.search(queries, k)
+            assert np.allclose(np_d, fa_d, atol=1e-5), f"score mismatch at n={n}, k={k}"
+            # BLAS and FAISS round differently in the last bit, so only
+            # neighbours whose scores are tied to within float noise may swap
+            swapped = np_i != fa_i
+            assert np.all(np.abs(np_d[swapped] - fa_d[swapped]) < 1e-5), \
+                f"neighbour mismatch at n={n}, k={k}"
+
+        query = queries[:1]
+        np_us = _time(lambda: np_index.search(query, K), repeats)
+        fa_us = _time(lambda: flat.search(query, K), repeats)
+        build_np = _time(lambda: NumpyIndex(vectors), repeats)
+        build_fa = _time(lambda: faiss.IndexFlatIP(DIM).add(vectors), repeats)
+        print(f"{n:>7} {np_us:>10.1f} {fa_us:>13.1f} {build_np:>9.1f} {build_fa:>12.1f} "
+              f"{np_us + build_np:>9.1f} {fa_us + build_fa:>12.1f}")
+
+if __name__ == "__main__":
+    main()
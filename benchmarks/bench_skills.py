@@ -0,0 +1,124 @@
+"""Skill-gap engine: extraction speed, batched gaps and accuracy.
+
+Generates synthetic job descriptions from the skill vocabulary (required
+and "nice to have" lines, aliases, filler prose with case traps such as
+"go to market" or "a swift rollout") and one resume per JD that covers a
+random subset of its skills. Reports:
+
+- extraction throughput (JDs/s)
+- gap throughput: one resume against every JD in one ``gaps`` call vs a
+  call per JD, and every resume against one JD
+- precision/recall of the JD skills found, and of the missing skills
+  against the ones left out of the resume
+
+Ground truth is exact (the generator knows what it wrote), so near-synonym
+matching is switched off here (``related`` is the identity). Uses a
+throwaway SKILL_INDEX_DIR.
+
+    python -m benchmarks.bench_skills
+"""
+import random
+import tempfile
+import time
+import numpy as np
+
+JOBS = 5000
+
+_FILLER = [
+    "We move fast and care about craft.",
+    "You will go to market with the product team and help it grow.",
+    "Expect a swift rollout of new features every week.",
+    "Our culture is built on trust, ownership and a bias to action.",
+    "Help us react to customer feedback quickly.",
+    "You will work closely with design, sales and support.",
+    "Competitive salary, equity and a generous learning budget.",
+    "A ruby anniversary party is planned for next spring.",
+]
+
+def make_job(rng, names, vocabulary):
+    """(text, required, optional) with skills spelled as any of their aliases"""
+    picked = rng.sample(names, rng.randint(4, 12))
+    split = max(1, len(picked) * 2 // 3)
+    required, optional = picked[:split], picked[split:]
+
+    def spell(name):
+        return rng.choice((name,) + vocabulary[name])
+
+    lines = [f"Senior Engineer ({rng.choice(['Remote', 'Berlin', 'NYC'])})", rng.choice(_FILLER)]
+    lines.append("Requirements: " + ", ".join(spell(n) for n in required) + ".")
+    lines.append(rng.choice(_FILLER))
+    if optional:
+        lines.append("Nice to have: " + ", ".join(spell(n) for n in optional))
+    lines.append(rng.choice(_FILLER))
+    return "\n".join(lines), required, optional
+
+def make_resume(rng, skills, vocabulary):
+    return "\n".join([
+        "Jane Doe, software engineer",
+        rng.choice(_FILLER),
+        "Skills: " + ", ".join(rng.choice((n,) + vocabulary[n]) for n in skills),
+    ])
+
+def _rate(count, fn, repeats=1):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        result = fn()
+    return result, count * repeats / (time.perf_counter() - start)
+
+def main():
+    from backend.services.skills import SkillIndex, load_vocabulary
+
+    vocabulary = load_vocabulary()
+    names = list(vocabulary)
+    rng = random.Random(0)
+    jobs = [make_job(rng, names, vocabulary) for _ in range(JOBS)]
+    held = [rng.sample(req + opt, rng.randint(0, len(req + opt))) for _, req, opt in jobs]
+    resumes = [make_resume(rng, skills, vocabulary) for skills in held]
+    job_texts = [text for text, _, _ in jobs]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        index = SkillIndex(vocabulary, index_dir=tmp)
+        index._related = np.eye(len(names), dtype=bool)
+        print(f"{len(names)} skills, {len(index._lookup)} spellings, {JOBS} JDs")
+
+        extracted, extract_rate = _rate(JOBS, lambda: [index.extract(t) for t in job_texts])
+        print(f"extraction: {extract_rate:.0f} JDs/s")
+
+        batched, batch_rate = _rate(JOBS, lambda: index.gaps([resumes[0]], job_texts))
+        single, single_rate = _rate(JOBS, lambda: [index.gaps([resumes[0]], [t])[0] for t in job_texts])
+        assert batched == single
+        _, rank_rate = _rate(JOBS, lambda: index.gaps(resumes, [job_texts[0]]))
+        print(f"gaps, 1 resume x {JOBS} JDs: {batch_rate:.0f} pairs/s batched, {single_rate:.0f} pairs/s "
+              f"one call per JD ({batch_rate / single_rate:.1f}x)")
+        print(f"gaps, {JOBS} resumes x 1 JD: {rank_rate:.0f} pairs/s batched")
+
+        # Extraction accuracy: the JD's skills, optional ones at half weight
+        tp = fp = fn = weight_errors = 0
+        for (_, required, optional), found in zip(jobs, extracted):
+            truth = {names.index(n): 1.0 for n in required}
+            truth.update({names.index(n): 0.5 for n in optional})
+            tp += len(truth.keys() & found.keys())
+            fp += len(found.keys() - truth.keys())
+            fn += len(truth.keys() - found.keys())
+            weight_errors += sum(found[i][0] != w for i, w in truth.items() if i in found)
+        print(f"JD skills: precision {tp / (tp + fp):.2%}, recall {tp / (tp + fn):.2%}, "
+              f"wrong weight {weight_errors / max(tp, 1):.2%}")
+
+        # Gap accuracy: missing skills (no limit) vs what the resume left out
+        tp = fp = fn = 0
+        coverage_error = []
+        for (text, required, optional), resume, skills in zip(jobs, resumes, held):
+            gaps = index.gaps([resume], [text], limit=len(names))[0]
+            truth = set(required + optional) - set(skills)
+            missing = set(gaps["missing_skills"])
+            tp += len(truth & missing)
+            fp += len(missing - truth)
+            fn += len(truth - missing)
+            total = len(required) + 0.5 * len(optional)
+            expected = sum(1.0 if n in required else 0.5 for n in skills) / total
+            coverage_error.append(abs(gaps["coverage"] - expected))
+        print(f"missing skills: precision {tp / (tp + fp):.2%}, recall {tp / (tp + fn):.2%}, "
+              f"mean coverage error {np.mean(coverage_error):.4f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Parse time with and without the parsed-text cache.
+
+For synthetic PDFs of several page counts and a DOCX, times extract_text
+on a cold cache (parsed on the pool), a warm in-memory cache and the
+SQLite tier alone (memory tier cleared first). Hit timings include hashing
+the upload. Uses a throwaway TEXT_CACHE_PATH.
+
+    python -m benchmarks.bench_text_cache
+"""
+import asyncio
+import os
+import tempfile
+import time
+
+REPEATS = 20
+
+async def _measure(documents):
+    from backend.services.parser import extract_text, shutdown_parser
+    from backend.services import text_cache
+
+    print(f"{'document':>10} {'KB':>8} {'miss ms':>9} {'memory ms':>10} {'disk ms':>9}")
+    for name, data in documents.items():
+        start = time.perf_counter()
+        await extract_text(data)
+        miss = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(REPEATS):
+            await extract_text(data)
+        memory = (time.perf_counter() - start) / REPEATS
+
+        disk = 0.0
+        for _ in range(REPEATS):
+            text_cache._cache.memory.clear()
+            start = time.perf_counter()
+            await extract_text(data)
+            disk += time.perf_counter() - start
+        disk /= REPEATS
+        print(f"{name:>10} {len(data) / 1024:>8.1f} {miss * 1000:>9.2f} {memory * 1000:>10.3f} "
+              f"{disk * 1000:>9.3f}")
+    shutdown_parser()
+
+    stats = text_cache.text_cache_stats()
+    print(f"hit rate {stats['overall_hit_rate']:.2%}, bytes saved {stats['bytes_saved'] / 2**20:.1f} MB, "
+          f"parse time saved {stats['seconds_saved']:.2f}s")
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["TEXT_CACHE_PATH"] = os.path.join(tmp, "text_cache.sqlite3")
+        from benchmarks.bench_parser import make_pdf
+        from benchmarks.bench_formats import make_docx, resume_lines
+
+        documents = {f"pdf-{pages}p": make_pdf(pages) for pages in (2, 40, 200)}
+        documents["docx"] = make_docx(resume_lines())
+        asyncio.run(_measure(documents))
+
+if __name__ == "__main__":
+    main()
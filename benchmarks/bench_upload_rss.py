@@ -0,0 +1,102 @@
+"""Peak server RSS added by one /analyze request, per PDF size.
+
+Writes synthetic PDFs of about 1 MB and 20 MB (text plus incompressible
+images), starts the app under uvicorn against benchmarks.stub_llm_server,
+and for each upload resets the server's peak-RSS counter
+(/proc/<pid>/clear_refs), posts the file and reads VmHWM - VmRSS. Linux only.
+
+    python -m benchmarks.bench_upload_rss
+"""
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import fitz
+import httpx
+import numpy as np
+from benchmarks.bench_llm_concurrency import _start_stub_server
+
+SIZES_MB = (1, 20)
+REPEATS = 3
+
+def make_pdf(path, target_bytes):
+    rng = np.random.default_rng(0)
+    doc = fitz.open()
+    line = "Senior engineer: built Python services, Kubernetes, AWS, data pipelines, led teams. "
+    size = 0
+    while size < target_bytes:
+        page = doc.new_page()
+        page.insert_textbox(fitz.Rect(40, 40, 560, 300), line * 12, fontsize=9)
+        noise = rng.integers(0, 256, size=(300 * 300 * 3,), dtype=np.uint8).tobytes()
+        image = fitz.Pixmap(fitz.csRGB, 300, 300, noise, False)
+        page.insert_image(fitz.Rect(40, 320, 560, 800), stream=image.tobytes("png"))
+        size += len(noise)
+    doc.save(path)
+    doc.close()
+
+def _memory_kb(pid, field):
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith(field + ":"):
+                return int(line.split()[1])
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def main():
+    stub_port = _start_stub_server()
+    port = _free_port()
+    env = {
+        **os.environ,
+        "GROQ_API_KEY": "stub",
+        "GROQ_BASE_URL": f"http://127.0.0.1:{stub_port}",
+        "EMBED_CACHE_PATH": "",
+    }
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.app:app", "--port", str(port), "--log-level", "warning"],
+        env=env, stdout=subprocess.DEVNULL
+    )
+    base = f"http://127.0.0.1:{port}"
+    try:
+        while True:
+            try:
+                if httpx.get(f"{base}/ready").status_code == 200:
+                    break
+            except httpx.TransportError:
+                pass
+            time.sleep(0.2)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            print(f"{'pdf':>8} {'baseline MB':>12} {'peak delta MB':>14} {'ms':>8}")
+            for mb in SIZES_MB:
+                path = os.path.join(tmp, f"resume_{mb}mb.pdf")
+                make_pdf(path, mb * 1024 * 1024)
+                deltas, times = [], []
+                for i in range(REPEATS):
+                    with open(f"/proc/{server.pid}/clear_refs", "w") as f:
+                        f.write("5")  # reset VmHWM to the current RSS
+                    baseline = _memory_kb(server.pid, "VmRSS")
+                    start = time.perf_counter()
+                    with open(path, "rb") as f:
+                        response = httpx.post(
+                            f"{base}/analyze",
+                            files={"resume": ("resume.pdf", f, "application/pdf")},
+                            data={"job_description": f"Python engineer {i}", "refresh": "true"},
+                            timeout=300
+                        )
+                    response.raise_for_status()
+                    times.append(time.perf_counter() - start)
+                    deltas.append(_memory_kb(server.pid, "VmHWM") - baseline)
+                size_mb = os.path.getsize(path) / 2**20
+                print(f"{size_mb:>6.1f}MB {baseline / 1024:>12.0f} {max(deltas) / 1024:>14.1f} "
+                      f"{min(times) * 1000:>8.0f}")
+    finally:
+        server.terminate()
+        server.wait()
+
+if __name__ == "__main__":
+    main()
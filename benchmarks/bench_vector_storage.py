@@ -0,0 +1,117 @@
+"""Memory, latency and top-k agreement of fp32 / fp16 / int8 vector storage.
+
+Queries stay float32 throughout; only the stored vectors are compressed
+(VECTOR_STORAGE, JD_VECTOR_STORAGE). Agreement is the overlap of each
+option's top-k with the fp32 top-k.
+
+- resume indexes: ``--resumes`` synthetic resumes of 20 chunk vectors
+  around a topic, searched with 17 query vectors (a JD plus requirement
+  lines, as search_many issues them), top 3 per query; NumpyIndex as
+  used for resume-sized indexes, then the FAISS path of a 1000-chunk
+  document (IndexFlatIP / IndexScalarQuantizer)
+- embedding cache: bytes per vector in memory and in SQLite
+- JD corpus: ``--n`` synthetic JDs (benchmarks.bench_jd_index vectors)
+  in flat and HNSW indexes of each storage, plus IVF-PQ with and without
+  a re-ranking copy (JD_PQ_REFINE=4) of each storage, top ``--k`` per
+  resume, all against exact fp32 search; bytes per vector include the
+  HNSW graph and IVF lists
+
+    python -m benchmarks.bench_vector_storage [--n 100000] [--k 20] [--resumes 200]
+"""
+import argparse
+import time
+import numpy as np
+import backend.services.jd_corpus as jd_corpus
+from benchmarks.bench_jd_index import make_corpus, DIM
+from backend.services.jd_corpus import JDCorpus, build_jd_index
+from backend.services.quantize import VECTOR_STORAGES, record_dtype
+from backend.services.retriever import build_index, _index_nbytes
+
+QUERIES = 17
+K = 3
+
+def _normalize(x):
+    return (x / np.linalg.norm(x, axis=1, keepdims=True)).astype(np.float32)
+
+def _agreement(found, truth):
+    return np.mean([len(set(a) & set(b)) / len(b) for a, b in zip(found, truth)])
+
+def _resume_sets(rng, n, chunks):
+    sets = []
+    for _ in range(n):
+        topic = rng.standard_normal(DIM).astype(np.float32)
+        sets.append((_normalize(topic + 1.0 * rng.standard_normal((chunks, DIM)).astype(np.float32)),
+                     _normalize(topic + 1.2 * rng.standard_normal((QUERIES, DIM)).astype(np.float32))))
+    return sets
+
+def _resume_rows(label, sets, repeat):
+    truth = None
+    for storage in VECTOR_STORAGES:
+        indexes = [build_index(chunks, storage) for chunks, _ in sets]
+        found, latencies = [], []
+        for index, (_, queries) in zip(indexes, sets):
+            start = time.perf_counter()
+            for _ in range(repeat):
+                _, rows = index.search(queries, K)
+            latencies.append((time.perf_counter() - start) / repeat)
+            found.extend(rows.tolist())
+        truth = truth or found
+        per_vector = np.mean([_index_nbytes(index) / index.ntotal for index in indexes])
+        print(f"{label:>22} {storage:>6} {type(indexes[0]).__name__:>22} {per_vector:>8.0f} "
+              f"{np.median(latencies) * 1e6:>10.1f} us {_agreement(found, truth):>9.3f}")
+
+def _jd_rows(vectors, queries, k):
+    import faiss
+
+    records = [{"id": str(i), "text": "-"} for i in range(len(vectors))]
+    truth = None
+    options = [("flat", storage) for storage in VECTOR_STORAGES] + [("hnsw", storage) for storage in VECTOR_STORAGES]
+    options += [("ivfpq", None)] + [("ivfpq", storage) for storage in VECTOR_STORAGES]
+    for index_type, storage in options:
+        # Rows and metadata from a flat corpus, then the index under test in its place
+        corpus = JDCorpus(index_path="/dev/null", meta_dir="/dev/null", index_type="flat")
+        corpus.add_vectors(vectors, records, log=False)
+        corpus.merge()
+        jd_corpus.JD_PQ_REFINE = 4 if storage and index_type == "ivfpq" else 0
+        start = time.perf_counter()
+        corpus.index = build_jd_index(vectors, index_type, storage or "fp32")
+        corpus.index.add(vectors)
+        seconds = time.perf_counter() - start
+
+        found, latencies = [], []
+        for query in queries:
+            start = time.perf_counter()
+            found.append([job["id"] for job in corpus.search(query, k)])
+            latencies.append(time.perf_counter() - start)
+        truth = truth or found
+        per_vector = len(faiss.serialize_index(corpus.index)) / len(vectors)
+        label = f"{index_type}" + (f" + {storage} refine" if index_type == "ivfpq" and storage else "")
+        print(f"{label:>22} {storage if index_type != 'ivfpq' else 'pq':>6} {type(corpus.index).__name__:>22} "
+              f"{per_vector:>8.0f} {np.median(latencies) * 1e3:>10.2f} ms {_agreement(found, truth):>9.3f} "
+              f"{seconds:>7.1f}s")
+        del corpus
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, default=100000)
+    parser.add_argument("--k", type=int, default=20)
+    parser.add_argument("--resumes", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    header = f"{'':>22} {'store':>6} {'backend':>22} {'B/vector':>8} {'latency':>13} {'agreement':>9}"
+    print(f"Resume indexes: 17 queries per search, top {K}, agreement vs fp32")
+    print(header)
+    _resume_rows("resume (20 chunks)", _resume_sets(rng, args.resumes, 20), repeat=50)
+    _resume_rows("document (1000 chunks)", _resume_sets(rng, 20, 1000), repeat=5)
+
+    print("\nEmbedding cache: bytes per stored vector (memory tier and SQLite blob)")
+    print("  " + ", ".join(f"{storage} {record_dtype(storage, DIM).itemsize}" for storage in VECTOR_STORAGES))
+
+    vectors, queries = make_corpus(args.n, rng)
+    print(f"\nJD corpus: {args.n} JDs, top {args.k} per resume, agreement vs exact fp32 (flat) search")
+    print(header + f" {'build':>8}")
+    _jd_rows(vectors, queries, args.k)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Fit the fast-mode score (/analyze mode=fast) to LLM scores.
+
+Reads a JSONL file of ``{"resume": text, "job_description": text, "score":
+0-100}`` pairs, where ``score`` is the LLM's verdict. With ``--label``,
+pairs without a score are first scored through the configured LLM path.
+Computes the fast features of every pair, fits the weights by least
+squares on a seeded 80% split and reports, on the held-out 20%, the mean
+absolute error and Spearman rank correlation of the built-in and the
+fitted calibration. The fitted one is written to ``--out``; point
+FAST_SCORE_CALIBRATION at it.
+
+    python -m benchmarks.calibrate_fast_score pairs.jsonl [--label] [--out fast_score.json]
+"""
+import argparse
+import asyncio
+import json
+import numpy as np
+
+HOLDOUT = 0.2
+
+async def _features(pairs, label):
+    from backend.services.pipeline import analyze_resume_bytes, score_features
+    from backend.models.scoring import FAST_SCORE_FEATURES
+
+    rows, scores = [], []
+    for n, pair in enumerate(pairs, 1):
+        score = pair.get("score")
+        if score is None:
+            if not label:
+                continue
+            result = await analyze_resume_bytes(pair["resume"].encode(), pair["job_description"])
+            if "error" in result:
+                print(f"[WARNING] Pair {n} not labelled: {result['error']}")
+                continue
+            score = result["score"]
+        features, _ = await score_features(pair["resume"], pair["job_description"])
+        rows.append([features[name] for name in FAST_SCORE_FEATURES])
+        scores.append(float(score))
+        if n % 100 == 0:
+            print(f"{n}/{len(pairs)} pairs")
+    return np.array(rows, dtype=np.float64), np.array(scores)
+
+def _spearman(a, b):
+    ranks = lambda x: np.argsort(np.argsort(x, kind="stable"), kind="stable")
+    if np.ptp(a) == 0 or np.ptp(b) == 0:
+        return float("nan")
+    return float(np.corrcoef(ranks(a), ranks(b))[0, 1])
+
+def _evaluate(name, calibration, X, y):
+    from backend.services.fast_score import fast_score
+    from backend.models.scoring import FAST_SCORE_FEATURES
+
+    predicted = np.array([fast_score(dict(zip(FAST_SCORE_FEATURES, row)), calibration) for row in X])
+    print(f"{name:>10}: MAE {np.abs(predicted - y).mean():5.1f}   Spearman {_spearman(predicted, y):.3f}   "
+          f"mean {predicted.mean():5.1f} vs LLM {y.mean():5.1f}")
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("pairs", help="JSONL of resume / job_description / score")
+    parser.add_argument("--label", action="store_true", help="score unlabelled pairs with the LLM")
+    parser.add_argument("--out", default="fast_score.json")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    from backend.models.scoring import FAST_SCORE_FEATURES, FAST_SCORE_CALIBRATION
+
+    with open(args.pairs, encoding="utf-8") as f:
+        pairs = [json.loads(line) for line in f if line.strip()]
+    X, y = asyncio.run(_features(pairs, args.label))
+    if len(y) < 10:
+        raise SystemExit(f"Need at least 10 scored pairs, got {len(y)}")
+
+    order = np.random.default_rng(args.seed).permutation(len(y))
+    split = int(len(y) * (1 - HOLDOUT))
+    train, test = order[:split], order[split:]
+
+    design = np.hstack([np.ones((len(train), 1)), X[train]])
+    coef, *_ = np.linalg.lstsq(design, y[train], rcond=None)
+    calibration = {
+        "intercept": round(float(coef[0]), 4),
+        "weights": {name: round(float(w), 4) for name, w in zip(FAST_SCORE_FEATURES, coef[1:])},
+        "train_pairs": len(train),
+    }
+
+    print(f"{len(y)} pairs, {len(train)} train / {len(test)} held out")
+    _evaluate("built-in", FAST_SCORE_CALIBRATION, X[test], y[test])
+    _evaluate("fitted", calibration, X[test], y[test])
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(calibration, f, indent=2)
+    print(f"wrote {args.out}: {calibration}")
+
+if __name__ == "__main__":
+    main()
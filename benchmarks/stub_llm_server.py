@@ -0,0 +1,70 @@
+"""Local stand-in for the Groq chat-completions API.
+
+Answers POST /openai/v1/chat/completions with a fixed analysis after
+STUB_LLM_DELAY seconds (default 0.5), or streams it in small chunks over
+that time when ``stream`` is set, so the LLM layer can be exercised and
+load-tested without an API key:
+
+    uvicorn benchmarks.stub_llm_server:app --port 8001
+    GROQ_API_KEY=stub GROQ_BASE_URL=http://127.0.0.1:8001 uvicorn backend.app:app
+"""
+import asyncio
+import json
+import os
+import time
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+
+STUB_LLM_DELAY = float(os.getenv("STUB_LLM_DELAY", "0.5"))
+STREAM_CHUNK_CHARS = 16
+
+ANALYSIS = {
+    "score": 72,
+    "missing_skills": ["Kubernetes", "GraphQL", "CI/CD"],
+    "suggestions": ["Quantify project outcomes", "Mention cloud platforms used"],
+    "rewritten_bullets": [
+        "Built a FastAPI service handling 2M requests/day",
+        "Cut batch runtime 40% by vectorizing feature extraction",
+        "Led migration of 12 services to Docker",
+    ],
+}
+
+app = FastAPI(title="Stub chat-completions API")
+
+@app.post("/openai/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    if body.get("stream"):
+        return StreamingResponse(_stream(body.get("model", "stub")), media_type="text/event-stream")
+    await asyncio.sleep(STUB_LLM_DELAY)
+    return {
+        "id": "chatcmpl-stub",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "stub"),
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": json.dumps(ANALYSIS)},
+            "finish_reason": "stop",
+        }],
+        "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+    }
+
+async def _stream(model):
+    content = json.dumps(ANALYSIS)
+    pieces = [content[i:i + STREAM_CHUNK_CHARS] for i in range(0, len(content), STREAM_CHUNK_CHARS)]
+    for i, piece in enumerate(pieces):
+        await asyncio.sleep(STUB_LLM_DELAY / len(pieces))
+        chunk = {
+            "id": "chatcmpl-stub",
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "delta": {"role": "assistant", "content": piece} if i == 0 else {"content": piece},
+                "finish_reason": "stop" if i == len(pieces) - 1 else None,
+            }],
+        }
+        yield f"data: {json.dumps(chunk)}\n\n"
+    yield "data: [DONE]\n\n"
@@ -2,7 +2,6 @@ import streamlit as st
 import requests
 import os
 from typing import Dict, Any
-import time
 from datetime import datetime
 import json
 
@@ -486,6 +485,9 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 BACKEND_URL = os.getenv("BACKEND_URL", "http://localhost:8000")
+# Same variable and default as the backend, so the upload hint matches what it accepts
+UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", str(25 * 1024 * 1024)))
+UPLOAD_LIMIT_HINT = f"Max {UPLOAD_MAX_BYTES / (1024 * 1024):g}MB" if UPLOAD_MAX_BYTES > 0 else "no size limit"
 
 # Initialize session state
 if 'analysis_result' not in st.session_state:
@@ -822,6 +824,27 @@ def check_backend_health(url: str) -> bool:
     except:
         return False
 
+# Progress shown when the backend reports each pipeline stage
+STREAM_STAGES = {
+    "parsed": (25, "📝 Text extracted ({chars:,} characters)"),
+    "chunked": (40, "🔍 Split into {chunks} sections..."),
+    "embedded": (55, "🔍 Matching against the job description..."),
+    "retrieved": (70, "🤖 Generating insights..."),
+}
+
+def iter_sse(response):
+    """Yield (event, data) pairs from a text/event-stream response"""
+    event, data = "message", []
+    for line in response.iter_lines(decode_unicode=True):
+        if not line:
+            if data:
+                yield event, json.loads("\n".join(data))
+            event, data = "message", []
+        elif line.startswith("event:"):
+            event = line[len("event:"):].strip()
+        elif line.startswith("data:"):
+            data.append(line[len("data:"):].strip())
+
 # Sidebar
 with st.sidebar:
     st.markdown("""
@@ -922,7 +945,7 @@ with col1:
     st.markdown("""
         <div class="metric-card" style="text-align: center;">
             <div style="font-size: 1.75rem;">📄</div>
-            <div style="font-weight: 600; color: #111827;">PDF Analysis</div>
+            <div style="font-weight: 600; color: #111827;">Resume Analysis</div>
             <div style="color: #6b7280; font-size: 0.8rem;">Upload your resume</div>
         </div>
     """, unsafe_allow_html=True)
@@ -995,14 +1018,14 @@ col1, col2 = st.columns([1, 1], gap="large")
 with col1:
     st.markdown("""
         <div style="margin-bottom: 0.5rem;">
-            <span style="font-weight: 600; color: #111827;">📄 Resume (PDF)</span>
+            <span style="font-weight: 600; color: #111827;">📄 Resume (PDF, DOCX, TXT, HTML)</span>
         </div>
     """, unsafe_allow_html=True)
     
     resume = st.file_uploader(
         "Upload resume",
-        type=["pdf"],
-        help="Upload your resume in PDF format (Max 10MB)",
+        type=["pdf", "docx", "txt", "html", "htm"],
+        help=f"Upload your resume as PDF, Word (.docx), plain text or HTML ({UPLOAD_LIMIT_HINT})",
         label_visibility="collapsed"
     )
     
@@ -1081,43 +1104,52 @@ if analyze_button:
             progress_bar = st.progress(0)
             status_text = st.empty()
             
-            steps = [
-                (10, "📤 Uploading resume..."),
-                (30, "📝 Extracting text..."),
-                (50, "🔍 Analyzing content..."),
-                (70, "🤖 Generating insights..."),
-                (90, "📊 Finalizing results..."),
-            ]
+            live_output = st.empty()
             
             try:
-                for progress, message in steps[:2]:
-                    status_text.markdown(f"**{message}**")
-                    progress_bar.progress(progress)
-                    time.sleep(0.3)
+                status_text.markdown("**📤 Uploading resume...**")
+                progress_bar.progress(10)
                 
                 files = {"resume": resume}
                 data = {"job_description": jd}
                 
-                for progress, message in steps[2:4]:
-                    status_text.markdown(f"**{message}**")
-                    progress_bar.progress(progress)
-                
-                response = requests.post(
-                    f"{backend_url}/analyze",
+                # Stage events arrive as the backend finishes each step; the
+                # read timeout applies between events, not to the whole analysis
+                with requests.post(
+                    f"{backend_url}/analyze/stream",
                     files=files,
                     data=data,
-                    timeout=180
-                )
+                    stream=True,
+                    timeout=(10, 180)
+                ) as response:
+                    result = None
+                    if response.status_code == 200:
+                        tokens = []
+                        for event, payload in iter_sse(response):
+                            if event in STREAM_STAGES:
+                                progress, message = STREAM_STAGES[event]
+                                status_text.markdown(f"**{message.format(**payload)}**")
+                                progress_bar.progress(progress)
+                            elif event == "token":
+                                # Show the verdict as it is generated
+                                tokens.append(payload["text"])
+                                progress_bar.progress(min(95, 70 + len(tokens) // 4))
+                                live_output.code("".join(tokens)[-800:], language="json")
+                            elif event == "result":
+                                result = payload
+                            elif event == "error":
+                                raise RuntimeError(payload["detail"])
+                        if result is None:
+                            raise RuntimeError("Analysis stream ended without a result")
+                    else:
+                        error_text = response.text
                 
-                status_text.markdown(f"**{steps[4][1]}**")
-                progress_bar.progress(steps[4][0])
+                live_output.empty()
                 
-                if response.status_code == 200:
+                if result is not None:
                     progress_bar.progress(100)
                     status_text.markdown("**✅ Analysis complete!**")
-                    time.sleep(0.5)
                     
-                    result = response.json()
                     st.session_state.analysis_result = result
                     
                     # Try to extract job title from JD
@@ -1135,17 +1167,19 @@ if analyze_button:
                     status_text.empty()
                     st.error(f"❌ Error: HTTP {response.status_code}")
                     with st.expander("📋 Error Details"):
-                        st.code(response.text)
+                        st.code(error_text)
                         
             except requests.exceptions.Timeout:
                 progress_bar.empty()
                 status_text.empty()
+                live_output.empty()
                 st.error("⏱️ Request timed out. The analysis is taking longer than expected.")
                 st.info("💡 Try again or check if the backend server is responding.")
                 
             except requests.exceptions.ConnectionError:
                 progress_bar.empty()
                 status_text.empty()
+                live_output.empty()
                 st.error(f"❌ Cannot connect to backend at {backend_url}")
                 st.markdown("""
                     <div class="tip-box">
@@ -1165,6 +1199,7 @@ if analyze_button:
             except Exception as e:
                 progress_bar.empty()
                 status_text.empty()
+                live_output.empty()
                 st.error(f"❌ Unexpected error: {str(e)}")
                 with st.expander("📋 Technical Details"):
                     st.exception(e)